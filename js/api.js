@@ -1,8 +1,10 @@
 // tempestd REST API client — wraps all fetch calls
 
 import { getServerUrl, getResolution } from './config.js';
+import { timed, measure } from './perf.js';
+import { noteServerDate } from './scheduler.js';
 
-async function fetchJSON(path, params = {}) {
+async function requestJSON(path, params = {}, { signal } = {}) {
     const base = getServerUrl();
     const url = new URL(path, base);
     for (const [k, v] of Object.entries(params)) {
@@ -10,14 +12,19 @@ async function fetchJSON(path, params = {}) {
             url.searchParams.set(k, String(v));
         }
     }
-    const res = await fetch(url.toString());
+    const res = await fetch(url.toString(), { signal });
+    noteServerDate(res.headers.get('Date'));
     if (!res.ok) {
         const body = await res.json().catch(() => ({ error: res.statusText }));
-        throw new Error(body.error || `HTTP ${res.status}`);
+        const err = new Error(body.error || `HTTP ${res.status}`);
+        err.status = res.status;
+        throw err;
     }
-    return res.json();
+    return measure('parseJSON', () => res.json());
 }
 
+const fetchJSON = timed('fetchJSON', requestJSON);
+
 export function checkHealth() {
     return fetchJSON('/api/v1/health');
 }
@@ -30,21 +37,48 @@ export function getStation(stationId) {
     return fetchJSON(`/api/v1/stations/${stationId}`);
 }
 
-export function getCurrentObservation(stationId, units = 'metric') {
-    return fetchJSON(`/api/v1/stations/${stationId}/current`, { units });
+export function getCurrentObservation(stationId, units = 'metric', { signal } = {}) {
+    return fetchJSON(`/api/v1/stations/${stationId}/current`, { units }, { signal });
 }
 
 export function getObservations(stationId, start, end, opts = {}) {
-    const { units = 'metric', resolution, limit, offset } = opts;
+    const { units = 'metric', resolution, limit, offset, signal } = opts;
     const hours = (new Date(end) - new Date(start)) / 3600000;
     const res = resolution || getResolution(hours);
     return fetchJSON(`/api/v1/stations/${stationId}/observations`, {
         start, end, resolution: res, units, limit, offset,
-    });
+    }, { signal });
+}
+
+export function getDailySummary(stationId, date, units = 'metric', { signal } = {}) {
+    return fetchJSON(`/api/v1/stations/${stationId}/summary`, { date, units }, { signal });
+}
+
+// A run of days in one request. Only the dev proxy (scripts/serve.py) has this
+// route; tempestd itself answers 404.
+export function getDailySummaries(stationId, start, end, units = 'metric', { signal } = {}) {
+    return fetchJSON('/_summaries', { station: stationId, start, end, units }, { signal });
 }
 
-export function getDailySummary(stationId, date, units = 'metric') {
-    return fetchJSON(`/api/v1/stations/${stationId}/summary`, { date, units });
+// Download URL for a range as CSV or NDJSON (1m by default). Only the dev
+// proxy has this route; it streams the file page by page.
+export function getExportUrl(stationId, start, end, { units = 'metric', resolution, format = 'csv' } = {}) {
+    const url = new URL('/_export', getServerUrl());
+    const params = { station: stationId, start, end, units, resolution, format };
+    for (const [k, v] of Object.entries(params)) {
+        if (v !== undefined && v !== null) url.searchParams.set(k, String(v));
+    }
+    return url.toString();
+}
+
+// The route answers 400 to a bare request; anything else means it is missing
+export async function hasExport() {
+    try {
+        const res = await fetch(new URL('/_export', getServerUrl()));
+        return res.status === 400;
+    } catch {
+        return false;
+    }
 }
 
 export function getObservationRange(stationId) {
@@ -1,17 +1,59 @@
 // Main entry: init, plugin loading, polling loop, event wiring
 
 import { state } from './state.js';
-import { setServerUrl, POLL_INTERVAL, STORAGE_KEY_THEME } from './config.js';
-import { checkHealth, listStations, getCurrentObservation, getObservations } from './api.js';
+import {
+    setServerUrl, getResolution, getCoarseResolution, getConversionMode, RESOLUTION_MINUTES,
+    POLL_INTERVAL, STORAGE_KEY_THEME,
+} from './config.js';
+import { nextPollDelay, recordPoll } from './scheduler.js';
+import { checkHealth, listStations, getCurrentObservation } from './api.js';
+import {
+    getTiledObservations, hasTiles, peekTiles, mergeDetail, onLiveTile, storeTile,
+} from './tiles.js';
+import { schedulePrefetch, cancelPrefetch } from './prefetch.js';
+import { convertObservation, diffConversion } from './units.js';
 import { renderCurrentConditions, showLoadingState } from './current.js';
-import { initControls, populateStations, refreshTimeRange } from './controls.js';
-import { createCharts, updateCharts, resetZoom, destroyCharts } from './charts.js';
+import { initControls, populateStations, refreshTimeRange, showExportIfSupported } from './controls.js';
+import {
+    createCharts, updateCharts, redrawCharts, resetZoom, destroyCharts,
+    onViewportChange, getViewport,
+} from './charts.js';
 import { loadPlugins, refreshPlugins } from './plugins.js';
+import { initSummaries, refreshSummaries, renderSummaries } from './summaries.js';
+import { initPerf, timed } from './perf.js';
+import { initLeader, isLeader, broadcast, onBroadcast } from './leader.js';
 
 let pollTimer = null;
+let pollGeneration = 0;    // bumped by start/stopPolling so a poll in flight knows it was superseded
 let countdownTimer = null;
-let countdown = 60;
-let isRefreshing = false;
+let nextPollAt = 0;
+let currentFailed = false;  // the last current-conditions fetch failed
+let bootstrapped = false;
+
+// The polling tab's latest current observation, for followers: { stationId, obs, receivedAt }
+let sharedCurrent = null;
+
+// The loaded chart window at its own resolution tier; zoom detail is overlaid on it
+let chartWindow = null;
+
+// One in-flight request per kind ('current', 'chart', 'detail')
+const controllers = {};
+
+// Cancel the superseded request of this kind and hand out a fresh controller
+function supersede(kind) {
+    if (controllers[kind]) controllers[kind].abort();
+    const controller = new AbortController();
+    controllers[kind] = controller;
+    return controller;
+}
+
+function settle(kind, controller) {
+    if (controllers[kind] === controller) delete controllers[kind];
+}
+
+function isAbort(err) {
+    return err && err.name === 'AbortError';
+}
 
 // --- Status Indicator ---
 
@@ -93,15 +135,11 @@ function updateLastUpdated() {
     }
 }
 
-function startCountdown() {
+function startCountdown(at) {
     stopCountdown();
-    countdown = POLL_INTERVAL / 1000;
+    nextPollAt = at;
     updateCountdownDisplay();
-    countdownTimer = setInterval(() => {
-        countdown--;
-        if (countdown < 0) countdown = 0;
-        updateCountdownDisplay();
-    }, 1000);
+    countdownTimer = setInterval(updateCountdownDisplay, 1000);
 }
 
 function stopCountdown() {
@@ -113,100 +151,237 @@ function stopCountdown() {
 
 function updateCountdownDisplay() {
     const el = document.getElementById('refresh-countdown');
-    if (el) el.textContent = `Next refresh: ${countdown}s`;
+    const seconds = Math.max(0, Math.round((nextPollAt - Date.now()) / 1000));
+    if (el) el.textContent = `Next refresh: ${seconds}s`;
 }
 
 // --- Data Fetching ---
 
+// Observations are always fetched in metric; js/units.js converts for display
 async function fetchCurrentConditions() {
     const stationId = state.get('stationId');
-    const units = state.get('units') || 'metric';
     if (!stationId) return;
 
+    // Followers show what the polling tab fetched while it is recent
+    if (!isLeader() && sharedCurrent && sharedCurrent.stationId === stationId
+        && Date.now() - sharedCurrent.receivedAt < POLL_INTERVAL / 2) {
+        showCurrent(sharedCurrent.obs);
+        return;
+    }
+
+    const controller = supersede('current');
     try {
-        const obs = await getCurrentObservation(stationId, units);
-        state.set('currentObservation', obs);
-        renderCurrentConditions(obs);
-        setStatus('online', 'Connected');
+        const obs = await getCurrentObservation(stationId, 'metric', { signal: controller.signal });
+        currentFailed = false;
+        showCurrent(obs);
+        broadcast('current', { stationId, obs });
+        if (getConversionMode() === 'verify') verifyConversion(stationId, obs);
     } catch (err) {
+        if (isAbort(err)) return;
+        currentFailed = true;
         console.error('Failed to fetch current conditions:', err);
         if (state.get('currentObservation')) {
             setStatus('stale', 'Cached');
         } else {
             setStatus('offline', 'Error');
         }
+    } finally {
+        settle('current', controller);
+    }
+}
+
+function showCurrent(obs) {
+    state.set('currentObservation', obs);
+    renderCurrentConditions(obs);
+    setStatus('online', 'Connected');
+}
+
+// ?conversion=verify: compare client-side conversion against tempestd's own
+async function verifyConversion(stationId, metricObs) {
+    const units = state.get('units') || 'metric';
+    if (units === 'metric') return;
+    try {
+        const server = await getCurrentObservation(stationId, units);
+        const mismatches = diffConversion(convertObservation(metricObs, units), server);
+        if (mismatches.length > 0) {
+            console.warn('Client-side unit conversion differs from server:', mismatches);
+        }
+    } catch (err) {
+        console.error('Conversion check failed:', err);
     }
 }
 
 async function fetchChartData() {
     const stationId = state.get('stationId');
-    const units = state.get('units') || 'metric';
     const start = state.get('startTime');
     const end = state.get('endTime');
     if (!stationId || !start || !end) return;
 
+    const hours = (new Date(end) - new Date(start)) / 3600000;
+    const resolution = getResolution(hours);
+    const coarse = getCoarseResolution(hours);
+
+    // A newer station/range selection cancels this one, so renders stay in order
+    if (controllers.detail) controllers.detail.abort();
+    const controller = supersede('chart');
+    const { signal } = controller;
+
     try {
-        const data = await getObservations(stationId, start, end, { units });
-        if (data && data.observations) {
-            updateCharts(data.observations);
+        // A different view (preset click, station switch) paints cached tiles at once
+        const cached = isSameView(chartWindow, stationId, resolution, start)
+            ? null
+            : peekTiles(stationId, start, end, { resolution });
+        if (cached) updateCharts(cached);
+
+        const warm = hasTiles(stationId, start, end, { resolution });
+        const detail = getTiledObservations(stationId, start, end, { resolution, signal });
+        detail.catch(() => {});
+        // Prefetch yields bandwidth; tiles this window shares with it stay in flight
+        cancelPrefetch();
+
+        // Long ranges: paint a coarse tier first when the detail tier isn't cached
+        if (!cached && !warm && coarse) {
+            const rough = await getTiledObservations(stationId, start, end, { resolution: coarse, signal });
+            if (signal.aborted) return;
+            updateCharts(rough);
         }
+        const observations = await detail;
+        if (signal.aborted) return;
+        chartWindow = { stationId, resolution, start, observations };
+        updateCharts(observations);
+
+        // Keep zoomed detail across polls
+        const viewport = getViewport();
+        if (viewport) await refineViewport(viewport.min, viewport.max);
+
+        schedulePrefetch();
     } catch (err) {
-        console.error('Failed to fetch chart data:', err);
+        if (!isAbort(err)) console.error('Failed to fetch chart data:', err);
+    } finally {
+        settle('chart', controller);
     }
 }
 
-async function refresh() {
-    // Update time range for preset (live) ranges
-    // Suppress endTime listener to avoid double-fetching
-    isRefreshing = true;
+// Same station and tier with the window start within a few minutes (a poll)
+function isSameView(view, stationId, resolution, start) {
+    return !!view
+        && view.stationId === stationId
+        && view.resolution === resolution
+        && Math.abs(new Date(view.start) - new Date(start)) < 5 * 60000;
+}
+
+// Fetch a finer tier for just the visible region and overlay it on the window.
+// A newer zoom/pan cancels the previous detail request.
+async function refineViewport(min, max) {
+    if (controllers.detail) controllers.detail.abort();
+    if (!chartWindow) return;
+    const { stationId, observations } = chartWindow;
+    const resolution = getResolution((max - min) / 3600000);
+
+    if (RESOLUTION_MINUTES[resolution] >= RESOLUTION_MINUTES[chartWindow.resolution]) {
+        if (chartWindow.refined) {
+            chartWindow.refined = false;
+            updateCharts(observations);
+        }
+        return;
+    }
+
+    const controller = supersede('detail');
+    try {
+        const detail = await getTiledObservations(
+            stationId, new Date(min).toISOString(), new Date(max).toISOString(),
+            { resolution, signal: controller.signal }
+        );
+        if (chartWindow.observations !== observations) return;
+        chartWindow.refined = true;
+        updateCharts(mergeDetail(observations, detail, min, max));
+    } catch (err) {
+        if (!isAbort(err)) console.error('Failed to fetch zoom detail:', err);
+    } finally {
+        settle('detail', controller);
+    }
+}
+
+async function pollOnce() {
+    // Slide a preset (live) window forward; the selection is unchanged, so
+    // the timeSelection listener stays quiet and this poll fetches once
     refreshTimeRange();
-    isRefreshing = false;
     await Promise.all([
         fetchCurrentConditions(),
         fetchChartData(),
         refreshPlugins(),
+        refreshSummaries(),
     ]);
     updateLastUpdated();
-    startCountdown();
 }
 
+const refresh = timed('poll', pollOnce);
+
 // --- Polling ---
 
+// One scheduled refresh
+async function tick() {
+    // Only refresh preset (live) ranges automatically
+    if (state.get('timeRangeType') === 'preset') {
+        await refresh();
+    } else {
+        // Custom range: only refresh current conditions
+        updateLastUpdated();
+        await fetchCurrentConditions();
+    }
+}
+
+// Poll again once the station's next report should be in (js/scheduler.js)
+function schedulePoll(generation) {
+    const delay = nextPollDelay(currentFailed ? null : state.get('currentObservation'));
+    startCountdown(Date.now() + delay);
+    pollTimer = setTimeout(async () => {
+        await tick();
+        if (generation !== pollGeneration) return;   // stopped or restarted meanwhile
+        recordPoll(currentFailed ? null : state.get('currentObservation'));
+        schedulePoll(generation);
+        // Followers refresh from what this poll shared and count down to the next one
+        broadcast('poll', { nextAt: nextPollAt });
+    }, delay);
+}
+
 function startPolling() {
     stopPolling();
-    pollTimer = setInterval(() => {
-        // Only refresh preset (live) ranges automatically
-        if (state.get('timeRangeType') === 'preset') {
-            refresh();
-        } else {
-            // Custom range: only refresh current conditions
-            fetchCurrentConditions();
-            updateLastUpdated();
-            startCountdown();
-        }
-    }, POLL_INTERVAL);
-    startCountdown();
+    schedulePoll(pollGeneration);
 }
 
 function stopPolling() {
+    pollGeneration++;
     if (pollTimer) {
-        clearInterval(pollTimer);
+        clearTimeout(pollTimer);
         pollTimer = null;
     }
     stopCountdown();
 }
 
-// --- Visibility API (pause when tab hidden) ---
+// --- Leadership (one polling tab per browser; hidden tabs never poll) ---
 
-function initVisibility() {
-    document.addEventListener('visibilitychange', () => {
-        if (document.hidden) {
-            stopPolling();
-        } else {
-            // Immediate refresh + restart timer
-            refresh();
-            startPolling();
-        }
+function initLeadership() {
+    // The leader shares the live tiles and current conditions it fetches;
+    // followers refresh from them whenever it finishes a poll
+    onLiveTile((tile) => broadcast('tile', tile));
+    onBroadcast('tile', storeTile);
+    onBroadcast('current', ({ stationId, obs }) => {
+        sharedCurrent = { stationId, obs, receivedAt: Date.now() };
+    });
+    onBroadcast('poll', ({ nextAt }) => {
+        if (!bootstrapped || isLeader() || document.hidden) return;
+        tick();
+        startCountdown(nextAt);
+    });
+
+    initLeader((leading) => {
+        if (!bootstrapped) return;   // bootstrap() does the first fetch itself
+        stopPolling();
+        if (document.hidden) return;
+        // Immediate refresh; a follower's comes from what the leader shared
+        refresh();
+        if (leading) startPolling();
     });
 }
 
@@ -244,15 +419,19 @@ function initSubscriptions() {
         refresh();
     });
 
-    // When units change, refetch everything (server does conversion)
+    // When units change, re-render cached metric data (conversion is client-side)
     state.on('units', () => {
-        showLoadingState();
-        refresh();
+        renderCurrentConditions(state.get('currentObservation'));
+        redrawCharts();
+        refreshPlugins();
+        renderSummaries();
+        const stationId = state.get('stationId');
+        const obs = state.get('currentObservation');
+        if (getConversionMode() === 'verify' && stationId && obs) verifyConversion(stationId, obs);
     });
 
-    // When time range changes (start/end), refetch chart data + plugins
-    state.on('endTime', () => {
-        if (isRefreshing) return;
+    // When the user picks another range, refetch chart data + plugins
+    state.on('timeSelection', () => {
         resetZoom();
         fetchChartData();
         refreshPlugins();
@@ -268,6 +447,7 @@ async function bootstrap() {
     try {
         const stations = await listStations();
         populateStations(stations);
+        showExportIfSupported();
     } catch (err) {
         console.error('Failed to load stations:', err);
         setStatus('offline', 'No stations');
@@ -283,19 +463,23 @@ async function bootstrap() {
     // Load plugins
     await loadPlugins();
 
-    // Start auto-refresh
-    startPolling();
+    // Start auto-refresh; other tabs follow the leader's polls
+    bootstrapped = true;
+    if (isLeader()) startPolling();
 }
 
 // --- Init ---
 
 async function init() {
+    initPerf();
     loadCustomTheme();
     initConfigBanner();
     initControls();
+    initSummaries();
     initSubscriptions();
-    initVisibility();
+    initLeadership();
     initThemeListener();
+    onViewportChange(refineViewport);
 
     // Register service worker
     if ('serviceWorker' in navigator) {
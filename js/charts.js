@@ -2,10 +2,53 @@
 
 import { state } from './state.js';
 import { getChartColors, getUIColors } from './config.js';
+import { convertObservations } from './units.js';
+import { timed } from './perf.js';
+import { isVisible, watchVisibility, unwatchVisibility } from './visibility.js';
 
 // Store chart instances
 const charts = {};
 
+// Last metric observations drawn, so a unit toggle can redraw without refetching
+let lastObservations = null;
+
+const VIEWPORT_DEBOUNCE = 250; // ms after the last zoom/pan before fetching detail
+
+// Called with the visible x range (ms) once the user settles on a zoom/pan
+let viewportListener = null;
+let viewportTimer = null;
+let syncing = false;
+
+function isCoreChart(chart) {
+    return Object.values(charts).includes(chart);
+}
+
+// Mirror one chart's x range onto the other core charts
+function syncViewport(source) {
+    if (syncing || !isCoreChart(source)) return;
+    const { min, max } = source.scales.x;
+    syncing = true;
+    try {
+        for (const chart of Object.values(charts)) {
+            if (chart !== source && chart.zoomScale) {
+                chart.zoomScale('x', { min, max }, 'none');
+            }
+        }
+    } finally {
+        syncing = false;
+    }
+}
+
+function emitViewport(chart) {
+    if (!isCoreChart(chart)) return;
+    syncViewport(chart);
+    const { min, max } = chart.scales.x;
+    clearTimeout(viewportTimer);
+    viewportTimer = setTimeout(() => {
+        if (viewportListener) viewportListener(min, max);
+    }, VIEWPORT_DEBOUNCE);
+}
+
 function getUnitLabels() {
     const units = state.get('units') || 'metric';
     const isMetric = units === 'metric';
@@ -55,6 +98,8 @@ function baseOptions(yLabel) {
                     enabled: true,
                     mode: 'x',
                     modifierKey: 'ctrl',
+                    onPan: ({ chart }) => syncViewport(chart),
+                    onPanComplete: ({ chart }) => emitViewport(chart),
                 },
                 zoom: {
                     wheel: {
@@ -63,6 +108,8 @@ function baseOptions(yLabel) {
                     },
                     pinch: { enabled: true },
                     mode: 'x',
+                    onZoom: ({ chart }) => syncViewport(chart),
+                    onZoomComplete: ({ chart }) => emitViewport(chart),
                 },
             },
         },
@@ -248,91 +295,85 @@ export function createCharts() {
             options: solarOpts,
         }
     );
+
+    for (const [key, chart] of Object.entries(charts)) {
+        watchVisibility(chart.canvas, () => applyChart(key));
+    }
 }
 
 // --- Update Charts with observation data ---
 
-export function updateCharts(observations) {
-    if (!observations || observations.length === 0) return;
+function points(observations, field) {
+    return observations.map((obs) => ({ x: obs.timestamp, y: obs[field] }));
+}
 
-    const unitLabels = getUnitLabels();
+// Fill one chart's datasets from converted observations
+const FILL = {
+    temperature(chart, observations, unitLabels) {
+        chart.data.datasets[0].data = points(observations, 'air_temperature');
+        chart.data.datasets[1].data = points(observations, 'feels_like');
+        chart.data.datasets[2].data = points(observations, 'dew_point');
+        chart.options.scales.y.title.text = unitLabels.temp;
+    },
+    humidity(chart, observations) {
+        chart.data.datasets[0].data = points(observations, 'relative_humidity');
+    },
+    wind(chart, observations, unitLabels) {
+        chart.data.datasets[0].data = points(observations, 'wind_avg');
+        chart.data.datasets[1].data = points(observations, 'wind_gust');
+        chart.data.datasets[2].data = points(observations, 'wind_lull');
+        chart.options.scales.y.title.text = unitLabels.wind;
+    },
+    pressure(chart, observations, unitLabels) {
+        chart.data.datasets[0].data = points(observations, 'station_pressure');
+        chart.options.scales.y.title.text = unitLabels.pressure;
+    },
+    rain(chart, observations, unitLabels) {
+        chart.data.datasets[0].data = points(observations, 'rain_accumulation');
+        chart.options.scales.y.title.text = unitLabels.rain;
+    },
+    solar(chart, observations) {
+        chart.data.datasets[0].data = points(observations, 'solar_radiation');
+        chart.data.datasets[1].data = points(observations, 'uv_index');
+    },
+};
 
-    // Map observations to time-series data points
-    const tempData = [];
-    const feelsLikeData = [];
-    const dewPointData = [];
-    const humidityData = [];
-    const windAvgData = [];
-    const windGustData = [];
-    const windLullData = [];
-    const pressureData = [];
-    const rainData = [];
-    const solarData = [];
-    const uvData = [];
-
-    for (const obs of observations) {
-        const t = obs.timestamp;
-        tempData.push({ x: t, y: obs.air_temperature });
-        feelsLikeData.push({ x: t, y: obs.feels_like });
-        dewPointData.push({ x: t, y: obs.dew_point });
-        humidityData.push({ x: t, y: obs.relative_humidity });
-        windAvgData.push({ x: t, y: obs.wind_avg });
-        windGustData.push({ x: t, y: obs.wind_gust });
-        windLullData.push({ x: t, y: obs.wind_lull });
-        pressureData.push({ x: t, y: obs.station_pressure });
-        rainData.push({ x: t, y: obs.rain_accumulation });
-        solarData.push({ x: t, y: obs.solar_radiation });
-        uvData.push({ x: t, y: obs.uv_index });
-    }
+// What the charts should show: converted observations, and which charts show it
+let pending = null;          // { observations, unitLabels }
+const drawn = new Set();     // chart keys already showing `pending`
 
-    // Temperature
-    if (charts.temperature) {
-        charts.temperature.data.datasets[0].data = tempData;
-        charts.temperature.data.datasets[1].data = feelsLikeData;
-        charts.temperature.data.datasets[2].data = dewPointData;
-        charts.temperature.options.scales.y.title.text = unitLabels.temp;
-        charts.temperature.update('none');
-    }
-
-    // Humidity
-    if (charts.humidity) {
-        charts.humidity.data.datasets[0].data = humidityData;
-        charts.humidity.update('none');
-    }
-
-    // Wind
-    if (charts.wind) {
-        charts.wind.data.datasets[0].data = windAvgData;
-        charts.wind.data.datasets[1].data = windGustData;
-        charts.wind.data.datasets[2].data = windLullData;
-        charts.wind.options.scales.y.title.text = unitLabels.wind;
-        charts.wind.update('none');
-    }
+function applyChart(key) {
+    const chart = charts[key];
+    if (!chart || !pending || drawn.has(key)) return;
+    FILL[key](chart, pending.observations, pending.unitLabels);
+    chart.update('none');
+    drawn.add(key);
+}
 
-    // Pressure
-    if (charts.pressure) {
-        charts.pressure.data.datasets[0].data = pressureData;
-        charts.pressure.options.scales.y.title.text = unitLabels.pressure;
-        charts.pressure.update('none');
+// Charts scrolled out of view keep their old data until they come back
+function drawCharts(metricObservations) {
+    if (!metricObservations || metricObservations.length === 0) return;
+    lastObservations = metricObservations;
+    pending = {
+        observations: convertObservations(metricObservations, state.get('units') || 'metric'),
+        unitLabels: getUnitLabels(),
+    };
+    drawn.clear();
+    for (const [key, chart] of Object.entries(charts)) {
+        if (isVisible(chart.canvas)) applyChart(key);
     }
+}
 
-    // Rain
-    if (charts.rain) {
-        charts.rain.data.datasets[0].data = rainData;
-        charts.rain.options.scales.y.title.text = unitLabels.rain;
-        charts.rain.update('none');
-    }
+export const updateCharts = timed('updateCharts', drawCharts);
 
-    // Solar / UV
-    if (charts.solar) {
-        charts.solar.data.datasets[0].data = solarData;
-        charts.solar.data.datasets[1].data = uvData;
-        charts.solar.update('none');
-    }
+// Redraw the last data in the current unit system
+export function redrawCharts() {
+    if (lastObservations) updateCharts(lastObservations);
 }
 
 // Reset zoom on all charts
 export function resetZoom() {
+    clearTimeout(viewportTimer);
     for (const chart of Object.values(charts)) {
         if (chart && chart.resetZoom) {
             chart.resetZoom();
@@ -340,6 +381,18 @@ export function resetZoom() {
     }
 }
 
+// Register the handler for zoom-driven detail loading
+export function onViewportChange(callback) {
+    viewportListener = callback;
+}
+
+// Visible x range when the charts are zoomed, otherwise null
+export function getViewport() {
+    const chart = charts.temperature;
+    if (!chart || !chart.isZoomedOrPanned || !chart.isZoomedOrPanned()) return null;
+    return { min: chart.scales.x.min, max: chart.scales.x.max };
+}
+
 // Export chart defaults for plugins
 export function getChartDefaults() {
     return { baseOptions, makeDataset };
@@ -349,6 +402,7 @@ export function getChartDefaults() {
 export function destroyCharts() {
     for (const [key, chart] of Object.entries(charts)) {
         if (chart) {
+            unwatchVisibility(chart.canvas);
             chart.destroy();
             delete charts[key];
         }
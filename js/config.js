@@ -44,6 +44,22 @@ function setUnits(units) {
     localStorage.setItem(STORAGE_KEY_UNITS, units);
 }
 
+// Unit conversion source: 'client' (default) or 'verify', which also fetches
+// tempestd's server-side conversion and logs any disagreement
+function getConversionMode() {
+    const params = new URLSearchParams(window.location.search);
+    return params.get('conversion') === 'verify' ? 'verify' : 'client';
+}
+
+// Client timing: 'off' (default), 'overlay' (?perf=1) or 'beacon' (?perf=beacon),
+// which also posts aggregates to the dev server
+function getPerfMode() {
+    const params = new URLSearchParams(window.location.search);
+    const value = params.get('perf');
+    if (value === 'beacon') return 'beacon';
+    return value === '1' ? 'overlay' : 'off';
+}
+
 // Resolution auto-selection based on time range duration
 function getResolution(hours) {
     if (hours <= 6) return '1m';
@@ -53,6 +69,23 @@ function getResolution(hours) {
     return '3h';                       // 90 days
 }
 
+// Minutes per bucket for each resolution tier
+const RESOLUTION_MINUTES = {
+    '1m': 1,
+    '5m': 5,
+    '30m': 30,
+    '1h': 60,
+    '3h': 180,
+    '1d': 1440,
+};
+
+// Coarse tier drawn first for long ranges, before the getResolution() tier loads
+function getCoarseResolution(hours) {
+    if (hours > 720) return '1d';     // beyond 30 days
+    if (hours > 168) return '3h';     // beyond 7 days
+    return null;                      // short ranges load in one step
+}
+
 // Time range presets
 const TIME_RANGES = {
     '6h':  { hours: 6,    label: '6h'  },
@@ -102,8 +135,9 @@ function getUIColors() {
 
 export {
     getServerUrl, setServerUrl,
-    getUnits, setUnits,
-    getResolution, TIME_RANGES, POLL_INTERVAL,
+    getUnits, setUnits, getConversionMode, getPerfMode,
+    getResolution, getCoarseResolution, RESOLUTION_MINUTES,
+    TIME_RANGES, POLL_INTERVAL,
     getChartColors, getUIColors,
     STORAGE_KEY_SERVER, STORAGE_KEY_UNITS, STORAGE_KEY_THEME,
 };
@@ -1,12 +1,14 @@
-// Station selector, time range buttons, unit toggle
+// Station selector, time range buttons, unit toggle, export links
 
 import { state } from './state.js';
 import { getUnits, setUnits, TIME_RANGES } from './config.js';
+import { getExportUrl, hasExport } from './api.js';
 
 export function initControls() {
     initUnitToggle();
     initTimePresets();
     initCustomRange();
+    initExport();
 }
 
 // --- Station Selector ---
@@ -16,6 +18,7 @@ export function populateStations(stations) {
     if (!select) return;
 
     select.textContent = '';
+    state.set('stations', stations || []);
 
     if (!stations || stations.length === 0) {
         const opt = document.createElement('option');
@@ -83,11 +86,21 @@ function updateUnitButtons(units) {
 function initTimePresets() {
     const buttons = document.querySelectorAll('.time-presets button[data-range]');
 
+    // What the user picked, as opposed to the window itself: a live preset's
+    // window slides on every poll without the selection changing. timePicks
+    // counts clicks, so picking the active preset again still refreshes
+    state.computed('timeSelection', ['timePicks', 'timeRangeType', 'timeRange', 'startTime', 'endTime'],
+        (picks, type, range, start, end) =>
+            `${picks}:` + (type === 'preset' ? `preset:${range}` : `custom:${start}/${end}`));
+
     // Set initial time range
     const defaultRange = '24h';
-    state.set('timeRange', defaultRange);
-    state.set('timeRangeType', 'preset');
-    updateTimeRange(defaultRange);
+    state.batch(() => {
+        state.set('timePicks', 0);
+        state.set('timeRange', defaultRange);
+        state.set('timeRangeType', 'preset');
+        updateTimeRange(defaultRange);
+    });
 
     for (const btn of buttons) {
         btn.addEventListener('click', () => {
@@ -96,9 +109,12 @@ function initTimePresets() {
             for (const b of buttons) b.classList.remove('active');
             btn.classList.add('active');
 
-            state.set('timeRange', range);
-            state.set('timeRangeType', 'preset');
-            updateTimeRange(range);
+            state.batch(() => {
+                state.set('timePicks', state.get('timePicks') + 1);
+                state.set('timeRange', range);
+                state.set('timeRangeType', 'preset');
+                updateTimeRange(range);
+            });
         });
     }
 }
@@ -109,8 +125,10 @@ function updateTimeRange(rangeKey) {
 
     const end = new Date();
     const start = new Date(end.getTime() - preset.hours * 3600000);
-    state.set('startTime', start.toISOString());
-    state.set('endTime', end.toISOString());
+    state.batch(() => {
+        state.set('startTime', start.toISOString());
+        state.set('endTime', end.toISOString());
+    });
 }
 
 // Recalculate preset time range (called on refresh for live ranges)
@@ -145,8 +163,33 @@ function initCustomRange() {
         const buttons = document.querySelectorAll('.time-presets button[data-range]');
         for (const b of buttons) b.classList.remove('active');
 
-        state.set('timeRangeType', 'custom');
-        state.set('startTime', startDate.toISOString());
-        state.set('endTime', endDate.toISOString());
+        state.batch(() => {
+            state.set('timePicks', state.get('timePicks') + 1);
+            state.set('timeRangeType', 'custom');
+            state.set('startTime', startDate.toISOString());
+            state.set('endTime', endDate.toISOString());
+        });
     });
 }
+
+// --- Export ---
+
+// Plain download links: the browser streams the file to disk, nothing is
+// buffered in the page
+function initExport() {
+    for (const link of document.querySelectorAll('#time-export a[data-format]')) {
+        // Resolved on click, so the link follows the selected range and units
+        link.addEventListener('click', () => {
+            link.href = getExportUrl(state.get('stationId'), state.get('startTime'), state.get('endTime'), {
+                units: state.get('units') || 'metric',
+                format: link.dataset.format,
+            });
+        });
+    }
+}
+
+// Show the links only when the server has the export route
+export async function showExportIfSupported() {
+    const box = document.getElementById('time-export');
+    if (box) box.classList.toggle('visible', await hasExport());
+}
@@ -1,6 +1,8 @@
 // Current conditions card rendering
 
 import { state } from './state.js';
+import { convertObservation } from './units.js';
+import { timed } from './perf.js';
 
 const UV_LEVELS = [
     { max: 2,  label: 'Low',       className: 'uv-low' },
@@ -19,7 +21,14 @@ function formatValue(val, decimals = 1) {
     return Number(val).toFixed(decimals);
 }
 
-function createStatBox(label, value, unit, secondary) {
+// Stat boxes keyed by stat; built once, then patched in place on every poll
+const boxes = new Map();
+
+// Latest render request, applied in a single animation frame
+let pending = null;
+let frame = null;
+
+function createStatBox(label) {
     const box = document.createElement('div');
     box.className = 'stat-box';
 
@@ -29,127 +38,168 @@ function createStatBox(label, value, unit, secondary) {
 
     const valueEl = document.createElement('div');
     valueEl.className = 'stat-value';
-    valueEl.textContent = value;
-    if (unit) {
-        const unitSpan = document.createElement('span');
-        unitSpan.className = 'unit';
-        unitSpan.textContent = ' ' + unit;
-        valueEl.appendChild(unitSpan);
-    }
+    const valueText = document.createTextNode('--');
+    const unitSpan = document.createElement('span');
+    unitSpan.className = 'unit';
+    const unitText = document.createTextNode('');
+    unitSpan.appendChild(unitText);
+    valueEl.appendChild(valueText);
+    valueEl.appendChild(unitSpan);
+
+    const secEl = document.createElement('div');
+    secEl.className = 'stat-secondary';
+    secEl.hidden = true;
+    const secText = document.createTextNode('');
+    secEl.appendChild(secText);
 
     box.appendChild(labelEl);
     box.appendChild(valueEl);
+    box.appendChild(secEl);
 
-    if (secondary) {
-        const secEl = document.createElement('div');
-        secEl.className = 'stat-secondary';
-        secEl.textContent = secondary;
-        box.appendChild(secEl);
-    }
+    return { el: box, valueEl, valueText, unitText, secEl, secText };
+}
 
-    return box;
+function setText(node, text) {
+    if (node.data !== text) node.data = text;
 }
 
-export function renderCurrentConditions(obs) {
-    const grid = document.getElementById('stats-grid');
-    if (!grid) return;
+function setClass(el, className) {
+    if (el.className !== className) el.className = className;
+}
 
-    const units = state.get('units') || 'metric';
+// Write one stat's value, unit and secondary line into its existing nodes
+function patchBox(box, stat, loading) {
+    setText(box.valueText, loading ? '--' : String(stat.value));
+    setText(box.unitText, !loading && stat.unit ? ' ' + stat.unit : '');
+    setClass(box.valueEl, loading ? 'stat-value loading' : 'stat-value');
+
+    const secondary = loading ? '' : (stat.secondary || '');
+    setText(box.secText, secondary);
+    if (box.secEl.hidden !== !secondary) box.secEl.hidden = !secondary;
+    setClass(box.secEl, stat.secondaryClass && !loading
+        ? `stat-secondary ${stat.secondaryClass}`
+        : 'stat-secondary');
+}
+
+// Display rows for an observation (already converted to `units`)
+function buildStats(obs, units) {
     const isMetric = units === 'metric';
     const tempUnit = isMetric ? '\u00B0C' : '\u00B0F';
     const windUnit = isMetric ? 'm/s' : 'mph';
     const pressureUnit = isMetric ? 'hPa' : 'inHg';
     const rainUnit = isMetric ? 'mm' : 'in';
     const pressureDecimals = isMetric ? 1 : 2;
-
-    // Clear existing
-    grid.textContent = '';
-
-    if (!obs) {
-        grid.appendChild(createStatBox('Temperature', '--', tempUnit));
-        return;
-    }
-
-    const uv = getUVLevel(obs.uv_index || 0);
-
-    // Temperature
-    grid.appendChild(createStatBox(
-        'Temperature',
-        formatValue(obs.air_temperature),
-        tempUnit,
-        `Feels like ${formatValue(obs.feels_like)}${tempUnit}`
-    ));
-
-    // Humidity
-    grid.appendChild(createStatBox(
-        'Humidity',
-        formatValue(obs.relative_humidity, 0),
-        '%',
-        `Dew point ${formatValue(obs.dew_point)}${tempUnit}`
-    ));
-
-    // Wind
-    const windDir = obs.wind_direction_cardinal || '';
-    grid.appendChild(createStatBox(
-        'Wind',
-        formatValue(obs.wind_avg),
-        windUnit,
-        `Gust ${formatValue(obs.wind_gust)} ${windUnit} ${windDir}`
-    ));
-
-    // Pressure
-    grid.appendChild(createStatBox(
-        'Pressure',
-        formatValue(obs.station_pressure, pressureDecimals),
-        pressureUnit
-    ));
-
-    // UV Index
-    const uvBox = createStatBox(
-        'UV Index',
-        formatValue(obs.uv_index, 0),
-        '',
-        uv.label
-    );
-    const uvSec = uvBox.querySelector('.stat-secondary');
-    if (uvSec) uvSec.classList.add(uv.className);
-    grid.appendChild(uvBox);
-
-    // Rain
-    grid.appendChild(createStatBox(
-        'Rain',
-        formatValue(obs.rain_accumulation, isMetric ? 1 : 2),
-        rainUnit
-    ));
-
-    // Solar Radiation
-    grid.appendChild(createStatBox(
-        'Solar Radiation',
-        formatValue(obs.solar_radiation, 0),
-        'W/m\u00B2'
-    ));
+    const o = obs || {};
+    const uv = getUVLevel(o.uv_index || 0);
+
+    const stats = [
+        {
+            key: 'temperature',
+            label: 'Temperature',
+            value: formatValue(o.air_temperature),
+            unit: tempUnit,
+            secondary: obs && `Feels like ${formatValue(o.feels_like)}${tempUnit}`,
+        },
+        {
+            key: 'humidity',
+            label: 'Humidity',
+            value: formatValue(o.relative_humidity, 0),
+            unit: '%',
+            secondary: obs && `Dew point ${formatValue(o.dew_point)}${tempUnit}`,
+        },
+        {
+            key: 'wind',
+            label: 'Wind',
+            value: formatValue(o.wind_avg),
+            unit: windUnit,
+            secondary: obs && `Gust ${formatValue(o.wind_gust)} ${windUnit} ${o.wind_direction_cardinal || ''}`,
+        },
+        {
+            key: 'pressure',
+            label: 'Pressure',
+            value: formatValue(o.station_pressure, pressureDecimals),
+            unit: pressureUnit,
+        },
+        {
+            key: 'uv',
+            label: 'UV Index',
+            value: formatValue(o.uv_index, 0),
+            unit: '',
+            secondary: obs && uv.label,
+            secondaryClass: obs && uv.className,
+        },
+        {
+            key: 'rain',
+            label: 'Rain',
+            value: formatValue(o.rain_accumulation, isMetric ? 1 : 2),
+            unit: rainUnit,
+        },
+        {
+            key: 'solar',
+            label: 'Solar Radiation',
+            value: formatValue(o.solar_radiation, 0),
+            unit: 'W/m\u00B2',
+        },
+    ];
 
     // Lightning
-    if (obs.lightning_strike_count > 0) {
+    if (o.lightning_strike_count > 0) {
         const distUnit = isMetric ? 'km' : 'mi';
-        grid.appendChild(createStatBox(
-            'Lightning',
-            obs.lightning_strike_count,
-            'strikes',
-            `Avg distance ${formatValue(obs.lightning_avg_distance)} ${distUnit}`
-        ));
+        stats.push({
+            key: 'lightning',
+            label: 'Lightning',
+            value: o.lightning_strike_count,
+            unit: 'strikes',
+            secondary: `Avg distance ${formatValue(o.lightning_avg_distance)} ${distUnit}`,
+        });
     }
+    return stats;
 }
 
-export function showLoadingState() {
+function paint() {
+    frame = null;
     const grid = document.getElementById('stats-grid');
-    if (!grid) return;
-    grid.textContent = '';
-    const labels = ['Temperature', 'Humidity', 'Wind', 'Pressure', 'UV Index', 'Rain'];
-    for (const label of labels) {
-        const box = createStatBox(label, '--', '');
-        const val = box.querySelector('.stat-value');
-        if (val) val.classList.add('loading');
-        grid.appendChild(box);
+    if (!grid || !pending) return;
+    const { obs, loading } = pending;
+    pending = null;
+
+    const units = state.get('units') || 'metric';
+    const stats = buildStats(convertObservation(obs, units), units);
+
+    let prev = null;
+    for (const stat of stats) {
+        let box = boxes.get(stat.key);
+        if (!box) {
+            box = createStatBox(stat.label);
+            boxes.set(stat.key, box);
+        }
+        patchBox(box, stat, loading);
+        // Settled boxes are already in place; only new or re-shown boxes are inserted
+        const next = prev ? prev.nextElementSibling : grid.firstElementChild;
+        if (box.el !== next) grid.insertBefore(box.el, next);
+        prev = box.el;
     }
+
+    // Drop boxes not in this render (e.g. lightning once strikes stop)
+    let tail;
+    while ((tail = prev ? prev.nextElementSibling : grid.firstElementChild)) {
+        tail.remove();
+    }
+}
+
+// The DOM work happens here rather than in renderCurrentConditions(), so this is what ?perf=1 measures
+const flush = timed('renderCurrentConditions', paint);
+
+function schedule(request) {
+    pending = request;
+    if (frame === null) frame = requestAnimationFrame(flush);
+}
+
+// obs is metric; it is converted at render time for the selected unit system
+export function renderCurrentConditions(metricObs) {
+    schedule({ obs: metricObs, loading: false });
+}
+
+export function showLoadingState() {
+    schedule({ obs: null, loading: true });
 }
@@ -0,0 +1,99 @@
+// Cross-tab leader election: one visible tab per browser polls tempestd and
+// shares what it fetched with the others over a BroadcastChannel.
+//
+// Leadership is a Web Lock held until the tab is hidden or closed, at which
+// point the browser grants it to the next visible tab in the queue. Hidden
+// tabs leave the queue, so a background tab never holds polling hostage.
+// Without Web Locks or BroadcastChannel every tab leads, as before.
+
+const CHANNEL_NAME = 'tempest-dashboard';
+const LOCK_NAME = 'tempest-dashboard-poller';
+
+const supported = typeof BroadcastChannel !== 'undefined'
+    && typeof navigator !== 'undefined' && !!(navigator.locks && navigator.locks.request);
+
+let channel = null;
+let leader = false;
+let onChange = () => {};
+let queued = null;        // AbortController for our place in the lock queue
+let releaseLock = null;   // resolves the promise that holds the lock
+const handlers = {};      // message type -> [fn]
+
+export function isLeader() {
+    return leader;
+}
+
+function setRole(value) {
+    leader = value;
+    onChange(value);
+}
+
+// Take the lock if it is free; otherwise report that we follow and queue for it
+function enqueue() {
+    if (!supported) {
+        setRole(true);
+        return;
+    }
+    if (queued) return;
+    const controller = new AbortController();
+    queued = controller;
+    const hold = () => new Promise((resolve) => {
+        releaseLock = resolve;
+        setRole(true);
+    });
+    navigator.locks.request(LOCK_NAME, { ifAvailable: true }, (lock) => {
+        if (queued !== controller) return null;   // hidden again meanwhile
+        if (lock) return hold();
+        setRole(false);
+        navigator.locks.request(LOCK_NAME, { signal: controller.signal }, hold).catch(() => {
+            // left the queue before the lock was granted
+        });
+        return null;
+    });
+}
+
+// Leave the queue, releasing the lock if we hold it
+function withdraw() {
+    if (!supported) {
+        setRole(false);
+        return;
+    }
+    if (!queued) return;
+    queued.abort();
+    queued = null;
+    if (releaseLock) {
+        releaseLock();
+        releaseLock = null;
+    }
+    setRole(false);
+}
+
+// Send to every other tab of this dashboard
+export function broadcast(type, data) {
+    if (channel) channel.postMessage({ type, data });
+}
+
+export function onBroadcast(type, fn) {
+    (handlers[type] = handlers[type] || []).push(fn);
+}
+
+/**
+ * Start taking part in the election. onRole(isLeader) runs whenever the tab's
+ * role is settled: on becoming visible (leading or following), on taking
+ * over from a closed leader, and on being hidden (never leading).
+ */
+export function initLeader(onRole) {
+    onChange = onRole;
+    if (supported) {
+        channel = new BroadcastChannel(CHANNEL_NAME);
+        channel.onmessage = (event) => {
+            const { type, data } = event.data || {};
+            for (const fn of handlers[type] || []) fn(data);
+        };
+    }
+    document.addEventListener('visibilitychange', () => {
+        if (document.hidden) withdraw();
+        else enqueue();
+    });
+    if (!document.hidden) enqueue();
+}
@@ -0,0 +1,160 @@
+// Opt-in client timing (?perf=1): performance.measure spans, a rolling overlay,
+// long-task counts and, with ?perf=beacon, aggregates posted to the dev server
+
+import { getPerfMode } from './config.js';
+
+const MODE = getPerfMode();
+const SAMPLE_WINDOW = 100;                 // rolling samples kept per span
+const OVERLAY_INTERVAL = 1000;
+const BEACON_INTERVAL = 5 * 60000;
+const BEACON_PATH = '/_perf';
+const MEASURE_PREFIX = 'tempest:';
+
+// name -> { samples: [], count, totalMs }
+const spans = new Map();
+const longTasks = { count: 0, totalMs: 0 };
+const clientId = Math.random().toString(36).slice(2, 10);
+let overlayEl = null;
+
+export function isPerfEnabled() {
+    return MODE !== 'off';
+}
+
+function record(name, start) {
+    const end = performance.now();
+    try {
+        performance.measure(MEASURE_PREFIX + name, { start, end });
+    } catch {
+        // measure() options are unsupported on very old engines; keep our own stats
+    }
+    let span = spans.get(name);
+    if (!span) {
+        span = { samples: [], count: 0, totalMs: 0 };
+        spans.set(name, span);
+    }
+    const ms = end - start;
+    span.samples.push(ms);
+    if (span.samples.length > SAMPLE_WINDOW) span.samples.shift();
+    span.count++;
+    span.totalMs += ms;
+}
+
+/**
+ * Wrap fn so every call is recorded as a span; async functions are timed
+ * until they settle. Returns fn untouched when perf mode is off.
+ */
+export function timed(name, fn) {
+    if (!isPerfEnabled()) return fn;
+    return function (...args) {
+        const start = performance.now();
+        let result;
+        try {
+            result = fn.apply(this, args);
+        } catch (err) {
+            record(name, start);
+            throw err;
+        }
+        if (result && typeof result.then === 'function') {
+            return result.finally(() => record(name, start));
+        }
+        record(name, start);
+        return result;
+    };
+}
+
+// Run fn now as a span
+export function measure(name, fn) {
+    return timed(name, fn)();
+}
+
+function percentile(sorted, q) {
+    if (sorted.length === 0) return 0;
+    return sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))];
+}
+
+// Rolling summary per span, in milliseconds
+export function getPerfSummary() {
+    const summary = {};
+    for (const [name, span] of spans) {
+        const sorted = [...span.samples].sort((a, b) => a - b);
+        summary[name] = {
+            count: span.count,
+            last: span.samples[span.samples.length - 1] || 0,
+            mean: span.count ? span.totalMs / span.count : 0,
+            p50: percentile(sorted, 0.5),
+            p95: percentile(sorted, 0.95),
+            max: sorted[sorted.length - 1] || 0,
+        };
+    }
+    return { spans: summary, longTasks: { ...longTasks } };
+}
+
+// --- Long tasks ---
+
+function observeLongTasks() {
+    if (typeof PerformanceObserver === 'undefined') return;
+    if (!(PerformanceObserver.supportedEntryTypes || []).includes('longtask')) return;
+    new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) {
+            longTasks.count++;
+            longTasks.totalMs += entry.duration;
+        }
+    }).observe({ type: 'longtask', buffered: true });
+}
+
+// --- Overlay ---
+
+function fmt(ms) {
+    return ms >= 100 ? ms.toFixed(0) : ms.toFixed(1);
+}
+
+function renderOverlay() {
+    if (!overlayEl) return;
+    const { spans: summary } = getPerfSummary();
+    const rows = Object.entries(summary).map(([name, s]) =>
+        `${name.padEnd(24)} ${String(s.count).padStart(5)} ${fmt(s.last).padStart(7)} ` +
+        `${fmt(s.p50).padStart(7)} ${fmt(s.p95).padStart(7)} ${fmt(s.max).padStart(7)}`
+    );
+    overlayEl.textContent = [
+        `${'span'.padEnd(24)} ${'n'.padStart(5)} ${'last'.padStart(7)} ${'p50'.padStart(7)} ${'p95'.padStart(7)} ${'max'.padStart(7)}`,
+        ...rows,
+        `long tasks: ${longTasks.count} (${fmt(longTasks.totalMs)} ms)`,
+    ].join('\n');
+}
+
+function createOverlay() {
+    overlayEl = document.createElement('pre');
+    overlayEl.id = 'perf-overlay';
+    overlayEl.className = 'perf-overlay';
+    overlayEl.setAttribute('aria-hidden', 'true');
+    overlayEl.addEventListener('click', () => overlayEl.classList.toggle('minimized'));
+    document.body.appendChild(overlayEl);
+    setInterval(renderOverlay, OVERLAY_INTERVAL);
+    renderOverlay();
+}
+
+// --- Beacon ---
+
+function sendBeacon() {
+    if (spans.size === 0 || !navigator.sendBeacon) return;
+    const payload = {
+        client: clientId,
+        ts: new Date().toISOString(),
+        ...getPerfSummary(),
+    };
+    if (performance.memory) payload.heapBytes = performance.memory.usedJSHeapSize;
+    const url = new URL(BEACON_PATH, window.location.origin);
+    navigator.sendBeacon(url.toString(), new Blob([JSON.stringify(payload)], { type: 'application/json' }));
+}
+
+export function initPerf() {
+    if (!isPerfEnabled()) return;
+    observeLongTasks();
+    createOverlay();
+    if (MODE === 'beacon') {
+        setInterval(sendBeacon, BEACON_INTERVAL);
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') sendBeacon();
+        });
+    }
+}
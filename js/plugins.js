@@ -3,8 +3,17 @@
 import { state } from './state.js';
 import { getChartDefaults } from './charts.js';
 import { getChartColors, getUIColors } from './config.js';
+import { convertValue } from './units.js';
+import { timed } from './perf.js';
+import { isVisible, watchVisibility, unwatchVisibility } from './visibility.js';
 
 const loadedPlugins = [];
+let refreshController = null;
+
+// Plugins with a section skip refresh() while it is collapsed or off-screen,
+// and catch up once it is shown again
+const sections = new Map();   // plugin -> section element
+const stale = new Set();      // plugins that skipped a refresh
 
 function getPluginServerUrl(name) {
     const params = new URLSearchParams(window.location.search);
@@ -23,10 +32,11 @@ function getPluginServerUrl(name) {
     return localStorage.getItem(key) || null;
 }
 
-function buildContext() {
+function buildContext(signal) {
     const { baseOptions, makeDataset } = getChartDefaults();
     return {
         state,
+        signal,
         chartDefaults: { baseOptions, makeDataset },
         formatters: {
             formatTemp: (v, units) => {
@@ -40,6 +50,7 @@ function buildContext() {
             },
         },
         get units() { return state.get('units') || 'metric'; },
+        convert: (quantity, value) => convertValue(quantity, value, state.get('units') || 'metric'),
         get timeRange() {
             return {
                 type: state.get('timeRangeType'),
@@ -103,6 +114,7 @@ export async function loadPlugins() {
 
                 header.addEventListener('click', () => {
                     section.classList.toggle('collapsed');
+                    catchUp(plugin);
                 });
 
                 const content = document.createElement('div');
@@ -117,6 +129,8 @@ export async function loadPlugins() {
                 section.appendChild(header);
                 section.appendChild(content);
                 container.appendChild(section);
+                sections.set(plugin, section);
+                watchVisibility(section, () => catchUp(plugin));
             }
 
             // Create charts
@@ -129,17 +143,54 @@ export async function loadPlugins() {
     }
 }
 
-export async function refreshPlugins() {
-    const ctx = buildContext();
+function isShown(plugin) {
+    const section = sections.get(plugin);
+    return !section || (!section.classList.contains('collapsed') && isVisible(section));
+}
+
+// Returns false once the refresh was superseded
+async function refreshPlugin(plugin, ctx) {
+    try {
+        if (plugin.refresh) await plugin.refresh(ctx);
+    } catch (err) {
+        if (err.name === 'AbortError') return false;
+        console.error(`Plugin "${plugin.name}" refresh error:`, err);
+    }
+    return true;
+}
+
+async function refreshAll() {
+    // A newer refresh (station/range/unit change) supersedes one still in flight
+    if (refreshController) refreshController.abort();
+    const controller = new AbortController();
+    refreshController = controller;
+
+    const ctx = buildContext(controller.signal);
     for (const plugin of loadedPlugins) {
-        try {
-            if (plugin.refresh) await plugin.refresh(ctx);
-        } catch (err) {
-            console.error(`Plugin "${plugin.name}" refresh error:`, err);
+        if (controller.signal.aborted) break;
+        if (!isShown(plugin)) {
+            stale.add(plugin);
+            continue;
         }
+        stale.delete(plugin);
+        if (!await refreshPlugin(plugin, ctx)) break;
     }
+    if (refreshController === controller) refreshController = null;
 }
 
+// Refresh a plugin that skipped refreshes while its section was hidden
+async function catchUp(plugin) {
+    if (!stale.has(plugin) || !isShown(plugin)) return;
+    stale.delete(plugin);
+    // Shares the signal of a refresh in flight, so the next one supersedes both
+    const controller = refreshController || new AbortController();
+    refreshController = controller;
+    await refreshPlugin(plugin, buildContext(controller.signal));
+    if (refreshController === controller) refreshController = null;
+}
+
+export const refreshPlugins = timed('refreshPlugins', refreshAll);
+
 export function destroyPlugins() {
     for (const plugin of loadedPlugins) {
         try {
@@ -148,5 +199,8 @@ export function destroyPlugins() {
             console.error(`Plugin "${plugin.name}" destroy error:`, err);
         }
     }
+    for (const section of sections.values()) unwatchVisibility(section);
+    sections.clear();
+    stale.clear();
     loadedPlugins.length = 0;
 }
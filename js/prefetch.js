@@ -0,0 +1,106 @@
+// Idle-time prefetch of neighbouring presets and other stations into the tile cache
+
+import { state } from './state.js';
+import { getResolution, RESOLUTION_MINUTES, TIME_RANGES } from './config.js';
+import { getTiledObservations, hasTiles } from './tiles.js';
+
+const PRESET_ORDER = Object.keys(TIME_RANGES);
+const BYTES_PER_POINT = 450;                // rough JSON size of one observation
+const PREFETCH_BUDGET = 2 * 1024 * 1024;    // estimated bytes per prefetch pass
+
+const requestIdle = window.requestIdleCallback
+    ? (fn) => window.requestIdleCallback(fn, { timeout: 5000 })
+    : (fn) => setTimeout(fn, 1000);
+const cancelIdle = window.cancelIdleCallback || clearTimeout;
+
+let idleHandle = null;
+let controller = null;
+
+// Bytes we may spend this pass; nothing when the user asked to save data
+function byteBudget() {
+    const conn = navigator.connection;
+    if (!conn) return PREFETCH_BUDGET;
+    if (conn.saveData || /2g$/.test(conn.effectiveType || '')) return 0;
+    if (conn.effectiveType === '3g') return PREFETCH_BUDGET / 4;
+    return PREFETCH_BUDGET;
+}
+
+function presetWindow(rangeKey) {
+    const { hours } = TIME_RANGES[rangeKey];
+    const end = Date.now();
+    return {
+        start: new Date(end - hours * 3600000).toISOString(),
+        end: new Date(end).toISOString(),
+        hours,
+    };
+}
+
+// Windows the user is likely to ask for next, most likely first
+function candidates() {
+    const stationId = state.get('stationId');
+    const start = state.get('startTime');
+    const end = state.get('endTime');
+    const list = [];
+
+    const i = PRESET_ORDER.indexOf(state.get('timeRange'));
+    if (state.get('timeRangeType') === 'preset' && i >= 0) {
+        for (const key of [PRESET_ORDER[i + 1], PRESET_ORDER[i - 1]]) {
+            if (key) list.push({ stationId, ...presetWindow(key) });
+        }
+    }
+
+    if (start && end) {
+        const hours = (new Date(end) - new Date(start)) / 3600000;
+        for (const s of state.get('stations') || []) {
+            if (s.station_id !== stationId) {
+                list.push({ stationId: s.station_id, start, end, hours });
+            }
+        }
+    }
+    return list;
+}
+
+// Warm the tile cache one window per idle period, within the byte budget
+export function schedulePrefetch() {
+    cancelPrefetch();
+    let budget = byteBudget();
+    if (budget <= 0 || document.hidden) return;
+
+    const queue = candidates();
+    const ctrl = new AbortController();
+    controller = ctrl;
+
+    const step = () => {
+        idleHandle = null;
+        const next = queue.shift();
+        if (!next || ctrl.signal.aborted) return;
+
+        const resolution = getResolution(next.hours);
+        const opts = { resolution, signal: ctrl.signal };
+        const cost = (next.hours * 60 / RESOLUTION_MINUTES[resolution]) * BYTES_PER_POINT;
+        if (cost > budget || hasTiles(next.stationId, next.start, next.end, opts)) {
+            idleHandle = requestIdle(step);
+            return;
+        }
+
+        budget -= cost;
+        getTiledObservations(next.stationId, next.start, next.end, opts)
+            .catch(() => {})  // best effort
+            .then(() => {
+                if (!ctrl.signal.aborted) idleHandle = requestIdle(step);
+            });
+    };
+    idleHandle = requestIdle(step);
+}
+
+// Stop prefetching; tiles a foreground request has joined stay in flight
+export function cancelPrefetch() {
+    if (idleHandle !== null) {
+        cancelIdle(idleHandle);
+        idleHandle = null;
+    }
+    if (controller) {
+        controller.abort();
+        controller = null;
+    }
+}
@@ -0,0 +1,82 @@
+// Adaptive poll timing: poll just after the station's next report is due,
+// back off while no new report arrives or polls fail, and add jitter so
+// dashboards sharing a server do not poll in lockstep. Report times are on
+// the server's clock, so `now` is shifted by the offset seen in Date headers.
+
+const REPORT_INTERVAL = 60000;    // Tempest stations report once a minute
+const INGEST_GRACE = 5000;        // time for tempestd to receive and store a report
+const MIN_DELAY = 2000;
+const LATE_DELAY = 10000;         // first retry when the report is overdue; doubles
+const ERROR_DELAY = 30000;        // first retry after a failed poll; doubles
+const MAX_DELAY = 5 * 60000;
+const JITTER = 0.1;               // up to 10% added to every delay
+const CLOCK_SAMPLES = 20;         // recent Date headers kept for the clock offset
+
+// Newest report seen: { stationId, reported } (ms)
+let newest = null;
+let overdue = 0;    // polls in a row that found no new report past its due time
+let failures = 0;   // polls in a row that failed
+
+// Server clock minus ours (ms), one per recent response. Date headers are
+// whole seconds and reach us late, and one replayed from the service
+// worker's cache is older still, so every sample errs low: the largest wins.
+const clockOffsets = [];
+
+/**
+ * Note a response's Date header. Without any (a cross-origin server that
+ * does not expose it), our own clock is used as is.
+ */
+export function noteServerDate(header, now = Date.now()) {
+    const date = Date.parse(header);
+    if (Number.isNaN(date)) return;
+    clockOffsets.push(date - now);
+    if (clockOffsets.length > CLOCK_SAMPLES) clockOffsets.shift();
+}
+
+function serverTime(now) {
+    return clockOffsets.length > 0 ? now + Math.max(...clockOffsets) : now;
+}
+
+function backoff(base, attempt) {
+    return base * 2 ** Math.max(0, attempt - 1);
+}
+
+/**
+ * Note what a scheduled poll found: its current observation, or null when it
+ * failed. Only these calls move the backoff counters.
+ */
+export function recordPoll(obs, now = Date.now()) {
+    if (!obs) {
+        failures++;
+        return;
+    }
+    failures = 0;
+    now = serverTime(now);
+    const reported = Date.parse(obs.timestamp);
+    if (!newest || newest.stationId !== obs.station_id || reported > newest.reported) {
+        newest = { stationId: obs.station_id, reported };
+        overdue = 0;
+    } else if (newest.reported + REPORT_INTERVAL + INGEST_GRACE <= now) {
+        overdue++;
+    }
+}
+
+/**
+ * Milliseconds until the next poll, given the latest current observation, or
+ * null when the last fetch failed. Reads the counters but never changes them,
+ * so asking again (a tab shown again, polling restarted) does not back off further.
+ */
+export function nextPollDelay(obs, now = Date.now()) {
+    let delay;
+    if (!obs) {
+        delay = backoff(ERROR_DELAY, Math.max(1, failures));
+    } else {
+        now = serverTime(now);
+        let reported = Date.parse(obs.timestamp);
+        if (newest && newest.stationId === obs.station_id) reported = Math.max(reported, newest.reported);
+        const due = reported + REPORT_INTERVAL + INGEST_GRACE;
+        delay = due > now ? due - now : backoff(LATE_DELAY, Math.max(1, overdue));
+    }
+    delay = Math.max(MIN_DELAY, Math.min(MAX_DELAY, delay));
+    return Math.round(delay * (1 + Math.random() * JITTER));
+}
@@ -1,25 +1,99 @@
-// Simple reactive state store with event subscriptions
+// Simple reactive state store with event subscriptions.
+// set() only notifies when the value changes; inside batch() each changed key
+// notifies once, with its final value, when the outermost batch ends.
 
 class State {
     constructor() {
         this._data = {};
         this._listeners = {};
+        this._computed = {};     // key -> { deps, fn, args, value, notified }
+        this._dependents = {};   // dep key -> [computed keys]
+        this._depth = 0;
+        this._pending = new Set();
     }
 
     get(key) {
-        return this._data[key];
+        const computed = this._computed[key];
+        return computed ? this._evaluate(computed) : this._data[key];
     }
 
     set(key, value) {
+        if (Object.is(this._data[key], value)) return;
         this._data[key] = value;
-        const listeners = this._listeners[key];
-        if (listeners) {
-            for (const fn of listeners) {
-                fn(value);
+        this._pending.add(key);
+        if (this._depth === 0) this._flush();
+    }
+
+    // Apply several set()s as one update; returns fn's result
+    batch(fn) {
+        this._depth++;
+        try {
+            return fn();
+        } finally {
+            this._depth--;
+            if (this._depth === 0) this._flush();
+        }
+    }
+
+    /**
+     * Define key as fn(...deps values). It is recomputed only when a dependency
+     * changes, and its listeners fire only when the result changes.
+     */
+    computed(key, deps, fn) {
+        const computed = { deps, fn, args: null, value: undefined, notified: undefined };
+        this._computed[key] = computed;
+        for (const dep of deps) {
+            (this._dependents[dep] = this._dependents[dep] || []).push(key);
+        }
+        computed.notified = this._evaluate(computed);
+    }
+
+    _evaluate(computed) {
+        const args = computed.deps.map((dep) => this.get(dep));
+        if (!computed.args || args.some((v, i) => !Object.is(v, computed.args[i]))) {
+            computed.args = args;
+            computed.value = computed.fn(...args);
+        }
+        return computed.value;
+    }
+
+    _flush() {
+        while (this._pending.size > 0) {
+            const keys = [...this._pending];
+            this._pending.clear();
+            const changed = [];
+            for (const key of keys) {
+                changed.push(key);
+                for (const dependent of this._dependents[key] || []) {
+                    // Compare with what listeners last saw: a get() since the
+                    // set() may already have refreshed the cached value
+                    const computed = this._computed[dependent];
+                    const value = this._evaluate(computed);
+                    if (!Object.is(computed.notified, value)) {
+                        computed.notified = value;
+                        changed.push(dependent);
+                    }
+                }
+            }
+            // A listener's own set()s are queued for the next pass
+            this._depth++;
+            try {
+                for (const key of changed) this._notify(key);
+            } finally {
+                this._depth--;
             }
         }
     }
 
+    _notify(key) {
+        const listeners = this._listeners[key];
+        if (!listeners) return;
+        const value = this.get(key);
+        for (const fn of [...listeners]) {
+            fn(value);
+        }
+    }
+
     on(key, callback) {
         if (!this._listeners[key]) {
             this._listeners[key] = [];
@@ -0,0 +1,229 @@
+// Calendar heatmap of daily summaries: a year of highs/lows or rain totals.
+// A finished day's summary never changes, so each is fetched once per session;
+// only the last couple of days are asked for again.
+
+import { state } from './state.js';
+import { getDailySummary, getDailySummaries } from './api.js';
+import { convertValue } from './units.js';
+import { timed } from './perf.js';
+
+const CALENDAR_DAYS = 365;
+const FINAL_AFTER_MS = 2 * 86400000;     // after its UTC midnight a day is over everywhere
+const RECENT_REFRESH_MS = 15 * 60000;    // how often unfinished days are fetched again
+const FALLBACK_CONCURRENCY = 6;          // per-day requests in flight without the batch route
+const LEVELS = 5;
+const DAY_MS = 86400000;
+
+// `${stationId}:${date}` -> summary; finished days only
+const finalDays = new Map();
+// `${stationId}:${date}` -> summary; days that may still change
+let recentDays = new Map();
+let recentFetchedAt = 0;
+let recentStation = null;
+let batchSupported = true;
+let metric = 'temperature';
+let loading = null;   // { stationId, controller } while a load is in flight
+
+// Cells built once per first date, then patched in place
+let cells = [];
+let cellsFrom = null;
+
+function isoDate(ms) {
+    return new Date(ms).toISOString().slice(0, 10);
+}
+
+function calendarDates(now = Date.now()) {
+    const today = Math.floor(now / DAY_MS) * DAY_MS;
+    const dates = [];
+    for (let i = CALENDAR_DAYS - 1; i >= 0; i--) dates.push(isoDate(today - i * DAY_MS));
+    return dates;
+}
+
+function isFinal(date, now = Date.now()) {
+    return Date.parse(`${date}T00:00:00Z`) + FINAL_AFTER_MS <= now;
+}
+
+// Contiguous runs of dates, so the batch route gets one request per gap
+function runs(dates) {
+    const out = [];
+    for (const date of dates) {
+        const last = out[out.length - 1];
+        if (last && Date.parse(date) - Date.parse(last[1]) === DAY_MS) last[1] = date;
+        else out.push([date, date]);
+    }
+    return out;
+}
+
+// Both fetchers hand each summary to keep() as it arrives, so an interrupted
+// load still leaves its days behind for the next one to skip
+async function fetchBatch(stationId, dates, signal, keep) {
+    for (const [start, end] of runs(dates)) {
+        const res = await getDailySummaries(stationId, start, end, 'metric', { signal });
+        res.summaries.forEach(keep);
+    }
+}
+
+// Without the dev proxy: one request per day, a few at a time
+async function fetchEach(stationId, dates, signal, keep) {
+    const queue = [...dates];
+    async function worker() {
+        while (queue.length > 0 && !signal.aborted) {
+            const date = queue.shift();
+            try {
+                keep(await getDailySummary(stationId, date, 'metric', { signal }));
+            } catch (err) {
+                if (err.name === 'AbortError') throw err;
+                // a day tempestd has no data for stays blank
+            }
+        }
+    }
+    await Promise.all(Array.from({ length: FALLBACK_CONCURRENCY }, worker));
+}
+
+async function fetchSummaries(stationId, dates, signal, keep) {
+    if (batchSupported) {
+        try {
+            return await fetchBatch(stationId, dates, signal, keep);
+        } catch (err) {
+            if (err.status !== 404) throw err;
+            batchSupported = false;
+        }
+    }
+    return fetchEach(stationId, dates, signal, keep);
+}
+
+/**
+ * Fetch whatever the calendar lacks: finished days never seen before and,
+ * every RECENT_REFRESH_MS, the days that may still change. A poll that finds
+ * this station's load still running leaves it be; a station switch aborts it.
+ */
+async function loadSummaries() {
+    const stationId = state.get('stationId');
+    const section = document.getElementById('summary-calendar');
+    if (!stationId || !section) return;
+    if (loading) {
+        if (loading.stationId === stationId) return;
+        loading.controller.abort();
+        loading = null;
+    }
+
+    const now = Date.now();
+    const dates = calendarDates(now);
+    if (recentStation !== stationId) {
+        recentDays = new Map();
+        recentFetchedAt = 0;
+        recentStation = stationId;
+        renderSummaries();   // blank out the previous station's days
+    }
+    const refreshRecent = now - recentFetchedAt >= RECENT_REFRESH_MS;
+    const wanted = dates.filter((date) => isFinal(date, now)
+        ? !finalDays.has(`${stationId}:${date}`)
+        : refreshRecent);
+    if (wanted.length === 0) {
+        renderSummaries();
+        return;
+    }
+
+    const load = loading = { stationId, controller: new AbortController() };
+    const { signal } = load.controller;
+    const keep = (summary) => {
+        if (signal.aborted) return;
+        const key = `${stationId}:${summary.date}`;
+        if (isFinal(summary.date, now)) finalDays.set(key, summary);
+        else recentDays.set(key, summary);
+    };
+    try {
+        await fetchSummaries(stationId, wanted, signal, keep);
+        if (signal.aborted) return;
+        if (refreshRecent) recentFetchedAt = now;
+        renderSummaries();
+    } catch (err) {
+        if (err.name === 'AbortError') return;
+        console.error('Failed to fetch daily summaries:', err);
+        renderSummaries();   // the days that did arrive
+    } finally {
+        if (loading === load) loading = null;
+    }
+}
+
+export const refreshSummaries = timed('summaries', loadSummaries);
+
+function valueOf(summary) {
+    if (!summary) return null;
+    if (metric === 'rain') return summary.rain_total ?? null;
+    return summary.temperature ? summary.temperature.high : null;
+}
+
+function describe(date, summary, units) {
+    if (!summary) return `${date}: no data`;
+    const temp = units === 'metric' ? '\u00B0C' : '\u00B0F';
+    const rain = units === 'metric' ? 'mm' : 'in';
+    const fmt = (quantity, v, digits) =>
+        v === null || v === undefined ? '--' : Number(convertValue(quantity, v, units)).toFixed(digits);
+    const t = summary.temperature || {};
+    return `${date}: high ${fmt('temperature', t.high, 1)}${temp}, low ${fmt('temperature', t.low, 1)}${temp}, `
+        + `rain ${fmt('rain', summary.rain_total, units === 'metric' ? 1 : 2)} ${rain}`;
+}
+
+function ensureCells(grid, dates) {
+    if (cellsFrom === dates[0]) return;
+    cellsFrom = dates[0];
+    grid.textContent = '';
+    cells = [];
+    // Offset the first column so rows line up with weekdays (Sunday on top)
+    const lead = new Date(`${dates[0]}T00:00:00Z`).getUTCDay();
+    for (let i = 0; i < lead; i++) {
+        const pad = document.createElement('div');
+        pad.className = 'calendar-pad';
+        grid.appendChild(pad);
+    }
+    for (let i = 0; i < dates.length; i++) {
+        const cell = document.createElement('div');
+        cell.className = 'calendar-day';
+        grid.appendChild(cell);
+        cells.push(cell);
+    }
+}
+
+// Paint the calendar from what has been fetched; no network
+export function renderSummaries() {
+    const section = document.getElementById('summary-calendar');
+    const grid = document.getElementById('calendar-grid');
+    const stationId = state.get('stationId');
+    if (!section || !grid || !stationId) return;
+
+    const units = state.get('units') || 'metric';
+    const dates = calendarDates();
+    ensureCells(grid, dates);
+    const summaries = dates.map((date) =>
+        finalDays.get(`${stationId}:${date}`) || recentDays.get(`${stationId}:${date}`));
+
+    const values = summaries.map(valueOf).filter((v) => v !== null);
+    const lo = metric === 'rain' ? 0 : Math.min(...values);
+    const hi = Math.max(...values);
+    grid.dataset.metric = metric;
+    dates.forEach((date, i) => {
+        const value = valueOf(summaries[i]);
+        const cell = cells[i];
+        if (value === null) {
+            delete cell.dataset.level;
+        } else {
+            const t = hi > lo ? (value - lo) / (hi - lo) : 0;
+            cell.dataset.level = metric === 'rain' && value === 0
+                ? '0'
+                : String(Math.min(LEVELS - 1, 1 + Math.floor(t * (LEVELS - 1))));
+        }
+        cell.title = describe(date, summaries[i], units);
+    });
+}
+
+export function initSummaries() {
+    const buttons = document.querySelectorAll('#calendar-metric button');
+    for (const button of buttons) {
+        button.addEventListener('click', () => {
+            metric = button.dataset.metric;
+            for (const b of buttons) b.classList.toggle('active', b === button);
+            renderSummaries();
+        });
+    }
+}
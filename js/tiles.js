@@ -0,0 +1,196 @@
+// Tiled observation cache — fixed, epoch-aligned windows per resolution tier.
+// Tiles hold metric data; js/units.js converts for display.
+
+import { getObservations } from './api.js';
+import { RESOLUTION_MINUTES, POLL_INTERVAL } from './config.js';
+
+const TILE_POINTS = 120;                    // buckets per tile
+const MAX_TILES = 300;                      // LRU cap across stations and tiers
+const LIVE_TILE_TTL = POLL_INTERVAL / 2;    // reuse window for the tile containing "now"
+const SETTLE_MS = 5 * 60000;                // late-arriving data grace before a tile is final
+
+// key -> { start, end, observations, fetchedAt, pending }
+const tiles = new Map();
+
+// Called with every freshly fetched tile that may still change (see onLiveTile)
+let liveTileListener = null;
+
+function tileSpan(resolution) {
+    return (RESOLUTION_MINUTES[resolution] || 1) * 60000 * TILE_POINTS;
+}
+
+function tileKey(stationId, resolution, start) {
+    return `${stationId}|${resolution}|${start}`;
+}
+
+function tileStarts(startMs, endMs, span) {
+    const starts = [];
+    for (let t = Math.floor(startMs / span) * span; t <= endMs; t += span) {
+        starts.push(t);
+    }
+    return starts;
+}
+
+// Keep observations with from <= timestamp <= to
+function clip(observations, from, to) {
+    return observations.filter((obs) => {
+        const t = Date.parse(obs.timestamp);
+        return t >= from && t <= to;
+    });
+}
+
+// Past tiles are immutable once settled; the live tile is only reused briefly
+function isFresh(entry, now) {
+    if (!entry || entry.pending || !entry.observations) return false;
+    if (entry.end + SETTLE_MS <= entry.fetchedAt) return true;
+    return now - entry.fetchedAt < LIVE_TILE_TTL;
+}
+
+function remember(key, entry) {
+    tiles.delete(key);
+    tiles.set(key, entry);
+    while (tiles.size > MAX_TILES) {
+        tiles.delete(tiles.keys().next().value);
+    }
+}
+
+function abortError(signal) {
+    return signal.reason || new DOMException('Aborted', 'AbortError');
+}
+
+// Callers share one in-flight request per tile; it is only cancelled once
+// every caller that joined it has aborted
+function join(record, signal) {
+    record.waiters++;
+    if (!signal) return record.pending;
+    if (signal.aborted) {
+        release(record);
+        return Promise.reject(abortError(signal));
+    }
+    return new Promise((resolve, reject) => {
+        const onAbort = () => {
+            release(record);
+            reject(abortError(signal));
+        };
+        signal.addEventListener('abort', onAbort, { once: true });
+        record.pending
+            .then(resolve, reject)
+            .finally(() => signal.removeEventListener('abort', onAbort));
+    });
+}
+
+function release(record) {
+    record.waiters--;
+    if (record.waiters <= 0) record.controller.abort();
+}
+
+// An in-flight request that has not been cancelled
+function isLive(entry) {
+    return !!(entry && entry.pending && !entry.controller.signal.aborted);
+}
+
+// Only the newest request for a tile may write its result back
+function owns(key, record) {
+    return !tiles.has(key) || tiles.get(key) === record;
+}
+
+function loadTile(stationId, resolution, start, signal) {
+    const key = tileKey(stationId, resolution, start);
+    const entry = tiles.get(key);
+    if (isLive(entry)) return join(entry, signal);
+
+    const now = Date.now();
+    if (isFresh(entry, now)) {
+        remember(key, entry);
+        return Promise.resolve(entry.observations);
+    }
+
+    const end = start + tileSpan(resolution);
+    const previous = entry && entry.observations
+        ? { start, end, observations: entry.observations, fetchedAt: entry.fetchedAt }
+        : null;
+    const record = { ...previous, start, end, controller: new AbortController(), waiters: 0 };
+    record.pending = getObservations(
+        stationId,
+        new Date(start).toISOString(),
+        new Date(end).toISOString(),
+        { resolution, signal: record.controller.signal }
+    ).then((data) => {
+        const observations = clip((data && data.observations) || [], start, end - 1);
+        if (owns(key, record)) remember(key, { start, end, observations, fetchedAt: now });
+        if (liveTileListener && end + SETTLE_MS > now) {
+            liveTileListener({ stationId, resolution, start, observations, fetchedAt: now });
+        }
+        return observations;
+    }).catch((err) => {
+        // Keep whatever we had before the failed or cancelled refresh
+        if (owns(key, record)) {
+            if (previous) remember(key, previous);
+            else tiles.delete(key);
+        }
+        throw err;
+    });
+
+    remember(key, record);
+    return join(record, signal);
+}
+
+// Fetch [start, end] at one resolution tier, reusing cached tiles
+export async function getTiledObservations(stationId, start, end, opts = {}) {
+    const { resolution, signal } = opts;
+    const startMs = Date.parse(start);
+    const endMs = Date.parse(end);
+    const starts = tileStarts(startMs, endMs, tileSpan(resolution));
+    const parts = await Promise.all(
+        starts.map((t) => loadTile(stationId, resolution, t, signal))
+    );
+    return clip(parts.flat(), startMs, endMs);
+}
+
+// True when every tile covering [start, end] can be served from memory
+export function hasTiles(stationId, start, end, opts = {}) {
+    const { resolution } = opts;
+    const now = Date.now();
+    return tileStarts(Date.parse(start), Date.parse(end), tileSpan(resolution))
+        .every((t) => isFresh(tiles.get(tileKey(stationId, resolution, t)), now));
+}
+
+// Cached observations for [start, end], including a live tile that is due a
+// refresh; null when any tile has never been loaded
+export function peekTiles(stationId, start, end, opts = {}) {
+    const { resolution } = opts;
+    const startMs = Date.parse(start);
+    const endMs = Date.parse(end);
+    const parts = [];
+    for (const t of tileStarts(startMs, endMs, tileSpan(resolution))) {
+        const entry = tiles.get(tileKey(stationId, resolution, t));
+        if (!entry || !entry.observations) return null;
+        parts.push(entry.observations);
+    }
+    return clip(parts.flat(), startMs, endMs);
+}
+
+// Overlay finer observations for [from, to] onto a coarser base series
+export function mergeDetail(base, detail, from, to) {
+    const before = base.filter((obs) => Date.parse(obs.timestamp) < from);
+    const after = base.filter((obs) => Date.parse(obs.timestamp) > to);
+    return [...before, ...clip(detail, from, to), ...after];
+}
+
+// Register fn(tile) for tiles fetched while still open to new data, so they
+// can be shared with other tabs
+export function onLiveTile(fn) {
+    liveTileListener = fn;
+}
+
+// Adopt a tile fetched elsewhere (another tab) unless ours is newer or loading
+export function storeTile({ stationId, resolution, start, observations, fetchedAt }) {
+    const key = tileKey(stationId, resolution, start);
+    const entry = tiles.get(key);
+    if (isLive(entry) || (entry && entry.fetchedAt >= fetchedAt)) return;
+    remember(key, { start, end: start + tileSpan(resolution), observations, fetchedAt });
+}
+
+export function clearTiles() {
+    tiles.clear();
+}
@@ -0,0 +1,66 @@
+// Client-side unit conversion — data is fetched in metric and converted for display
+
+const MS_TO_MPH = 2.236936;
+const HPA_TO_INHG = 0.0295300;
+const MM_PER_INCH = 25.4;
+const KM_TO_MI = 0.621371;
+
+const TO_IMPERIAL = {
+    temperature: (c) => c * 9 / 5 + 32,
+    wind: (ms) => ms * MS_TO_MPH,
+    pressure: (hpa) => hpa * HPA_TO_INHG,
+    rain: (mm) => mm / MM_PER_INCH,
+    distance: (km) => km * KM_TO_MI,
+};
+
+// Observation fields that carry a unit, by quantity
+const OBSERVATION_FIELDS = {
+    air_temperature: 'temperature',
+    feels_like: 'temperature',
+    dew_point: 'temperature',
+    wind_avg: 'wind',
+    wind_gust: 'wind',
+    wind_lull: 'wind',
+    station_pressure: 'pressure',
+    rain_accumulation: 'rain',
+    lightning_avg_distance: 'distance',
+};
+
+/**
+ * Convert one metric value into the given unit system.
+ * Quantities: temperature, wind, pressure, rain, distance.
+ */
+export function convertValue(quantity, value, units) {
+    if (value === null || value === undefined || units !== 'imperial') return value;
+    const fn = TO_IMPERIAL[quantity];
+    return fn ? fn(Number(value)) : value;
+}
+
+// Convert a metric observation for display; metric input is returned as-is
+export function convertObservation(obs, units) {
+    if (!obs || units !== 'imperial') return obs;
+    const out = { ...obs, units };
+    for (const [field, quantity] of Object.entries(OBSERVATION_FIELDS)) {
+        out[field] = convertValue(quantity, obs[field], units);
+    }
+    return out;
+}
+
+export function convertObservations(observations, units) {
+    if (units !== 'imperial') return observations;
+    return observations.map((obs) => convertObservation(obs, units));
+}
+
+// Fields where client and server conversions disagree beyond rounding
+export function diffConversion(client, server, tolerance = 0.05) {
+    const mismatches = [];
+    for (const field of Object.keys(OBSERVATION_FIELDS)) {
+        const a = client[field];
+        const b = server[field];
+        if (a === null || a === undefined || b === null || b === undefined) continue;
+        if (Math.abs(a - b) > tolerance * Math.max(1, Math.abs(b))) {
+            mismatches.push({ field, client: a, server: b });
+        }
+    }
+    return mismatches;
+}
@@ -0,0 +1,45 @@
+// Tracks which elements are on (or close to) the screen, so charts and plugin
+// sections scrolled out of view can put off their work until they come back.
+// Without IntersectionObserver everything counts as visible.
+
+const MARGIN = '200px';   // start drawing a little before an element scrolls in
+
+const offscreen = new WeakSet();
+const callbacks = new WeakMap();   // element -> fn run each time it comes into view
+let observer = null;
+
+function getObserver() {
+    if (!observer && typeof IntersectionObserver !== 'undefined') {
+        observer = new IntersectionObserver((entries) => {
+            for (const entry of entries) {
+                if (entry.isIntersecting) {
+                    offscreen.delete(entry.target);
+                    const fn = callbacks.get(entry.target);
+                    if (fn) fn();
+                } else {
+                    offscreen.add(entry.target);
+                }
+            }
+        }, { rootMargin: MARGIN });
+    }
+    return observer;
+}
+
+// Elements count as visible until the observer first reports on them
+export function isVisible(el) {
+    return !offscreen.has(el);
+}
+
+export function watchVisibility(el, onVisible) {
+    const obs = getObserver();
+    if (!el || !obs) return;
+    callbacks.set(el, onVisible);
+    obs.observe(el);
+}
+
+export function unwatchVisibility(el) {
+    if (!el) return;
+    callbacks.delete(el);
+    offscreen.delete(el);
+    if (observer) observer.unobserve(el);
+}
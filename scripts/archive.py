@@ -0,0 +1,436 @@
+"""SQLite archive of tempestd observations for the dev proxy.
+
+serve.py --archive keeps a local copy of 1-minute metric observations: every
+1m /observations response it proxies is ingested, and a sync thread backfills
+history and tops up the newest minutes through the same proxy backends. Each
+new row is also folded into 5m/30m/1h/3h/1d rollup tables, so a 90-day query
+at 3h resolution is an indexed range scan over ~720 pre-aggregated rows
+rather than a downsample of 130k raw ones.
+
+Rollups keep running sums, so adding a row never rereads a bucket: most fields
+are means, rain and lightning strikes are totals, gusts and precipitation type
+keep the maximum, lulls the minimum, and wind direction is a vector mean.
+Missing or null readings are left out, so a sensor dropout does not pull a
+bucket towards zero; a bucket with no readings for a field reports null.
+"""
+
+import gzip
+import json
+import math
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit, urlencode
+
+ROLLUPS = {"5m": 300, "30m": 1800, "1h": 3600, "3h": 10800, "1d": 86400}
+SUM_FIELDS = ("rain_accumulation", "lightning_strike_count")
+MAX_FIELDS = ("wind_gust", "precipitation_type")
+MIN_FIELDS = ("wind_lull",)
+MEAN_FIELDS = (
+    "wind_avg", "station_pressure", "air_temperature", "relative_humidity", "uv_index",
+    "solar_radiation", "lightning_avg_distance", "battery", "feels_like", "dew_point",
+)
+ROUND = {"rain_accumulation": 3, "relative_humidity": 1, "uv_index": 1, "solar_radiation": 1,
+         "lightning_avg_distance": 1, "wind_direction": 1}
+INT_FIELDS = ("lightning_strike_count", "precipitation_type")
+COUNT_COLUMNS = tuple(f"n_{f}" for f in MEAN_FIELDS + ("wind_direction",))   # readings per mean
+SCHEMA_VERSION = 2   # 2: per-field reading counts in the rollup tables
+
+DEFAULT_LIMIT = 1000
+PAGE_ROWS = 1440          # one day of minutes per backfill request
+SETTLE_SECONDS = 300      # minutes this recent may still arrive late, so are never marked covered
+BUSY_TIMEOUT_MS = 10000   # workers of one --processes server share the file
+
+
+def parse_time(text):
+    """Epoch seconds for an ISO 8601 timestamp (a trailing Z is allowed), or None."""
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _reading(obs, field):
+    """A numeric reading, or None when it is missing or null."""
+    value = obs.get(field)
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return value
+    return None
+
+
+def _merge(intervals):
+    """Union of (start, end) intervals; touching ones (within a minute) join up."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 60:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+class Archive:
+    """Raw 1m rows, rollup tables and the time ranges known to be complete."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._queue = queue.SimpleQueue()
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""CREATE TABLE IF NOT EXISTS observations (
+            station_id INTEGER, ts INTEGER, data TEXT, PRIMARY KEY (station_id, ts)) WITHOUT ROWID""")
+        db.execute("""CREATE TABLE IF NOT EXISTS coverage (
+            station_id INTEGER, start INTEGER, end INTEGER)""")
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            for name in ROLLUPS:   # older rollups counted missing readings as 0
+                db.execute(f"DROP TABLE IF EXISTS rollup_{name}")
+        columns = ", ".join([f"{c} INTEGER" for c in COUNT_COLUMNS]
+                            + [f"{f} REAL" for f in MEAN_FIELDS + SUM_FIELDS + MAX_FIELDS + MIN_FIELDS])
+        for name in ROLLUPS:
+            db.execute(f"""CREATE TABLE IF NOT EXISTS rollup_{name} (
+                station_id INTEGER, bucket INTEGER, n INTEGER, dir_x REAL, dir_y REAL, {columns},
+                PRIMARY KEY (station_id, bucket)) WITHOUT ROWID""")
+        if version < SCHEMA_VERSION:
+            self._rebuild_rollups(db)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db.close()
+        self._local = threading.local()   # no connection survives into forked workers
+
+    def _db(self):
+        """One connection per thread (and so per forked worker)."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.db = db
+        return db
+
+    # --- Writing --------------------------------------------------------------
+
+    def _rebuild_rollups(self, db):
+        """Fill empty rollup tables from the raw rows, one station at a time."""
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for (station_id,) in list(db.execute("SELECT DISTINCT station_id FROM observations")):
+                rows = {ts: json.loads(data) for ts, data in db.execute(
+                    "SELECT ts, data FROM observations WHERE station_id = ?", (station_id,))}
+                for name, step in ROLLUPS.items():
+                    self._roll_up(db, name, step, station_id, rows)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def ingest(self, station_id, observations, window=None):
+        """Add 1m metric observations; returns how many were new.
+
+        window is the (start, end) the rows were fetched for; when they are
+        the whole answer, the window counts as covered even where tempestd had
+        no data. Otherwise only the span of the rows themselves is.
+        """
+        rows = {}
+        for obs in observations:
+            ts = parse_time(obs.get("timestamp"))
+            if ts is not None:
+                rows[int(ts)] = obs
+        span = window or ((min(rows), max(rows)) if rows else None)
+        if span is None:
+            return 0
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")   # one writer across threads and worker processes
+        try:
+            new = {}
+            if rows:
+                existing = {ts for (ts,) in db.execute(
+                    "SELECT ts FROM observations WHERE station_id = ? AND ts BETWEEN ? AND ?",
+                    (station_id, min(rows), max(rows)))}
+                new = {ts: obs for ts, obs in rows.items() if ts not in existing}
+            db.executemany("INSERT INTO observations VALUES (?, ?, ?)",
+                           [(station_id, ts, json.dumps(obs)) for ts, obs in new.items()])
+            for name, step in ROLLUPS.items():
+                self._roll_up(db, name, step, station_id, new)
+            end = min(span[1], time.time() - SETTLE_SECONDS)
+            if end >= span[0]:
+                self._cover(db, station_id, int(span[0]), int(end))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return len(new)
+
+    def _roll_up(self, db, name, step, station_id, rows):
+        buckets = {}
+        for ts, obs in rows.items():
+            agg = buckets.get(ts // step * step)
+            if agg is None:
+                agg = buckets[ts // step * step] = {"n": 0, "dir_x": 0.0, "dir_y": 0.0}
+                agg.update(dict.fromkeys(COUNT_COLUMNS, 0))
+                agg.update(dict.fromkeys(MEAN_FIELDS, 0.0))
+                agg.update(dict.fromkeys(SUM_FIELDS + MAX_FIELDS + MIN_FIELDS))   # None until a reading
+            agg["n"] += 1
+            direction = _reading(obs, "wind_direction")
+            if direction is not None:
+                agg["n_wind_direction"] += 1
+                agg["dir_x"] += math.cos(math.radians(direction))
+                agg["dir_y"] += math.sin(math.radians(direction))
+            for field in MEAN_FIELDS:
+                value = _reading(obs, field)
+                if value is not None:
+                    agg[f"n_{field}"] += 1
+                    agg[field] += value
+            for fields, combine in ((SUM_FIELDS, lambda a, b: a + b), (MAX_FIELDS, max), (MIN_FIELDS, min)):
+                for field in fields:
+                    value = _reading(obs, field)
+                    if value is not None:
+                        agg[field] = value if agg[field] is None else combine(agg[field], value)
+        if not buckets:
+            return
+        additive = ("n", "dir_x", "dir_y") + COUNT_COLUMNS + MEAN_FIELDS
+        columns = additive + SUM_FIELDS + MAX_FIELDS + MIN_FIELDS
+        # NULL means no reading yet; coalesce keeps whichever side has one
+        updates = ", ".join(
+            [f"{c} = {c} + excluded.{c}" for c in additive]
+            + [f"{c} = coalesce({c} + excluded.{c}, {c}, excluded.{c})" for c in SUM_FIELDS]
+            + [f"{c} = coalesce(max({c}, excluded.{c}), {c}, excluded.{c})" for c in MAX_FIELDS]
+            + [f"{c} = coalesce(min({c}, excluded.{c}), {c}, excluded.{c})" for c in MIN_FIELDS]
+        )
+        db.executemany(
+            f"INSERT INTO rollup_{name} (station_id, bucket, {', '.join(columns)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(columns))}) "
+            f"ON CONFLICT (station_id, bucket) DO UPDATE SET {updates}",
+            [(station_id, bucket, *(agg[c] for c in columns)) for bucket, agg in buckets.items()],
+        )
+
+    def _cover(self, db, station_id, start, end):
+        intervals = db.execute("SELECT start, end FROM coverage WHERE station_id = ?", (station_id,))
+        merged = _merge([*intervals, (start, end)])
+        db.execute("DELETE FROM coverage WHERE station_id = ?", (station_id,))
+        db.executemany("INSERT INTO coverage VALUES (?, ?, ?)", [(station_id, s, e) for s, e in merged])
+
+    def wants(self, path):
+        """True for requests whose responses can be archived: 1m, metric."""
+        station_id, params = observation_request(path)
+        return (station_id is not None and params.get("resolution", "1m") == "1m"
+                and params.get("units", "metric") == "metric")
+
+    def submit(self, path, body, encoding=None):
+        """Queue a proxied /observations response for the writer thread."""
+        self._queue.put((path, body, encoding))
+
+    def start_writer(self):
+        def run():
+            while True:
+                path, body, encoding = self._queue.get()
+                try:
+                    if encoding == "gzip":
+                        body = gzip.decompress(body)
+                    self.ingest_response(path, body)
+                except (OSError, ValueError, sqlite3.Error):
+                    pass  # not an archivable response, or the database is busy; sync fills gaps
+
+        threading.Thread(target=run, name="archive-writer", daemon=True).start()
+
+    def ingest_response(self, path, body):
+        """Ingest a 1m metric /observations response body for `path`."""
+        if not self.wants(path):
+            return 0
+        station_id, params = observation_request(path)
+        data = json.loads(body)
+        page = data.get("observations") or []
+        window = None
+        if data.get("offset", 0) == 0 and len(page) >= data.get("total", len(page)):
+            start, end = parse_time(params.get("start")), parse_time(params.get("end"))
+            if start is not None and end is not None:
+                window = (start, end)
+        return self.ingest(station_id, page, window)
+
+    # --- Reading --------------------------------------------------------------
+
+    def coverage(self, station_id):
+        return list(self._db().execute(
+            "SELECT start, end FROM coverage WHERE station_id = ? ORDER BY start", (station_id,)))
+
+    def covers(self, station_id, start, end):
+        return any(s <= start and end <= e for s, e in self.coverage(station_id))
+
+    def query(self, station_id, start, end, resolution, limit=DEFAULT_LIMIT, offset=0):
+        """(total, observations) for buckets starting in [start, end]."""
+        if resolution == "1m":
+            where = "FROM observations WHERE station_id = ? AND ts BETWEEN ? AND ?"
+            args = (station_id, math.ceil(start), int(end))
+            total = self._db().execute(f"SELECT count(*) {where}", args).fetchone()[0]
+            rows = self._db().execute(f"SELECT data {where} ORDER BY ts LIMIT ? OFFSET ?",
+                                      (*args, limit, offset))
+            return total, [json.loads(data) for (data,) in rows]
+        step = ROLLUPS[resolution]
+        where = f"FROM rollup_{resolution} WHERE station_id = ? AND bucket BETWEEN ? AND ?"
+        args = (station_id, math.ceil(start / step) * step, int(end))
+        total = self._db().execute(f"SELECT count(*) {where}", args).fetchone()[0]
+        cursor = self._db().execute(f"SELECT * {where} ORDER BY bucket LIMIT ? OFFSET ?",
+                                    (*args, limit, offset))
+        names = [d[0] for d in cursor.description]
+        return total, [self._observation(station_id, dict(zip(names, row))) for row in cursor]
+
+    def _observation(self, station_id, agg):
+        obs = {"timestamp": iso(agg["bucket"]), "station_id": station_id}
+        for field in MEAN_FIELDS:
+            n = agg[f"n_{field}"]
+            obs[field] = agg[field] / n if n else None
+        for field in SUM_FIELDS + MAX_FIELDS + MIN_FIELDS:
+            obs[field] = agg[field]
+        obs["wind_direction"] = (math.degrees(math.atan2(agg["dir_y"], agg["dir_x"])) % 360
+                                 if agg["n_wind_direction"] else None)
+        for field, value in obs.items():
+            if value is None:
+                continue
+            if field in INT_FIELDS:
+                obs[field] = int(value)
+            elif isinstance(value, float):
+                obs[field] = round(value, ROUND.get(field, 2))
+        return obs
+
+    def answer(self, path):
+        """Envelope for a /observations request the archive covers, or None.
+
+        At coarse resolutions coverage may stop inside the last bucket,
+        which then averages the minutes archived so far; 1m requests must be
+        covered to their end, so the newest minutes still go to tempestd.
+        """
+        station_id, params = observation_request(path)
+        if station_id is None or params.get("units", "metric") != "metric":
+            return None
+        resolution = params.get("resolution", "1m")
+        start, end = parse_time(params.get("start")), parse_time(params.get("end"))
+        if (resolution != "1m" and resolution not in ROLLUPS) or start is None or end is None:
+            return None
+        try:
+            limit = int(params.get("limit", DEFAULT_LIMIT))
+            offset = int(params.get("offset", 0))
+        except ValueError:
+            return None
+        end = min(end, time.time())
+        lag = ROLLUPS.get(resolution, 0)
+        if start > end or not self.covers(station_id, start, max(start, end - lag)):
+            return None
+        total, rows = self.query(station_id, start, end, resolution, limit, offset)
+        return {
+            "station_id": station_id,
+            "start": params["start"],
+            "end": params["end"],
+            "resolution": resolution,
+            "units": "metric",
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "observations": rows,
+        }
+
+    def stats(self):
+        db = self._db()
+        return {
+            "path": self.path,
+            "observations": db.execute("SELECT count(*) FROM observations").fetchone()[0],
+            "coverage": {
+                str(sid): [[iso(s), iso(e)] for s, e in self.coverage(sid)]
+                for (sid,) in db.execute("SELECT DISTINCT station_id FROM coverage")
+            },
+            "queued": self._queue.qsize(),
+        }
+
+
+def observation_request(path):
+    """(station id, flat query params) for an /observations path, else (None, {})."""
+    parts = urlsplit(path)
+    segments = parts.path.strip("/").split("/")
+    if (len(segments) != 5 or segments[:3] != ["api", "v1", "stations"]
+            or segments[4] != "observations" or not segments[3].isdigit()):
+        return None, {}
+    params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+    return int(segments[3]), params
+
+
+class ArchiveSync:
+    """Backfills history and keeps the newest minutes current.
+
+    fetch_json(path) performs a GET against tempestd and returns the decoded
+    body. The first pass walks back day by day, newest first, to `days` ago
+    (no further than /range says data exists); later passes, every `interval`
+    seconds, fetch only what arrived since the last one.
+    """
+
+    def __init__(self, archive, fetch_json, days, interval):
+        self.archive = archive
+        self.fetch_json = fetch_json
+        self.days = days
+        self.interval = interval
+
+    def _fetch_window(self, station_id, start, end):
+        offset = 0
+        while True:
+            query = urlencode({
+                "start": iso(start), "end": iso(end), "resolution": "1m", "units": "metric",
+                "limit": PAGE_ROWS, "offset": offset,
+            })
+            path = f"/api/v1/stations/{station_id}/observations?{query}"
+            data = self.fetch_json(path)
+            page = data.get("observations") or []
+            offset += len(page)
+            self.archive.ingest(station_id, page)
+            if not page or offset >= data.get("total", 0):
+                break
+        self.archive.ingest(station_id, [], (start, end))   # every page arrived
+
+    def _missing(self, station_id, start, end):
+        """Sub-windows of [start, end] not yet covered, newest first."""
+        gaps, cursor = [], start
+        for s, e in self.archive.coverage(station_id):
+            if s > cursor:
+                gaps.append((cursor, min(s, end)))
+            cursor = max(cursor, e)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return [g for g in reversed(gaps) if g[1] > g[0]]
+
+    def sync_once(self):
+        now = int(time.time()) // 60 * 60
+        for station in self.fetch_json("/api/v1/stations"):
+            station_id = station["station_id"]
+            oldest = now - self.days * 86400
+            try:
+                available = parse_time(self.fetch_json(f"/api/v1/stations/{station_id}/range").get("oldest"))
+            except (OSError, ValueError):
+                available = None
+            if available:
+                oldest = max(oldest, int(available))
+            for gap_start, gap_end in self._missing(station_id, oldest, now):
+                day_end = gap_end
+                while day_end > gap_start:
+                    day_start = max(gap_start, day_end - 86400)
+                    self._fetch_window(station_id, day_start, day_end)
+                    day_end = day_start
+
+    def start(self):
+        def run():
+            while True:
+                try:
+                    self.sync_once()
+                except (OSError, ValueError, KeyError, TypeError, sqlite3.Error):
+                    pass  # tempestd unreachable or busy; try again next round
+                time.sleep(self.interval)
+
+        threading.Thread(target=run, name="archive-sync", daemon=True).start()
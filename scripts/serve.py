@@ -5,30 +5,1156 @@ Usage:
     python3 scripts/serve.py                                          # tempestd at localhost:8080
     python3 scripts/serve.py --backend https://tempestd.example.com   # remote tempestd
     python3 scripts/serve.py --port 9000                              # different dashboard port
+    python3 scripts/serve.py --access-log access.jsonl --log-sample 0.1   # sampled JSON-lines log
+    python3 scripts/serve.py --backend http://a:8080 --backend http://b:8080 --hedge-after 200
+    python3 scripts/serve.py --processes 4 --cache-ttl 2                # pre-forked workers, shared cache
+    python3 scripts/vendor.py && python3 scripts/serve.py --vendor      # CDN scripts served locally
+    python3 scripts/serve.py --archive archive.db --archive-days 90     # long ranges answered locally
+
+Metrics are served at /metrics (Prometheus text format) and /_stats (JSON).
+GET /_summaries?station=ID&start=DATE&end=DATE returns a run of daily
+summaries in one response, for the dashboard's calendar view.
+GET /_export?station=ID&start=ISO&end=ISO&format=csv|ndjson streams a range of
+observations as a download, fetched from tempestd one page at a time.
+Dashboards opened with ?perf=beacon POST client timings to /_perf; GET /_perf
+shows the beacons this process received (one worker's share under --processes).
+
+With --processes N, the server pre-forks N workers that each listen on the
+port with SO_REUSEPORT. SIGHUP restarts the workers without dropping
+requests; the new ones fork from the running supervisor, so they keep its
+code and options (restart the server to pick up changes). SIGTERM or Ctrl-C
+drains them and exits.
 """
 
 import argparse
+import concurrent.futures
+import csv
+import email.utils
+import glob
+import hashlib
+import http.client
 import http.server
+import io
+import itertools
+import json
+import logging
+import logging.handlers
+import mmap
+import multiprocessing
 import os
-import urllib.request
-import urllib.error
+import queue
+import random
+import re
+import select
+import signal
+import socket
+import shutil
+import sqlite3
 import ssl
+import stat
+import struct
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+
+from archive import ROLLUPS, Archive, ArchiveSync, iso, parse_time
+from vendor import MANIFEST as VENDOR_MANIFEST, cdn_scripts, sri_matches
 
 # Serve files from the repo root (one level up from this script)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+UPSTREAM_TIMEOUT = 30  # seconds
+CHUNK_SIZE = 64 * 1024
+
+PERF_MAX_BODY = 64 * 1024   # bytes accepted per perf beacon
+PERF_MAX_CLIENTS = 500      # dashboards remembered by /_perf
+
+# JSON-lines access log; records are written by a background listener thread
+ACCESS_LOG = logging.getLogger("tempest.access")
+ACCESS_LOG.propagate = False
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 5
+
+# Static files: small ones live in memory, bigger ones go out with sendfile()
+STATIC_MEMORY_MAX = 256 * 1024
+STATIC_CACHE_BYTES = 16 * 1024 * 1024
+STATIC_PRELOAD = ("index.html", "manifest.json", "plugins.json", "sw.js", "js/*.js", "css/*.css", "icons/*")
+HASHED_NAME = re.compile(r"[.-][0-9a-f]{8,}\.\w+$")   # e.g. app.3f9a1c2e.js never changes
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Proxied GET responses shared by all workers (--cache-ttl)
+CACHE_BYTES = 32 * 1024 * 1024
+CACHE_SLOT_BYTES = 1024 * 1024    # largest cacheable response, headers included
+CACHE_LOCKS = 16
+
+# Local observation archive (--archive)
+ARCHIVE_SYNC_SECONDS = 60          # how often the newest minutes are pulled in
+ARCHIVE_MAX_BODY = 16 * 1024 * 1024   # largest proxied response copied for ingestion
+
+# Daily summaries (/summary and the /_summaries batch route)
+SUMMARY_FINAL_SECONDS = 2 * 86400   # after its UTC midnight a day is over in every time zone,
+                                    # with hours to spare for late uploads
+SUMMARY_ENTRIES = 20000             # past days kept, across stations and unit systems
+SUMMARY_MAX_DAYS = 731
+SUMMARY_FETCH_WORKERS = 8
+
+# Observation downloads (/_export)
+EXPORT_PAGE_ROWS = 1440           # observations per upstream request; one page is held at a time
+EXPORT_RESOLUTIONS = ("1m",) + tuple(ROLLUPS)
+EXPORT_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+DRAIN_SECONDS = 10.0   # how long a stopping worker waits for open connections
+
+# Replica selection; health checks only run with more than one --backend
+HEALTH_INTERVAL = 5.0         # seconds between active health checks
+HEALTH_TIMEOUT = 2.0
+MAX_OBSERVATION_AGE = 300.0   # replicas whose newest observation is older are stale
+EJECT_SECONDS = 5.0           # first passive ejection; doubles on each repeat
+EJECT_MAX_SECONDS = 60.0
+EJECT_AFTER_5XX = 3           # consecutive 5xx responses before a replica is ejected
+RETRY_STATUSES = (502, 503, 504)
+HEDGE_BUDGET = 0.1            # hedged requests allowed per request, after a burst of
+HEDGE_BURST = 10
+LATENCY_EWMA = 0.3            # weight of the newest sample in a replica's latency
+
+# Upper bounds (seconds) of the upstream latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def route_label(path):
+    """Low-cardinality route name for metrics: the API resource, or "static"."""
+    path = path.split("?", 1)[0]
+    if path in ("/metrics", "/_stats", "/_perf", "/_summaries", "/_export"):
+        return path.lstrip("/_")
+    if not path.startswith("/api/"):
+        return "static"
+    parts = path.strip("/").split("/")
+    if len(parts) >= 5 and parts[2] == "stations":
+        return parts[4]
+    if len(parts) == 4 and parts[2] == "stations":
+        return "station"
+    return parts[-1] if len(parts) > 2 else "api"
+
+
+class _Shard:
+    """Counters owned by one handler thread at a time, so updates need no lock."""
+
+    def __init__(self):
+        self.started = 0
+        self.finished = 0
+        self.bytes_sent = 0
+        self.bytes_upstream = 0
+        self.requests = {}   # (route, method, status) -> count
+        self.upstream = {}   # route -> [bucket counts..., +Inf count, sum]
+        self.errors = {}     # (route, kind) -> count
+        self.cache = {}      # (cache, hit) -> count
+
+
+class Metrics:
+    """Request, upstream, cache and error counters sharded across handler threads.
+
+    ThreadingHTTPServer runs each connection on its own thread. A thread checks
+    a shard out of an idle pool for the life of its connection and returns it
+    afterwards; deque append/pop are atomic, so the hot path takes no lock.
+    Readers sum every shard.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._idle = deque()
+        self._shards = []
+        self._lock = threading.Lock()  # only taken when the pool grows
+
+    def checkout(self):
+        try:
+            return self._idle.pop()
+        except IndexError:
+            shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def checkin(self, shard):
+        self._idle.append(shard)
+
+    def open_connections(self):
+        """Connections being served right now (shards checked out)."""
+        return len(self._shards) - len(self._idle)
+
+    def snapshot(self):
+        """Totals across all shards."""
+        with self._lock:
+            shards = list(self._shards)
+        total = {
+            "started": 0, "finished": 0, "bytes_sent": 0, "bytes_upstream": 0,
+            "requests": {}, "upstream": {}, "errors": {}, "cache": {},
+        }
+        for shard in shards:
+            for key in ("started", "finished", "bytes_sent", "bytes_upstream"):
+                total[key] += getattr(shard, key)
+            for name in ("requests", "errors", "cache"):
+                merged = total[name]
+                for key, count in list(getattr(shard, name).items()):
+                    merged[key] = merged.get(key, 0) + count
+            for route, hist in list(shard.upstream.items()):
+                merged = total["upstream"].setdefault(route, [0] * len(hist))
+                for i, value in enumerate(list(hist)):
+                    merged[i] += value
+        return total
+
+    def prometheus(self, extra=()):
+        """Prometheus text exposition format.
+
+        extra is a sequence of (name, kind, help, samples) families to append.
+        Counters live in this process only, so every series carries a worker
+        label; under --processes, sum by the other labels for server totals.
+        """
+        snap = self.snapshot()
+        worker = f'worker="{os.getpid()}"'
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join([worker] + [f'{k}="{v}"' for k, v in labels])
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        metric("tempest_proxy_requests_total", "counter", "Requests handled by route, method and status.",
+               [((("route", r), ("method", m), ("status", s)), n)
+                for (r, m, s), n in sorted(snap["requests"].items())])
+        metric("tempest_proxy_in_flight_requests", "gauge", "Requests currently being handled.",
+               [((), snap["started"] - snap["finished"])])
+        metric("tempest_proxy_response_bytes_total", "counter", "Bytes written to clients.",
+               [((), snap["bytes_sent"])])
+        metric("tempest_proxy_upstream_bytes_total", "counter", "Response bytes read from tempestd.",
+               [((), snap["bytes_upstream"])])
+
+        lines.append("# HELP tempest_proxy_upstream_latency_seconds Time to upstream response headers.")
+        lines.append("# TYPE tempest_proxy_upstream_latency_seconds histogram")
+        for route, hist in sorted(snap["upstream"].items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), hist):
+                cumulative += count
+                lines.append(f'tempest_proxy_upstream_latency_seconds_bucket{{{worker},route="{route}",le="{bound}"}} {cumulative}')
+            lines.append(f'tempest_proxy_upstream_latency_seconds_sum{{{worker},route="{route}"}} {hist[-1]:.6f}')
+            lines.append(f'tempest_proxy_upstream_latency_seconds_count{{{worker},route="{route}"}} {cumulative}')
+
+        metric("tempest_proxy_errors_total", "counter", "Upstream failures and client aborts by route and kind.",
+               [((("route", r), ("kind", k)), n) for (r, k), n in sorted(snap["errors"].items())])
+        metric("tempest_proxy_cache_requests_total", "counter", "Cache lookups by cache and result.",
+               [((("cache", c), ("result", "hit" if hit else "miss")), n)
+                for (c, hit), n in sorted(snap["cache"].items())])
+        metric("tempest_proxy_start_time_seconds", "gauge", "Unix time the server started.",
+               [((), round(self.started_at, 3))])
+        for family in extra:
+            metric(*family)
+        return "\n".join(lines) + "\n"
+
+    def stats(self):
+        """JSON-friendly summary with derived ratios and latency percentiles."""
+        snap = self.snapshot()
+        requests = {}
+        for (route, method, status), count in snap["requests"].items():
+            entry = requests.setdefault(route, {"count": 0, "by_status": {}})
+            entry["count"] += count
+            entry["by_status"][status] = entry["by_status"].get(status, 0) + count
+        upstream = {}
+        for route, hist in snap["upstream"].items():
+            count = sum(hist[:-1])
+            upstream[route] = {
+                "count": count,
+                "mean_ms": round(hist[-1] / count * 1000, 2) if count else 0.0,
+                "p50_ms": _bucket_percentile(hist, 0.50),
+                "p95_ms": _bucket_percentile(hist, 0.95),
+                "p99_ms": _bucket_percentile(hist, 0.99),
+            }
+        caches = {}
+        for (name, hit), count in snap["cache"].items():
+            entry = caches.setdefault(name, {"hits": 0, "misses": 0})
+            entry["hits" if hit else "misses"] += count
+        for entry in caches.values():
+            lookups = entry["hits"] + entry["misses"]
+            entry["hit_ratio"] = round(entry["hits"] / lookups, 4) if lookups else 0.0
+        errors = {}
+        for (route, kind), count in snap["errors"].items():
+            errors.setdefault(route, {})[kind] = count
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "in_flight": snap["started"] - snap["finished"],
+            "bytes": {"sent": snap["bytes_sent"], "upstream": snap["bytes_upstream"]},
+            "requests": requests,
+            "upstream_latency": upstream,
+            "cache": caches,
+            "errors": errors,
+        }
+
+
+def _bucket_percentile(hist, q):
+    """Upper bound (ms) of the histogram bucket holding quantile q; None past the last bound."""
+    counts = hist[:-1]
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS, counts):
+        seen += count
+        if seen >= rank:
+            return bound * 1000
+    return None
+
+
+METRICS = Metrics()
+
+
+class ClientPerf:
+    """Latest js/perf.js beacon from each dashboard that reached this process.
+
+    Under --processes each worker keeps its own set, so GET /_perf shows the
+    dashboards whose beacons that worker happened to receive.
+    """
+
+    SPAN_FIELDS = ("count", "last", "mean", "p50", "p95", "max")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reports = OrderedDict()  # client id -> report, oldest first
+
+    def add(self, report):
+        """Store a beacon. Raises ValueError if it is not shaped like one."""
+        if not isinstance(report, dict) or not isinstance(report.get("client"), str):
+            raise ValueError("beacon needs a client id")
+        spans = report.get("spans")
+        if not isinstance(spans, dict):
+            raise ValueError("beacon needs spans")
+        clean = {}
+        for name, span in spans.items():
+            if not isinstance(span, dict):
+                raise ValueError(f"span {name!r} must be an object")
+            clean[str(name)[:64]] = {
+                key: float(span.get(key) or 0) for key in self.SPAN_FIELDS
+            }
+        long_tasks = report.get("longTasks") or {}
+        entry = {
+            "client": report["client"][:64],
+            "received": time.time(),
+            "spans": clean,
+            "long_tasks": {
+                "count": int(long_tasks.get("count") or 0),
+                "total_ms": float(long_tasks.get("totalMs") or 0),
+            },
+        }
+        with self._lock:
+            self._reports.pop(entry["client"], None)
+            self._reports[entry["client"]] = entry
+            while len(self._reports) > PERF_MAX_CLIENTS:
+                self._reports.popitem(last=False)
+
+    def reports(self):
+        with self._lock:
+            return list(self._reports.values())
+
+    def summary(self):
+        """Per span: clients reporting, median client p50 and worst client p95 (ms)."""
+        reports = self.reports()
+        by_span = {}
+        for report in reports:
+            for name, span in report["spans"].items():
+                by_span.setdefault(name, []).append(span)
+        spans = {}
+        for name, entries in sorted(by_span.items()):
+            p50s = sorted(e["p50"] for e in entries)
+            spans[name] = {
+                "clients": len(entries),
+                "calls": int(sum(e["count"] for e in entries)),
+                "p50_ms": round(p50s[len(p50s) // 2], 2),
+                "worst_p95_ms": round(max(e["p95"] for e in entries), 2),
+            }
+        return {
+            "clients": len(reports),
+            "long_tasks": sum(r["long_tasks"]["count"] for r in reports),
+            "spans": spans,
+        }
+
+
+CLIENT_PERF = ClientPerf()
+
+
+class _Asset:
+    __slots__ = ("mtime_ns", "size", "etag", "last_modified", "body")
+
+    def __init__(self, st, body, transformed=False):
+        self.mtime_ns = st.st_mtime_ns
+        self.size = len(body) if transformed else st.st_size
+        self.etag = f'"{self.size:x}-{st.st_mtime_ns:x}"'
+        self.last_modified = email.utils.formatdate(st.st_mtime, usegmt=True)
+        self.body = body   # None when the file is served from disk
+
+
+class StaticFiles:
+    """Static assets held in memory and revalidated against each file's mtime.
+
+    Every request still stat()s the file, so an edit shows up on the next
+    reload, but unchanged small files are never reopened or copied again.
+    Files over STATIC_MEMORY_MAX, or past the STATIC_CACHE_BYTES budget, keep
+    only their metadata and are sent from disk. A file with a transform is
+    always kept in memory, as the transform's output.
+    """
+
+    def __init__(self, root, memory_max=STATIC_MEMORY_MAX, budget=STATIC_CACHE_BYTES):
+        self.root = root
+        self.memory_max = memory_max
+        self.budget = budget
+        self._assets = {}   # absolute path -> _Asset
+        self.transforms = {}   # absolute path -> function(bytes) -> bytes
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    def preload(self, patterns=STATIC_PRELOAD):
+        """Load the dashboard's own assets up front; returns how many were found."""
+        count = 0
+        for pattern in patterns:
+            for path in glob.glob(os.path.join(self.root, pattern)):
+                count += self.lookup(path) is not None
+        return count
+
+    def lookup(self, path):
+        """(asset, cached) for a regular file, or None. cached is False when
+        the file was (re)loaded for this request."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        asset = self._assets.get(path)
+        transform = self.transforms.get(path)
+        if asset and asset.mtime_ns == st.st_mtime_ns and (transform or asset.size == st.st_size):
+            return asset, True
+        body = None
+        if transform or (st.st_size <= self.memory_max
+                         and self._cached_bytes + st.st_size <= self.budget):
+            try:
+                with open(path, "rb") as f:
+                    st = os.fstat(f.fileno())   # describe exactly what was read
+                    body = f.read()
+            except OSError:
+                return None
+            if transform:
+                body = transform(body)
+        asset = _Asset(st, body, transformed=transform is not None)
+        with self._lock:
+            old = self._assets.get(path)
+            if old and old.body is not None:
+                self._cached_bytes -= old.size
+            if body is not None:
+                self._cached_bytes += asset.size
+            self._assets[path] = asset
+        return asset, False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "files": len(self._assets),
+                "in_memory": sum(1 for a in self._assets.values() if a.body is not None),
+                "bytes": self._cached_bytes,
+            }
+
+
+class VendorBundle:
+    """Local copies of index.html's CDN scripts, as written by scripts/vendor.py.
+
+    Every CDN script must have a local copy that still matches the integrity
+    hash in index.html; otherwise loading fails with ValueError. rewrite()
+    points the page at the copies (keeping integrity and crossorigin) and
+    defers them, so they no longer hold up parsing.
+    """
+
+    URL_PREFIX = "/vendor/"
+
+    def __init__(self, directory, html):
+        self.directory = directory
+        try:
+            with open(os.path.join(directory, VENDOR_MANIFEST), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except OSError as e:
+            raise ValueError(f"no vendor manifest in {directory} ({e.strerror})") from None
+        self.urls = {}    # CDN URL -> local URL
+        self.files = {}   # local file name -> path
+        for url, integrity in cdn_scripts(html):
+            entry = manifest.get(url)
+            if not entry or entry.get("integrity") != integrity:
+                raise ValueError(f"{url} is not vendored at its current version")
+            name = os.path.basename(entry["file"])
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                raise ValueError(f"cannot read {path} ({e.strerror})") from None
+            if not sri_matches(data, integrity):
+                raise ValueError(f"{path} does not match the integrity hash for {url}")
+            self.urls[url] = self.URL_PREFIX + name
+            self.files[name] = path
+
+    def rewrite(self, html):
+        """index.html bytes with CDN script tags pointed at the local copies."""
+        text = html.decode("utf-8")
+        for url, local in self.urls.items():
+            text = re.sub(r'<script src="%s"' % re.escape(url), f'<script defer src="{local}"', text)
+        return text.encode("utf-8")
+
+    def path_for(self, url_path):
+        """File path for a /vendor/ URL path, or None."""
+        return self.files.get(url_path[len(self.URL_PREFIX):])
+
+
+class SharedResponseCache:
+    """Short-lived copies of proxied GET responses in an anonymous shared mmap.
+
+    The map is created before workers fork, so every worker reads and fills
+    the same slots. A key hashes to one fixed-size slot and a newer entry
+    simply replaces whatever was there; a striped set of process-shared locks
+    keeps readers from seeing half-written slots.
+    """
+
+    SLOT = struct.Struct("<16sdHII")   # key digest, expiry (unix time), status, header and body lengths
+
+    def __init__(self, ttl, size=CACHE_BYTES, slot_size=CACHE_SLOT_BYTES):
+        self.ttl = ttl
+        self.slot_size = slot_size
+        self.slots = max(1, size // slot_size)
+        self._map = mmap.mmap(-1, self.slots * slot_size)
+        self._locks = [multiprocessing.Lock() for _ in range(CACHE_LOCKS)]
+
+    def _locate(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        index = int.from_bytes(digest[:8], "little") % self.slots
+        return digest, index * self.slot_size, self._locks[index % CACHE_LOCKS]
+
+    def get(self, key):
+        """(status, headers, body) for a live entry, or None."""
+        digest, offset, lock = self._locate(key)
+        start = offset + self.SLOT.size
+        with lock:
+            stored, expires, status, head_len, body_len = self.SLOT.unpack_from(self._map, offset)
+            if stored != digest or expires < time.time():
+                return None
+            head = self._map[start:start + head_len]
+            body = self._map[start + head_len:start + head_len + body_len]
+        return status, json.loads(head), body
+
+    def put(self, key, status, headers, body):
+        """Store a response; False if it is too big for a slot."""
+        head = json.dumps(headers).encode()
+        if self.SLOT.size + len(head) + len(body) > self.slot_size:
+            return False
+        digest, offset, lock = self._locate(key)
+        start = offset + self.SLOT.size
+        with lock:
+            self._map[start:start + len(head)] = head
+            self._map[start + len(head):start + len(head) + len(body)] = body
+            self.SLOT.pack_into(self._map, offset, digest, time.time() + self.ttl,
+                                status, len(head), len(body))
+        return True
+
+
+def _cacheable(resp):
+    if resp.status != 200 or resp.getheader("Set-Cookie"):
+        return False
+    cache_control = (resp.getheader("Cache-Control") or "").lower()
+    return "no-store" not in cache_control and "private" not in cache_control
+
+
+class DailySummaries:
+    """/summary responses for days that are over, kept for the life of the process.
+
+    A finished day's summary never changes, so each is fetched from tempestd
+    once; only recent days are asked for again. fetch_json(path) performs a
+    GET against tempestd and returns the decoded body.
+    """
+
+    def __init__(self, fetch_json, max_entries=SUMMARY_ENTRIES):
+        self.fetch_json = fetch_json
+        self.max_entries = max_entries
+        self._days = OrderedDict()   # (station id, date, units) -> summary
+        self._lock = threading.Lock()
+        self.fetched = 0
+
+    @staticmethod
+    def is_final(date, now=None):
+        day = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return day.timestamp() + SUMMARY_FINAL_SECONDS <= (now or time.time())
+
+    def get(self, station_id, date, units="metric"):
+        """The summary for one day, from memory when the day is final."""
+        key = (station_id, date, units)
+        with self._lock:
+            if key in self._days:
+                self._days.move_to_end(key)
+                return self._days[key]
+        query = urllib.parse.urlencode({"date": date, "units": units})
+        summary = self.fetch_json(f"/api/v1/stations/{station_id}/summary?{query}")
+        with self._lock:
+            self.fetched += 1
+        if self.is_final(date):
+            with self._lock:
+                self._days[key] = summary
+                while len(self._days) > self.max_entries:
+                    self._days.popitem(last=False)
+        return summary
+
+    def cached(self, station_id, date, units="metric"):
+        with self._lock:
+            return self._days.get((station_id, date, units))
+
+    def batch(self, station_id, dates, units="metric"):
+        """(summaries, dates that failed) for a run of days, missing ones fetched concurrently."""
+        with concurrent.futures.ThreadPoolExecutor(SUMMARY_FETCH_WORKERS) as pool:
+            futures = [pool.submit(self.get, station_id, date, units) for date in dates]
+        summaries, failed = [], []
+        for date, future in zip(dates, futures):
+            try:
+                summaries.append(future.result())
+            except (OSError, ValueError):
+                failed.append(date)
+        return summaries, failed
+
+    def stats(self):
+        with self._lock:
+            return {"days": len(self._days), "fetched": self.fetched}
+
+
+class Backend:
+    """One tempestd replica and what the proxy has learned about it."""
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+        parts = urllib.parse.urlsplit(self.url)
+        self.scheme, self.netloc, self.path = parts.scheme, parts.netloc, parts.path
+        self.healthy = True          # assumed until the first health check says otherwise
+        self.stale = False
+        self.observation_age = None
+        self.ejected_until = 0.0
+        self.ejections = 0           # consecutive; sets the next ejection's length
+        self.failures = 0            # consecutive failed requests
+        self.latency = None          # EWMA of time to response headers, seconds
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0              # hedged requests sent to this replica
+        self.hedges_won = 0
+
+    def connection(self):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.netloc, timeout=UPSTREAM_TIMEOUT, context=ssl.create_default_context()
+            )
+        return http.client.HTTPConnection(self.netloc, timeout=UPSTREAM_TIMEOUT)
+
+    def state(self, now):
+        if now < self.ejected_until:
+            return "ejected"
+        if not self.healthy:
+            return "unhealthy"
+        return "stale" if self.stale else "up"
+
+
+class BackendPool:
+    """Chooses a tempestd replica for each request.
+
+    Replicas that are up come first, then stale ones, then ones failing their
+    health check, then the ejected replica due back soonest, so a request is
+    only refused when every replica has actually been tried. Connection errors
+    eject a replica at once and EJECT_AFTER_5XX server errors in a row do too;
+    ejections double in length while they repeat and a passing health check
+    ends one early.
+    """
+
+    STRATEGIES = ("round-robin", "least-latency")
+
+    def __init__(self, urls, strategy="round-robin", hedge_after=0.0,
+                 max_age=MAX_OBSERVATION_AGE):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"strategy must be one of {', '.join(self.STRATEGIES)}")
+        self.backends = [Backend(url) for url in urls]
+        self.strategy = strategy
+        self.hedge_after = hedge_after  # seconds; 0 disables hedging
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._next = 0
+        self._requests = 0
+        self._hedged = 0
+
+    def __len__(self):
+        return len(self.backends)
+
+    def choose(self, exclude=(), hedge=False):
+        """Best replica not in exclude, or None once every replica has been tried."""
+        now = time.monotonic()
+        with self._lock:
+            remaining = [b for b in self.backends if b not in exclude]
+            if not remaining:
+                return None
+            for wanted in (("up",), ("up", "stale"), ("up", "stale", "unhealthy")):
+                candidates = [b for b in remaining if b.state(now) in wanted]
+                if candidates:
+                    break
+            else:
+                candidates = [min(remaining, key=lambda b: b.ejected_until)]
+            if self.strategy == "least-latency":
+                # Unmeasured replicas count as instant, so each gets tried
+                backend = min(candidates, key=lambda b: (b.latency or 0.0) * (b.in_flight + 1))
+            else:
+                backend = candidates[self._next % len(candidates)]
+                self._next += 1
+            backend.in_flight += 1
+            backend.requests += 1
+            if hedge:
+                backend.hedges += 1
+            elif not exclude:
+                self._requests += 1
+            return backend
+
+    def allow_hedge(self):
+        """Take a hedge from the budget, so hedging cannot double the load."""
+        with self._lock:
+            if self._hedged < HEDGE_BURST + HEDGE_BUDGET * self._requests:
+                self._hedged += 1
+                return True
+            return False
+
+    def done(self, backend, latency=None, status=None, error=None, hedge_won=False):
+        """Record how a request chosen by choose() ended.
+
+        Pass error for a connection failure, status for a response, plus
+        latency (seconds to headers) when it arrived; nothing for a request
+        that was abandoned, such as the slower half of a hedge.
+        """
+        with self._lock:
+            backend.in_flight -= 1
+            failed = error is not None or (status or 0) >= 500
+            if failed:
+                backend.errors += 1
+                backend.failures += 1
+                if error is not None or backend.failures >= EJECT_AFTER_5XX:
+                    self._eject(backend)
+            elif status is not None:
+                backend.failures = 0
+                backend.ejections = 0
+            if latency is not None:
+                backend.latency = (latency if backend.latency is None
+                                   else LATENCY_EWMA * latency + (1 - LATENCY_EWMA) * backend.latency)
+            if hedge_won:
+                backend.hedges_won += 1
+
+    def _eject(self, backend):
+        seconds = min(EJECT_MAX_SECONDS, EJECT_SECONDS * 2 ** backend.ejections)
+        backend.ejected_until = time.monotonic() + seconds
+        backend.ejections += 1
+        backend.failures = 0
+
+    def check(self, backend):
+        """Active health check against /api/v1/health."""
+        conn = backend.connection()
+        conn.timeout = HEALTH_TIMEOUT
+        try:
+            conn.request("GET", backend.path + "/api/v1/health")
+            resp = conn.getresponse()
+            data = json.loads(resp.read()) if resp.status == 200 else None
+        except (OSError, http.client.HTTPException, ValueError):
+            data = None
+        finally:
+            conn.close()
+        ages = []
+        if isinstance(data, dict):
+            for station in data.get("stations") or ():
+                age = station.get("observation_age_seconds") if isinstance(station, dict) else None
+                if isinstance(age, (int, float)):
+                    ages.append(age)
+        with self._lock:
+            backend.healthy = isinstance(data, dict)
+            backend.observation_age = min(ages) if ages else None
+            backend.stale = bool(ages) and min(ages) > self.max_age
+            if backend.healthy:
+                backend.ejected_until = 0.0
+                backend.ejections = 0
+                backend.failures = 0
+
+    def start_health_checks(self, interval=HEALTH_INTERVAL):
+        def run():
+            while True:
+                for backend in self.backends:
+                    self.check(backend)
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="health-checks", daemon=True).start()
+
+    def status(self):
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "url": b.url,
+                "state": b.state(now),
+                "observation_age_seconds": b.observation_age,
+                "ejected_for_seconds": round(max(0.0, b.ejected_until - now), 1),
+                "latency_ms": round(b.latency * 1000, 2) if b.latency is not None else None,
+                "in_flight": b.in_flight,
+                "requests": b.requests,
+                "errors": b.errors,
+                "hedges": b.hedges,
+                "hedges_won": b.hedges_won,
+            } for b in self.backends]
+
+    def metric_families(self):
+        """Per-replica families for Metrics.prometheus()."""
+        status = self.status()
+        return [
+            ("tempest_proxy_backend_up", "gauge", "1 if the replica is up, 0 if stale, unhealthy or ejected.",
+             [((("backend", b["url"]),), int(b["state"] == "up")) for b in status]),
+            ("tempest_proxy_backend_requests_total", "counter", "Requests sent to each replica, including hedges.",
+             [((("backend", b["url"]),), b["requests"]) for b in status]),
+            ("tempest_proxy_backend_errors_total", "counter", "Connection failures and 5xx responses per replica.",
+             [((("backend", b["url"]),), b["errors"]) for b in status]),
+            ("tempest_proxy_hedges_total", "counter", "Hedged requests per replica, and how many answered first.",
+             [((("backend", b["url"]), ("result", result)), b[key])
+              for b in status for result, key in (("sent", "hedges"), ("won", "hedges_won"))]),
+        ]
+
+
+class _Attempt:
+    """One upstream request to one replica."""
+
+    def __init__(self, pool, backend, hedge=False):
+        self.pool = pool
+        self.backend = backend
+        self.hedge = hedge
+        self.conn = backend.connection()
+        self.started = time.perf_counter()
+        self.connected = None
+        self.reported = False
+
+    def send(self, method, path, headers):
+        self.conn.connect()
+        self.connected = time.perf_counter()
+        self.conn.request(method, self.backend.path + path, headers=headers)
+
+    def report(self, **outcome):
+        """Pass the outcome to BackendPool.done(); only the first report counts."""
+        if not self.reported:
+            self.reported = True
+            self.pool.done(self.backend, **outcome)
+
+
+class _CountingWriter:
+    """Wraps the client socket writer to count bytes sent."""
+
+    def __init__(self, raw, shard):
+        self._raw = raw
+        self._shard = shard
+
+    def write(self, data):
+        self._shard.bytes_sent += len(data)
+        return self._raw.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+def setup_access_log(target="-", max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS, rotate=True):
+    """Send access log records through a queue to a writer thread.
+
+    target is a file path (rotated at max_bytes), "-" for stdout or "off".
+    With rotate=False, as when several workers share one file, the file is
+    appended to and reopened if something else rotates it.
+    Returns the started QueueListener, or None when logging is off.
+    """
+    if target == "off":
+        ACCESS_LOG.disabled = True
+        return None
+    if target == "-":
+        handler = logging.StreamHandler(sys.stdout)
+    elif rotate:
+        handler = logging.handlers.RotatingFileHandler(
+            target, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+    else:
+        handler = logging.handlers.WatchedFileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    records = queue.SimpleQueue()
+    ACCESS_LOG.handlers[:] = [logging.handlers.QueueHandler(records)]
+    ACCESS_LOG.setLevel(logging.INFO)
+    ACCESS_LOG.disabled = False
+    listener = logging.handlers.QueueListener(records, handler)
+    listener.start()
+    return listener
+
 
 class ProxyHandler(http.server.SimpleHTTPRequestHandler):
-    backend = "http://localhost:8080"
+    backends = BackendPool(["http://localhost:8080"])
+    cache = None  # SharedResponseCache when --cache-ttl is set
+    static = StaticFiles(ROOT_DIR)
+    vendor = None  # VendorBundle with --vendor
+    archive = None  # archive.Archive with --archive
+    summaries = None  # DailySummaries
+    log_sample = 1.0  # fraction of successful requests written to the access log
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=ROOT_DIR, **kwargs)
 
+    def setup(self):
+        super().setup()
+        self.shard = METRICS.checkout()
+        self.wfile = _CountingWriter(self.wfile, self.shard)
+        self._started = None
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            METRICS.checkin(self.shard)
+
+    def parse_request(self):
+        ok = super().parse_request()
+        if ok:
+            self._started = time.perf_counter()
+            self._status = None
+            self._error = None
+            self._timing = None
+            self._upstream = None
+            self._counted = False
+            self._bytes_before = self.shard.bytes_sent
+            self.shard.started += 1
+        return ok
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        finally:
+            if self._started is not None:
+                self._record_request()
+
+    def _record_request(self):
+        self.shard.finished += 1
+        duration = time.perf_counter() - self._started
+        self._started = None
+        if not self._counted:
+            self._count_response()   # no response was sent
+        self._log_access(route_label(self.path), duration)
+
+    def _count_response(self):
+        """Count the route, status and cache outcome; once per request."""
+        shard = self.shard
+        self._counted = True
+        route = route_label(self.path)
+        key = (route, self.command, str(self._status or 0))
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        if route == "static" and self.command == "GET" and self._status in (200, 304):
+            # Browser revalidation: a 304 means the client's copy was still good
+            hit = ("browser", self._status == 304)
+            shard.cache[hit] = shard.cache.get(hit, 0) + 1
+
+    def _log_access(self, route, duration):
+        """Queue one JSON line; failures are always kept, successes are sampled."""
+        if not ACCESS_LOG.handlers or ACCESS_LOG.disabled:
+            return
+        status = self._status or 0
+        if status < 500 and not self._error and random.random() >= self.log_sample:
+            return
+        entry = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "client": self.client_address[0],
+            "method": self.command,
+            "path": self.path,
+            "route": route,
+            "status": status,
+            "bytes": self.shard.bytes_sent - self._bytes_before,
+            "duration_ms": round(duration * 1000, 2),
+        }
+        if self._timing:
+            entry["upstream"] = self._timing
+        if self._upstream:
+            entry.update(self._upstream)
+        if self._error:
+            entry["error"] = self._error
+        ACCESS_LOG.info(json.dumps(entry))
+
+    def _record_error(self, kind):
+        self._error = kind
+        key = (route_label(self.path), kind)
+        self.shard.errors[key] = self.shard.errors.get(key, 0) + 1
+
+    def _record_upstream(self, seconds):
+        hist = self.shard.upstream.get(route_label(self.path))
+        if hist is None:
+            hist = self.shard.upstream[route_label(self.path)] = [0] * (len(LATENCY_BUCKETS) + 2)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+                break
+        else:
+            hist[len(LATENCY_BUCKETS)] += 1
+        hist[-1] += seconds
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def end_headers(self):
+        # Count before the headers are flushed, so once a client has this
+        # response its next /_stats or /metrics request already includes it
+        if self._started is not None and self._status is not None and not self._counted:
+            self._count_response()
+        super().end_headers()
+
     def do_GET(self):
+        path = self.path.split("?", 1)[0]
         if self.path.startswith("/api/"):
             self._proxy()
+        elif path == "/metrics":
+            self._send_text(METRICS.prometheus(self.backends.metric_families()),
+                            "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/_stats":
+            stats = METRICS.stats()
+            stats["client_perf"] = CLIENT_PERF.summary()
+            stats["backends"] = self.backends.status()
+            stats["worker"] = os.getpid()
+            stats["static"] = self.static.stats()
+            if self.archive:
+                stats["archive"] = self.archive.stats()
+            if self.summaries:
+                stats["summaries"] = self.summaries.stats()
+            self._send_text(json.dumps(stats, indent=2), "application/json")
+        elif path == "/_summaries":
+            self._send_summaries()
+        elif path == "/_export":
+            self._send_export()
+        elif path == "/_perf":
+            body = {"summary": CLIENT_PERF.summary(), "clients": CLIENT_PERF.reports(),
+                    "worker": os.getpid()}
+            self._send_text(json.dumps(body, indent=2), "application/json")
         else:
-            super().do_GET()
+            self._serve_static()
+
+    def do_HEAD(self):
+        if self.path.startswith("/api/"):
+            super().do_HEAD()
+        else:
+            self._serve_static(head=True)
+
+    def _serve_static(self, head=False):
+        """Serve a file from StaticFiles; directories and misses fall back to
+        SimpleHTTPRequestHandler (redirects, listings, 404s)."""
+        fallback = super().do_HEAD if head else super().do_GET
+        url_path = self.path.split("?", 1)[0]
+        if self.vendor and url_path.startswith(VendorBundle.URL_PREFIX):
+            path = self.vendor.path_for(url_path)
+            if path is None:
+                return self.send_error(404, "File not found")
+        else:
+            path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not url_path.endswith("/"):
+                return fallback()
+            path = os.path.join(path, "index.html")
+        found = self.static.lookup(path)
+        if found is None:
+            return fallback()
+        asset, cached = found
+        hit = ("static", cached)
+        self.shard.cache[hit] = self.shard.cache.get(hit, 0) + 1
+        cache_control = IMMUTABLE if HASHED_NAME.search(path) else "no-cache"
+        if self._not_modified(asset):
+            self.send_response(304)
+            self.send_header("ETag", asset.etag)
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(asset.size))
+        self.send_header("Last-Modified", asset.last_modified)
+        self.send_header("ETag", asset.etag)
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        if head:
+            return
+        if asset.body is not None:
+            self.wfile.write(asset.body)
+        else:
+            self._sendfile(path, asset.size)
+
+    def _not_modified(self, asset):
+        """Conditional GET: If-None-Match wins over If-Modified-Since, as in RFC 9110."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or asset.etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if not if_modified_since:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return asset.mtime_ns // 1_000_000_000 <= since.timestamp()
+
+    def _sendfile(self, path, size):
+        """Send a file straight from the page cache to the socket."""
+        with open(path, "rb") as f:
+            if not hasattr(os, "sendfile"):
+                shutil.copyfileobj(f, self.wfile)
+                return
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(self.connection.fileno(), f.fileno(), offset, size - offset)
+                if not sent:
+                    self.close_connection = True  # the file shrank under us
+                    break
+                offset += sent
+            self.shard.bytes_sent += offset
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] == "/_perf":
+            self._receive_perf()
+        else:
+            self.send_error(501, f"Unsupported method ({self.command!r})")
+
+    def _receive_perf(self):
+        """Accept a perf beacon from js/perf.js."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > PERF_MAX_BODY:
+            self.close_connection = True
+            self.send_error(413, "Beacon too large")
+            return
+        try:
+            CLIENT_PERF.add(json.loads(self.rfile.read(length) or b"null"))
+        except (ValueError, TypeError, AttributeError) as e:
+            self.send_error(400, f"Invalid beacon: {e}")
+            return
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_text(self, text, content_type, headers=(), cache_control="no-store"):
+        body = text.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        for key, val in headers:
+            self.send_header(key, val)
+        self.end_headers()
+        self.wfile.write(body)
 
     def do_OPTIONS(self):
         if self.path.startswith("/api/"):
@@ -37,52 +1163,628 @@ class ProxyHandler(http.server.SimpleHTTPRequestHandler):
             super().do_GET()
 
     def _proxy(self):
-        url = self.backend.rstrip("/") + self.path
-        try:
-            req = urllib.request.Request(url, method=self.command)
-            for key, val in self.headers.items():
-                if key.lower() not in ("host", "connection"):
-                    req.add_header(key, val)
-            ctx = ssl.create_default_context()
-            resp = urllib.request.urlopen(req, context=ctx, timeout=30)
+        cache_key = None
+        if self.cache and self.command == "GET" and "Authorization" not in self.headers:
+            # Keyed on encoding too, so a gzipped body only goes to clients that asked for one
+            cache_key = f"{self.path}\n{self.headers.get('Accept-Encoding', '')}"
+            cached = self.cache.get(cache_key)
+            hit = ("api", cached is not None)
+            self.shard.cache[hit] = self.shard.cache.get(hit, 0) + 1
+            if cached:
+                self._send_cached(*cached)
+                return
+        archiving = False
+        if self.archive and self.command == "GET" and route_label(self.path) == "observations":
+            try:
+                answer = self.archive.answer(self.path)
+            except sqlite3.Error:
+                answer = None  # locked or damaged; tempestd can still answer
+            hit = ("archive", answer is not None)
+            self.shard.cache[hit] = self.shard.cache.get(hit, 0) + 1
+            if answer is not None:
+                self._upstream = {"archive": "hit"}
+                self._send_text(json.dumps(answer), "application/json", [("X-Archive", "HIT")])
+                return
+            archiving = self.archive.wants(self.path)
+        if self.summaries and self.command == "GET" and route_label(self.path) == "summary":
+            if self._send_final_summary():
+                return
+        headers = {
+            key: val for key, val in self.headers.items()
+            if key.lower() not in ("host", "connection")
+        }
+        attempts = []   # every request sent upstream for this one, in order
+        pending = []    # those still waiting for response headers
+        headers_sent = False
+        timing = self._timing = {}
+        try:
+            pending.append(self._start_attempt(attempts, headers))
+            while True:
+                attempt = self._await_upstream(pending, attempts, headers)
+                if attempt is None:
+                    self._record_error("client_abort")
+                    return  # client went away; closing conns drops the upstream requests
+                pending.remove(attempt)
+                try:
+                    resp = attempt.conn.getresponse()
+                except (OSError, http.client.HTTPException) as e:
+                    attempt.report(error=e)
+                    if not pending:
+                        if len(attempts) == len(self.backends):
+                            raise
+                        pending.append(self._start_attempt(attempts, headers))
+                    continue
+                if resp.status in RETRY_STATUSES and not pending and len(attempts) < len(self.backends):
+                    try:
+                        pending.append(self._start_attempt(attempts, headers))
+                    except (OSError, http.client.HTTPException):
+                        pass  # nothing else reachable; pass this response on
+                    else:
+                        attempt.report(status=resp.status)
+                        continue
+                break
+            first_byte = time.perf_counter()
+            attempt.report(latency=first_byte - attempt.started, status=resp.status,
+                           hedge_won=attempt.hedge)
+            timing["connect_ms"] = round((attempt.connected - attempt.started) * 1000, 2)
+            timing["ttfb_ms"] = round((first_byte - attempt.connected) * 1000, 2)
+            self._upstream = {"backend": attempt.backend.url, "attempts": len(attempts)}
+            if attempt.hedge:
+                self._upstream["hedged"] = True
+            self._record_upstream(first_byte - attempts[0].started)
             self.send_response(resp.status)
-            for key, val in resp.getheaders():
-                if key.lower() not in ("transfer-encoding", "connection"):
-                    self.send_header(key, val)
+            resp_headers = [
+                (key, val) for key, val in resp.getheaders()
+                if key.lower() not in ("transfer-encoding", "connection")
+            ]
+            for key, val in resp_headers:
+                self.send_header(key, val)
             self.end_headers()
-            self.wfile.write(resp.read())
-        except urllib.error.HTTPError as e:
-            self.send_response(e.code)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(e.read())
+            headers_sent = True
+            to_cache = cache_key is not None and _cacheable(resp)
+            to_archive = archiving and resp.status == 200
+            body = bytearray() if to_cache or to_archive else None
+            limit = ARCHIVE_MAX_BODY if to_archive else self.cache and self.cache.slot_size
+            while True:
+                chunk = resp.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.shard.bytes_upstream += len(chunk)
+                self.wfile.write(chunk)
+                if body is not None:
+                    body += chunk
+                    if len(body) > limit:
+                        body = None  # too big to keep; stop copying
+            timing["transfer_ms"] = round((time.perf_counter() - first_byte) * 1000, 2)
+            if body is not None:
+                if to_cache:
+                    self.cache.put(cache_key, resp.status, resp_headers, bytes(body))
+                if to_archive:
+                    self.archive.submit(self.path, bytes(body), resp.getheader("Content-Encoding"))
         except Exception as e:
+            if not headers_sent:
+                self._record_error(_error_kind(e))
+                self._bad_gateway(e)  # every replica reset, timed out or refused
+            else:
+                self._record_error("aborted_body")
+                self.close_connection = True  # client aborted, or upstream died mid-body
+        finally:
+            for attempt in attempts:
+                attempt.conn.close()
+                attempt.report()
+
+    def _send_final_summary(self):
+        """Answer /summary for a finished day from DailySummaries, as immutable.
+        False for other days, or when tempestd could not be reached, so the
+        request is proxied as usual."""
+        parts = urllib.parse.urlsplit(self.path)
+        segments = parts.path.strip("/").split("/")
+        if (len(segments) != 5 or segments[:3] != ["api", "v1", "stations"]
+                or segments[4] != "summary" or not segments[3].isdigit()):
+            return False
+        station = segments[3]
+        params = urllib.parse.parse_qs(parts.query)
+        date = params.get("date", [""])[0]
+        units = params.get("units", ["metric"])[0]
+        try:
+            if not DailySummaries.is_final(date):
+                return False
+        except ValueError:
+            return False
+        cached = self.summaries.cached(int(station), date, units) is not None
+        hit = ("summary", cached)
+        self.shard.cache[hit] = self.shard.cache.get(hit, 0) + 1
+        try:
+            summary = self.summaries.get(int(station), date, units)
+        except (OSError, ValueError):
+            return False
+        self._upstream = {"summary": "hit" if cached else "fetched"}
+        self._send_text(json.dumps(summary), "application/json",
+                        [("X-Cache", "HIT" if cached else "MISS")], cache_control=IMMUTABLE)
+        return True
+
+    def _send_summaries(self):
+        """GET /_summaries?station=ID&start=YYYY-MM-DD&end=YYYY-MM-DD[&units=]"""
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        station = params.get("station", [""])[0]
+        units = params.get("units", ["metric"])[0]
+        try:
+            first = datetime.strptime(params.get("start", [""])[0], "%Y-%m-%d")
+            last = datetime.strptime(params.get("end", [""])[0], "%Y-%m-%d")
+        except ValueError:
+            return self.send_error(400, "start and end must be YYYY-MM-DD dates")
+        days = (last - first).days + 1
+        if not station.isdigit() or not 0 < days <= SUMMARY_MAX_DAYS:
+            return self.send_error(400, f"need a station id and at most {SUMMARY_MAX_DAYS} days")
+        dates = [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+        summaries, failed = self.summaries.batch(int(station), dates, units)
+        body = {"station_id": int(station), "units": units, "summaries": summaries, "failed": failed}
+        self._send_text(json.dumps(body), "application/json")
+
+    def _send_export(self):
+        """GET /_export?station=ID&start=ISO&end=ISO[&resolution=1m&units=metric&format=csv]
+
+        Walks the range with limit/offset and writes each page out as it
+        arrives, chunked for HTTP/1.1 clients. CSV columns are the first
+        observation's fields. If tempestd fails partway, the connection is
+        closed without the final chunk so the download shows as incomplete.
+        """
+        params = {key: values[0] for key, values
+                  in urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).items()}
+        station = params.get("station", "")
+        start, end = parse_time(params.get("start")), parse_time(params.get("end"))
+        resolution = params.get("resolution", "1m")
+        units = params.get("units", "metric")
+        fmt = params.get("format", "csv")
+        if not station.isdigit() or start is None or end is None or start >= end:
+            return self.send_error(400, "need a station id and ISO 8601 start before end")
+        if resolution not in EXPORT_RESOLUTIONS or units not in ("metric", "imperial") or fmt not in EXPORT_TYPES:
+            return self.send_error(400, f"resolution must be one of {', '.join(EXPORT_RESOLUTIONS)}, "
+                                        "units metric or imperial, format csv or ndjson")
+        pages = self._export_pages(int(station), iso(start), iso(end), resolution, units)
+        try:
+            first = next(pages)
+        except (OSError, ValueError) as e:
+            self._record_error(_error_kind(e))
+            return self._bad_gateway(e)
+
+        chunked = self.request_version != "HTTP/1.0"
+        if chunked:
+            self.protocol_version = "HTTP/1.1"   # chunked needs a 1.1 status line
+        name = f"tempest-{station}-{iso(start)[:10]}-{iso(end)[:10]}.{fmt}"
+        self.send_response(200)
+        self.send_header("Content-Type", EXPORT_TYPES[fmt])
+        self.send_header("Content-Disposition", f'attachment; filename="{name}"')
+        self.send_header("Cache-Control", "no-store")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        rows, writer, out = 0, None, io.StringIO()
+        try:
+            for page in itertools.chain([first], pages):
+                if fmt == "ndjson":
+                    for obs in page:
+                        out.write(json.dumps(obs, separators=(",", ":")) + "\n")
+                elif page:
+                    if writer is None:
+                        writer = csv.DictWriter(out, list(page[0]), restval="", extrasaction="ignore",
+                                                lineterminator="\n")
+                        writer.writeheader()
+                    writer.writerows(page)
+                data = out.getvalue().encode()
+                out.seek(0)
+                out.truncate()
+                rows += len(page)
+                if data:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data) if chunked else data)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+        except (OSError, ValueError) as e:
+            self._record_error("aborted_body" if isinstance(e, ConnectionError) else _error_kind(e))
+        self._upstream = {"export": fmt, "rows": rows}
+
+    def _export_pages(self, station_id, start, end, resolution, units):
+        """Lists of observations covering [start, end], one page per request;
+        the archive answers the pages it covers."""
+        offset = 0
+        while True:
+            query = urllib.parse.urlencode({
+                "start": start, "end": end, "resolution": resolution, "units": units,
+                "limit": EXPORT_PAGE_ROWS, "offset": offset,
+            })
+            path = f"/api/v1/stations/{station_id}/observations?{query}"
+            data = None
+            if self.archive:
+                try:
+                    data = self.archive.answer(path)
+                except sqlite3.Error:
+                    pass  # tempestd can still answer
+            if data is None:
+                data = fetch_upstream_json(path)
+            if not isinstance(data, dict) or not isinstance(data.get("observations") or [], list):
+                raise ValueError(f"{path}: expected an observations page")
+            page = data.get("observations") or []
+            offset += len(page)
+            yield page
+            if not page or offset >= data.get("total", 0):
+                return
+
+    def _send_cached(self, status, headers, body):
+        self._upstream = {"cache": "hit"}
+        self.send_response(status)
+        for key, val in headers:
+            if key.lower() != "content-length":
+                self.send_header(key, val)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Cache", "HIT")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_attempt(self, attempts, headers, hedge=False):
+        """Send the request to the best untried replica, moving on past any that
+        cannot be reached. Raises the last connection error if none can."""
+        error = None
+        while True:
+            backend = self.backends.choose(exclude=[a.backend for a in attempts], hedge=hedge)
+            if backend is None:
+                raise error
+            attempt = _Attempt(self.backends, backend, hedge)
+            attempts.append(attempt)
+            try:
+                attempt.send(self.command, self.path, headers)
+                return attempt
+            except (OSError, http.client.HTTPException) as e:
+                attempt.report(error=e)
+                error = e
+
+    def _bad_gateway(self, error):
+        try:
             self.send_response(502)
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(f'{{"error": "{e}"}}'.encode())
+            self.wfile.write(json.dumps({"error": str(error) or type(error).__name__}).encode())
+        except OSError:
+            self.close_connection = True  # the client is gone too
+
+    def _await_upstream(self, pending, attempts, headers):
+        """Wait for the first pending request to start answering; None if the
+        client disconnects first.
+
+        With hedging on, a GET still unanswered after hedge_after seconds is
+        sent once more to another replica, budget permitting.
+        """
+        pool = self.backends
+        now = time.monotonic()
+        deadline = now + UPSTREAM_TIMEOUT
+        hedge_at = None
+        if pool.hedge_after and self.command == "GET" and len(attempts) < len(pool):
+            hedge_at = now + pool.hedge_after
+        watch_client = True
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                raise socket.timeout("upstream timed out")
+            if hedge_at is not None and now >= hedge_at:
+                hedge_at = None
+                if pool.allow_hedge():
+                    try:
+                        pending.append(self._start_attempt(attempts, headers, hedge=True))
+                    except (OSError, http.client.HTTPException):
+                        pass  # the original request is still in flight
+            wait = min(deadline - now, 1.0)
+            if hedge_at is not None:
+                wait = min(wait, hedge_at - now)
+            socks = {attempt.conn.sock: attempt for attempt in pending}
+            watch = list(socks) + ([self.connection] if watch_client else [])
+            readable, _, _ = select.select(watch, [], [], wait)
+            for sock in readable:
+                if sock in socks:
+                    return socks[sock]
+            if self.connection in readable:
+                if self._client_gone():
+                    return None
+                watch_client = False  # pipelined request data, not a disconnect
+
+    def _client_gone(self):
+        """True if the browser closed its end of the connection (e.g. an aborted fetch)."""
+        try:
+            return self.connection.recv(1, socket.MSG_PEEK) == b""
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            return True
+
+    def log_request(self, code="-", size="-"):
+        pass  # written by _log_access once the response is complete
 
     def log_message(self, format, *args):
-        status = args[1] if len(args) > 1 else ""
-        print(f"  {self.command} {self.path} {status}")
+        if ACCESS_LOG.handlers and not ACCESS_LOG.disabled:
+            ACCESS_LOG.info(json.dumps({
+                "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "client": self.client_address[0],
+                "level": "error",
+                "message": format % args,
+            }))
+
+
+def fetch_upstream_json(path):
+    """GET a tempestd path through the backend pool, for background jobs."""
+    pool = ProxyHandler.backends
+    backend = pool.choose()
+    conn = backend.connection()
+    started = time.perf_counter()
+    try:
+        conn.request("GET", backend.path + path, headers={"Accept": "application/json"})
+        resp = conn.getresponse()
+        body = resp.read()
+    except (OSError, http.client.HTTPException) as e:
+        pool.done(backend, error=e)
+        raise OSError(f"{path}: {e}") from e
+    finally:
+        conn.close()
+    pool.done(backend, latency=time.perf_counter() - started, status=resp.status)
+    if resp.status != 200:
+        raise OSError(f"{path}: HTTP {resp.status}")
+    return json.loads(body)
+
+
+class WorkerServer(http.server.ThreadingHTTPServer):
+    """One pre-forked worker's listener; SO_REUSEPORT lets the kernel spread
+    connections across every worker bound to the port."""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def run_worker(port, start_services, ready_fd, primary):
+    """Serve until SIGTERM, then finish open connections and exit.
+
+    Writes a byte to ready_fd once the port is bound. The primary worker
+    also runs once-per-server jobs such as archive sync.
+    """
+    server = WorkerServer(("", port), ProxyHandler)
+    os.write(ready_fd, b"1")
+    os.close(ready_fd)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl-C reaches the supervisor, which stops us
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    listener = start_services(primary)
+    try:
+        server.serve_forever()
+        # Take what is already queued on this socket, then stop listening
+        server.timeout = 0
+        while select.select([server], [], [], 0)[0]:
+            server.handle_request()
+        server.server_close()
+        deadline = time.monotonic() + DRAIN_SECONDS
+        while METRICS.open_connections() and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        if listener:
+            listener.stop()
+
+
+class Supervisor:
+    """Keeps N forked workers running; SIGHUP restarts them, SIGTERM stops them.
+
+    A restart forks fresh workers from this process, so they run the same code
+    and options as the ones they replace.
+    """
+
+    def __init__(self, port, count, start_services):
+        self.port = port
+        self.count = count
+        self.start_services = start_services
+        self.workers = {}      # pid -> start time
+        self.retiring = set()
+        self.primary = None    # the worker running once-per-server jobs
+        self._restart = False
+        self._stop = False
+
+    def _spawn(self, primary=False):
+        """Fork a worker and wait until it is listening; False if it failed to start."""
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                os.close(ready_r)
+                run_worker(self.port, self.start_services, ready_w, primary)
+                code = 0
+            finally:
+                os._exit(code)
+        os.close(ready_w)
+        self.workers[pid] = time.monotonic()
+        if primary:
+            self.primary = pid
+        try:
+            readable, _, _ = select.select([ready_r], [], [], DRAIN_SECONDS)
+            return bool(readable) and os.read(ready_r, 1) == b"1"
+        finally:
+            os.close(ready_r)
+
+    def _signal(self, pids, signum):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGHUP, lambda signum, frame: setattr(self, "_restart", True))
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, "_stop", True))
+        signal.signal(signal.SIGINT, lambda signum, frame: setattr(self, "_stop", True))
+        if not all(self._spawn(primary=i == 0) for i in range(self.count)):
+            print("A worker failed to start; stopping", file=sys.stderr)
+            self._stop = True
+        while not self._stop:
+            if self._restart:
+                # The old workers only stop listening once all new ones are bound
+                self._restart = False
+                old = [pid for pid in self.workers if pid not in self.retiring]
+                started = all(self._spawn(primary=i == 0) for i in range(self.count))
+                new = [pid for pid in self.workers if pid not in self.retiring and pid not in old]
+                retire = old if started else new
+                self.retiring.update(retire)
+                self._signal(retire, signal.SIGTERM)
+                if started:
+                    print(f"Restarted {self.count} workers")
+                else:
+                    print("A new worker failed to start; keeping the old ones", file=sys.stderr)
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if not pid:
+                time.sleep(0.1)
+                continue
+            started = self.workers.pop(pid, None)
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+            elif started is not None and not self._stop:
+                print(f"Worker {pid} died (status {status}); replacing it", file=sys.stderr)
+                if not self._spawn(primary=pid == self.primary):
+                    print("Replacement worker failed to start; stopping", file=sys.stderr)
+                    self._stop = True
+        self._shutdown()
+
+    def _shutdown(self):
+        self._signal(self.workers, signal.SIGTERM)
+        deadline = time.monotonic() + DRAIN_SECONDS + 1
+        while self.workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.workers.pop(pid, None)
+            else:
+                time.sleep(0.05)
+        self._signal(self.workers, signal.SIGKILL)
+
+
+def _error_kind(error):
+    if isinstance(error, socket.timeout):
+        return "upstream_timeout"
+    if isinstance(error, ConnectionRefusedError):
+        return "upstream_refused"
+    if isinstance(error, (ConnectionResetError, http.client.RemoteDisconnected)):
+        return "upstream_reset"
+    return "upstream_error"
 
 
 def main():
     parser = argparse.ArgumentParser(description="Dashboard dev server with API proxy")
     parser.add_argument("--port", type=int, default=8000, help="Port to serve on (default: 8000)")
-    parser.add_argument("--backend", default="http://localhost:8080", help="tempestd backend URL")
+    parser.add_argument("--backend", action="append",
+                        help="tempestd backend URL; repeat for replicas (default: http://localhost:8080)")
+    parser.add_argument("--balance", choices=BackendPool.STRATEGIES, default="round-robin",
+                        help="How to pick among replicas (default: round-robin)")
+    parser.add_argument("--hedge-after", type=float, default=0, metavar="MS",
+                        help="Send a GET to a second replica if the first has not answered "
+                             "within MS milliseconds; 0 disables (default: 0)")
+    parser.add_argument("--health-interval", type=float, default=HEALTH_INTERVAL,
+                        help=f"Seconds between replica health checks (default: {HEALTH_INTERVAL:g})")
+    parser.add_argument("--max-observation-age", type=float, default=MAX_OBSERVATION_AGE,
+                        help="Skip replicas whose newest observation is older than this many "
+                             f"seconds (default: {MAX_OBSERVATION_AGE:g})")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Pre-forked worker processes sharing the port (default: 1)")
+    parser.add_argument("--cache-ttl", type=float, default=0,
+                        help="Seconds to reuse proxied GET responses, shared by all workers; "
+                             "0 disables (default: 0)")
+    parser.add_argument("--vendor", nargs="?", const=os.path.join(ROOT_DIR, "vendor"), metavar="DIR",
+                        help="Serve the CDN scripts from local copies made by scripts/vendor.py "
+                             "(default DIR: vendor/)")
+    parser.add_argument("--archive", metavar="PATH",
+                        help="SQLite file archiving 1m observations; covered /observations "
+                             "requests are answered from it")
+    parser.add_argument("--archive-days", type=int, default=30,
+                        help="Days of history the archive backfills (default: 30)")
+    parser.add_argument("--access-log", default="-",
+                        help='JSON-lines access log path, "-" for stdout or "off" (default: -)')
+    parser.add_argument("--log-sample", type=float, default=1.0,
+                        help="Fraction of successful requests logged; errors are always logged (default: 1.0)")
+    parser.add_argument("--log-max-bytes", type=int, default=LOG_MAX_BYTES,
+                        help=f"Rotate the access log file at this size (default: {LOG_MAX_BYTES})")
+    parser.add_argument("--log-backups", type=int, default=LOG_BACKUPS,
+                        help=f"Rotated access log files kept (default: {LOG_BACKUPS})")
     args = parser.parse_args()
+    if not 0.0 <= args.log_sample <= 1.0:
+        parser.error("--log-sample must be between 0 and 1")
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if args.processes > 1 and not (hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")):
+        parser.error("--processes needs fork() and SO_REUSEPORT")
+
+    backends = args.backend or ["http://localhost:8080"]
+    ProxyHandler.backends = BackendPool(backends, args.balance, args.hedge_after / 1000,
+                                        args.max_observation_age)
+    ProxyHandler.log_sample = args.log_sample
+    if args.cache_ttl > 0:
+        ProxyHandler.cache = SharedResponseCache(args.cache_ttl)
+    if args.vendor:
+        index = os.path.join(ROOT_DIR, "index.html")
+        with open(index, encoding="utf-8") as f:
+            try:
+                ProxyHandler.vendor = VendorBundle(args.vendor, f.read())
+            except ValueError as e:
+                parser.error(f"--vendor: {e}; run scripts/vendor.py")
+        ProxyHandler.static.transforms[index] = ProxyHandler.vendor.rewrite
+    ProxyHandler.summaries = DailySummaries(fetch_upstream_json)
+    if args.archive:
+        ProxyHandler.archive = Archive(args.archive)
+    preloaded = ProxyHandler.static.preload()   # before fork, so workers share the pages
+
+    def start_services(primary=True):
+        """Threads each serving process needs; started after fork()."""
+        if len(backends) > 1:
+            ProxyHandler.backends.start_health_checks(args.health_interval)
+        if args.archive:
+            ProxyHandler.archive.start_writer()
+            if primary:
+                ArchiveSync(ProxyHandler.archive, fetch_upstream_json,
+                            args.archive_days, ARCHIVE_SYNC_SECONDS).start()
+        return setup_access_log(args.access_log, args.log_max_bytes, args.log_backups,
+                                rotate=args.processes == 1)
 
-    ProxyHandler.backend = args.backend
-    server = http.server.HTTPServer(("", args.port), ProxyHandler)
     print(f"Dashboard: http://localhost:{args.port}")
-    print(f"Backend:   {args.backend}")
-    print(f"Serving:   {ROOT_DIR}")
-    print()
+    print(f"Backend:   {', '.join(backends)}")
+    if len(backends) > 1:
+        hedge = f", hedge after {args.hedge_after:g} ms" if args.hedge_after else ""
+        print(f"Balance:   {args.balance}{hedge}")
+    print(f"Serving:   {ROOT_DIR} ({preloaded} assets preloaded)")
+    print(f"Log:       {args.access_log} (sample {args.log_sample:g})")
+    if args.vendor:
+        print(f"Vendor:    {len(ProxyHandler.vendor.files)} scripts from {args.vendor}")
+    if args.processes > 1:
+        print(f"Workers:   {args.processes} (pid {os.getpid()}; SIGHUP restarts workers)")
+    if args.cache_ttl > 0:
+        print(f"Cache:     {args.cache_ttl:g} s, {CACHE_BYTES // (1024 * 1024)} MB shared")
+    if args.archive:
+        print(f"Archive:   {args.archive} ({args.archive_days} days)")
+    print(flush=True)
+
+    if args.processes > 1:
+        Supervisor(args.port, args.processes, start_services).run()
+        print("\nStopped.")
+        return
+
+    server = http.server.ThreadingHTTPServer(("", args.port), ProxyHandler)
+    server.daemon_threads = True
+    listener = start_services()
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nStopped.")
+    finally:
+        if listener:
+            listener.stop()
 
 
 if __name__ == "__main__":
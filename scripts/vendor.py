@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Download pinned local copies of the CDN scripts in index.html.
+
+Usage:
+    python3 scripts/vendor.py                 # writes vendor/ in the repo root
+    python3 scripts/vendor.py --out /srv/vendor
+
+Each <script src="https://..." integrity="..."> in index.html is fetched,
+checked against its SRI hash and saved under a content-hashed name, next to
+a manifest.json mapping the CDN URL to the local file. `serve.py --vendor`
+then serves those copies instead of the CDN, with the same integrity values.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.request
+from html.parser import HTMLParser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_HTML = os.path.join(ROOT_DIR, "index.html")
+MANIFEST = "manifest.json"
+FETCH_TIMEOUT = 30  # seconds
+
+
+class _ScriptCollector(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.scripts = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src", "").startswith("https://") and attrs.get("integrity"):
+            self.scripts.append((attrs["src"], attrs["integrity"]))
+
+
+def cdn_scripts(html):
+    """(url, integrity) for every external script with an SRI hash."""
+    collector = _ScriptCollector()
+    collector.feed(html)
+    return collector.scripts
+
+
+def sri_matches(data, integrity):
+    """True if data matches any of the hashes in an integrity attribute."""
+    for token in integrity.split():
+        algorithm, _, expected = token.partition("-")
+        if algorithm in ("sha256", "sha384", "sha512"):
+            digest = base64.b64encode(hashlib.new(algorithm, data).digest()).decode()
+            if digest == expected:
+                return True
+    return False
+
+
+def local_name(url, data):
+    """chart.umd.min.js -> chart.umd.min.<first 8 hex of sha256>.js"""
+    base = re.sub(r"[^\w.-]", "_", url.rstrip("/").rsplit("/", 1)[-1])
+    stem, dot, ext = base.rpartition(".")
+    tag = hashlib.sha256(data).hexdigest()[:8]
+    return f"{stem}.{tag}.{ext}" if dot else f"{base}.{tag}"
+
+
+def vendor(out_dir, html):
+    """Fetch and verify every CDN script; returns the manifest written."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+    for url, integrity in cdn_scripts(html):
+        with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as resp:
+            data = resp.read()
+        if not sri_matches(data, integrity):
+            raise ValueError(f"{url} does not match its integrity hash")
+        name = local_name(url, data)
+        with open(os.path.join(out_dir, name), "wb") as f:
+            f.write(data)
+        manifest[url] = {"file": name, "integrity": integrity}
+        print(f"  {name}  <- {url}")
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vendor the dashboard's CDN scripts")
+    parser.add_argument("--out", default=os.path.join(ROOT_DIR, "vendor"),
+                        help="Directory to write (default: vendor/ in the repo root)")
+    args = parser.parse_args()
+    with open(INDEX_HTML, encoding="utf-8") as f:
+        html = f.read()
+    try:
+        manifest = vendor(args.out, html)
+    except (OSError, ValueError) as e:
+        print(f"Vendoring failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote {len(manifest)} scripts to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 // Service Worker — stale-while-revalidate for API, cache-first for static assets
 
-const CACHE_NAME = 'tempest-dashboard-v1';
+const CACHE_NAME = 'tempest-dashboard-v7';
 const STATIC_ASSETS = [
     '/',
     '/index.html',
@@ -8,10 +8,18 @@ const STATIC_ASSETS = [
     '/js/config.js',
     '/js/state.js',
     '/js/api.js',
+    '/js/perf.js',
+    '/js/units.js',
+    '/js/tiles.js',
+    '/js/prefetch.js',
     '/js/current.js',
     '/js/controls.js',
     '/js/charts.js',
     '/js/plugins.js',
+    '/js/summaries.js',
+    '/js/leader.js',
+    '/js/scheduler.js',
+    '/js/visibility.js',
     '/js/app.js',
     '/manifest.json',
     '/plugins.json',
@@ -53,8 +61,14 @@ self.addEventListener('activate', (event) => {
 
 // Fetch: different strategies for static vs API
 self.addEventListener('fetch', (event) => {
+    // Only GETs are cacheable (e.g. perf beacons POST to /_perf)
+    if (event.request.method !== 'GET') return;
+
     const url = new URL(event.request.url);
 
+    // Dev server routes (/_summaries, /_stats) are always live
+    if (url.pathname.startsWith('/_')) return;
+
     // API requests: stale-while-revalidate
     if (url.pathname.startsWith('/api/')) {
         event.respondWith(staleWhileRevalidate(event.request));
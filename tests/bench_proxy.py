@@ -0,0 +1,345 @@
+"""Load benchmark for the dev server proxy, driven against mock tempestd.
+
+Starts the mock backend and scripts/serve.py, then runs N simulated
+dashboards that follow the poll pattern in js/app.js: bootstrap (health,
+stations, current, one /observations request per chart tile), then every
+poll interval the current observation and the live tile. Reports
+throughput, p50/p95/p99 latency and proxy RSS, and can save results as
+JSON and compare them against a saved baseline.
+
+Usage:
+    python -m tests.bench_proxy --clients 20 --duration 30 --poll-interval 1
+    python -m tests.bench_proxy --rows 2000 --latency 0.05 --output bench.json
+    python -m tests.bench_proxy --baseline bench.json    # exit 1 on regression
+    python -m tests.bench_proxy --faults faults.json     # tail latency, resets, 5xx bursts
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+
+from tests.conftest import SERVE_SCRIPT, free_port, wait_for_server
+from tests.mock_tempestd import SERVER_KINDS, start_mock_server
+
+# Mirrors js/config.js and js/tiles.js
+RESOLUTION_MINUTES = {"1m": 1, "5m": 5, "30m": 30, "1h": 60, "3h": 180, "1d": 1440}
+TILE_POINTS = 120
+WINDOW_HOURS = 24
+WINDOW_RESOLUTION = "5m"
+
+# Metrics compared against a baseline, and which direction is worse
+REGRESSION_METRICS = {
+    "throughput_rps": "lower",
+    "latency_ms.p50": "higher",
+    "latency_ms.p95": "higher",
+    "latency_ms.p99": "higher",
+    "proxy_rss_kb.peak": "higher",
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def read_rss_kb(pid):
+    """Resident set size of a process in KiB, or None where unsupported."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True)
+        return int(out.stdout.strip())
+    except (OSError, ValueError):
+        return None
+
+
+def tile_paths(station_id, now, live_only=False):
+    """/observations paths for the dashboard's 24h window, one per tile."""
+    span = timedelta(minutes=RESOLUTION_MINUTES[WINDOW_RESOLUTION] * TILE_POINTS)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    start = now - timedelta(hours=WINDOW_HOURS)
+    tile = epoch + ((start - epoch) // span) * span
+    tiles = []
+    while tile <= now:
+        tiles.append(tile)
+        tile += span
+    if live_only:
+        tiles = tiles[-1:]
+    paths = []
+    for t in tiles:
+        qs = urllib.parse.urlencode({
+            "start": t.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "end": (t + span).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "resolution": WINDOW_RESOLUTION,
+            "units": "metric",
+        })
+        paths.append(f"/api/v1/stations/{station_id}/observations?{qs}")
+    return paths
+
+
+class Recorder:
+    """Thread-safe collection of (route, latency, ok) samples."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []
+
+    def add(self, route, seconds, ok, size):
+        with self.lock:
+            self.samples.append((route, seconds, ok, size))
+
+
+def route_of(path):
+    path = path.split("?", 1)[0]
+    parts = path.strip("/").split("/")
+    if len(parts) >= 5 and parts[2] == "stations":
+        return "stations/{id}/" + parts[4]
+    return "/".join(parts[2:]) or path
+
+
+def request(host, port, path, recorder):
+    route = route_of(path)
+    started = time.perf_counter()
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        body = resp.read()
+        recorder.add(route, time.perf_counter() - started, resp.status == 200, len(body))
+        return body if resp.status == 200 else None
+    except (OSError, http.client.HTTPException):
+        recorder.add(route, time.perf_counter() - started, False, 0)
+        return None
+    finally:
+        conn.close()
+
+
+def simulate_dashboard(host, port, deadline, poll_interval, recorder):
+    """One browser tab: bootstrap, then poll until the deadline."""
+    request(host, port, "/api/v1/health", recorder)
+    body = request(host, port, "/api/v1/stations", recorder)
+    stations = json.loads(body) if body else []
+    if not stations:
+        return
+    station_id = stations[0]["station_id"]
+
+    request(host, port, f"/api/v1/stations/{station_id}/current?units=metric", recorder)
+    for path in tile_paths(station_id, datetime.now(timezone.utc)):
+        request(host, port, path, recorder)
+
+    while True:
+        next_poll = time.monotonic() + poll_interval
+        if next_poll >= deadline:
+            return
+        time.sleep(max(0.0, next_poll - time.monotonic()))
+        request(host, port, f"/api/v1/stations/{station_id}/current?units=metric", recorder)
+        for path in tile_paths(station_id, datetime.now(timezone.utc), live_only=True):
+            request(host, port, path, recorder)
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(s[1] * 1000 for s in samples)
+    by_route = {}
+    for route, seconds, ok, _ in samples:
+        entry = by_route.setdefault(route, {"requests": 0, "errors": 0, "_lat": []})
+        entry["requests"] += 1
+        entry["errors"] += 0 if ok else 1
+        entry["_lat"].append(seconds * 1000)
+    for entry in by_route.values():
+        lat = sorted(entry.pop("_lat"))
+        entry["p50_ms"] = round(percentile(lat, 50), 2)
+        entry["p95_ms"] = round(percentile(lat, 95), 2)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if not s[2]),
+        "bytes": sum(s[3] for s in samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "by_route": by_route,
+    }
+
+
+def run_benchmark(clients=10, duration=10.0, poll_interval=1.0, rows=None, latency=0.0, pad_bytes=0,
+                  faults=None, mock_server="asyncio"):
+    """Run one benchmark and return the report dict."""
+    mock, mock_port = start_mock_server(
+        rows=rows, latency=latency, pad_bytes=pad_bytes, faults=faults, fault_seed=0,
+        server=mock_server,
+    )
+    backend = f"http://127.0.0.1:{mock_port}"
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, SERVE_SCRIPT, "--port", str(port), "--backend", backend],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    rss = []
+    try:
+        if not wait_for_server(f"http://localhost:{port}/index.html"):
+            raise RuntimeError(f"Dev server failed to start on port {port}")
+
+        recorder = Recorder()
+        deadline = time.monotonic() + duration
+        started = time.monotonic()
+        threads = [
+            threading.Thread(
+                target=simulate_dashboard,
+                args=("localhost", port, deadline, poll_interval, recorder),
+                daemon=True,
+            )
+            for _ in range(clients)
+        ]
+        for t in threads:
+            t.start()
+        while any(t.is_alive() for t in threads):
+            sample = read_rss_kb(proc.pid)
+            if sample is not None:
+                rss.append(sample)
+            time.sleep(0.1)
+        elapsed = time.monotonic() - started
+    finally:
+        proc.terminate()
+        proc.wait()
+        mock.shutdown()
+
+    report = summarize(recorder.samples, elapsed)
+    report["proxy_rss_kb"] = {
+        "peak": max(rss) if rss else None,
+        "end": rss[-1] if rss else None,
+    }
+    report["config"] = {
+        "clients": clients,
+        "duration": duration,
+        "poll_interval": poll_interval,
+        "rows": rows,
+        "latency": latency,
+        "pad_bytes": pad_bytes,
+        "faults": faults,
+        "mock_server": mock_server,
+    }
+    report["environment"] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    return report
+
+
+def _lookup(report, dotted):
+    value = report
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(report, baseline, tolerance=0.2, metrics=REGRESSION_METRICS):
+    """List metrics that are worse than the baseline by more than tolerance.
+
+    metrics maps dotted report keys to the direction that is worse.
+    """
+    regressions = []
+    for metric, worse in metrics.items():
+        current = _lookup(report, metric)
+        previous = _lookup(baseline, metric)
+        if not current or not previous:
+            continue
+        change = (current - previous) / previous
+        if (worse == "higher" and change > tolerance) or (worse == "lower" and -change > tolerance):
+            regressions.append({
+                "metric": metric,
+                "baseline": previous,
+                "current": current,
+                "change_pct": round(change * 100, 1),
+            })
+    return regressions
+
+
+def print_report(report):
+    lat = report["latency_ms"]
+    rss = report["proxy_rss_kb"]
+    print(f"Requests:   {report['requests']} ({report['errors']} errors)")
+    print(f"Throughput: {report['throughput_rps']} req/s")
+    print(f"Latency:    p50 {lat['p50']} ms  p95 {lat['p95']} ms  p99 {lat['p99']} ms  max {lat['max']} ms")
+    print(f"Proxy RSS:  peak {rss['peak']} KiB  end {rss['end']} KiB")
+    print()
+    for route, entry in sorted(report["by_route"].items()):
+        print(f"  {route:32} {entry['requests']:6}  p50 {entry['p50_ms']:8} ms  p95 {entry['p95_ms']:8} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proxy load benchmark against mock tempestd")
+    parser.add_argument("--clients", type=int, default=10, help="Simulated dashboards (default: 10)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (default: 10)")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="Seconds between polls per dashboard; the app uses 60 (default: 1)")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Fixed observations per /observations response (default: the tile's window)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock backend delay per request (s)")
+    parser.add_argument("--pad-bytes", type=int, default=0, help="Extra bytes per observation")
+    parser.add_argument("--mock-server", choices=SERVER_KINDS, default="asyncio",
+                        help="Mock tempestd variant (default: asyncio)")
+    parser.add_argument("--faults", help="JSON file of mock fault rules (see tests/mock_faults.py)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a saved JSON report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression vs baseline (default: 0.2)")
+    args = parser.parse_args()
+
+    faults = None
+    if args.faults:
+        with open(args.faults) as f:
+            faults = json.load(f)
+
+    report = run_benchmark(
+        clients=args.clients,
+        duration=args.duration,
+        poll_interval=args.poll_interval,
+        rows=args.rows,
+        latency=args.latency,
+        pad_bytes=args.pad_bytes,
+        faults=faults,
+        mock_server=args.mock_server,
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved: {os.path.abspath(args.output)}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} ({r['change_pct']:+}%)")
+        if regressions:
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""Render benchmark for the dashboard, driven by Playwright against mock tempestd.
+
+Starts the mock backend and scripts/serve.py, opens the dashboard in headless
+Chromium and measures:
+
+- bootstrap to first chart: navigation start until the temperature chart has data
+- updateCharts() on synthetic windows of 10k-500k observations, with the long
+  tasks it causes and the JS heap afterwards (CDP Performance.getMetrics)
+- frames while zooming and panning the largest window, from a CDP trace
+
+Like tests/bench_proxy.py, it can save results as JSON and compare them
+against a saved baseline. Timings depend on the machine, so compare against a
+baseline recorded on the same one.
+
+Usage:
+    python -m tests.bench_render
+    python -m tests.bench_render --points 10000 100000 --output render.json
+    python -m tests.bench_render --baseline render.json    # exit 1 on regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from playwright.sync_api import sync_playwright
+
+from tests.bench_proxy import compare
+from tests.conftest import SERVE_SCRIPT, free_port, wait_for_server
+from tests.mock_tempestd import start_mock_server
+
+DEFAULT_POINTS = (10000, 100000, 500000)
+VIEWPORT = {"width": 1280, "height": 900}
+TRACE_CATEGORIES = ["devtools.timeline", "disabled-by-default-devtools.timeline.frame"]
+
+# Metrics compared against a baseline, and which direction is worse;
+# updates.<points>.update_ms is added for every window size measured
+REGRESSION_METRICS = {
+    "first_chart_ms": "higher",
+    "long_tasks.total_ms": "higher",
+    "heap_mb.peak": "higher",
+    "zoom.fps": "lower",
+    "zoom.worst_frame_ms": "higher",
+}
+
+# Runs before the page's own scripts: collects long tasks and notes when the
+# first chart has data
+INIT_SCRIPT = """
+window.__bench = { longTasks: [], frames: [], recording: false, firstChart: null };
+new PerformanceObserver((list) => {
+    for (const entry of list.getEntries()) window.__bench.longTasks.push(entry.duration);
+}).observe({ type: 'longtask', buffered: true });
+(function watchFirstChart() {
+    const canvas = document.getElementById('chart-temperature');
+    const chart = canvas && typeof Chart !== 'undefined' && Chart.getChart(canvas);
+    if (chart && chart.data.datasets[0].data.length > 0) {
+        window.__bench.firstChart = performance.now();
+    } else {
+        requestAnimationFrame(watchFirstChart);
+    }
+})();
+"""
+
+# A window of `points` one-minute observations, built from a day of real mock
+# data with the timestamps rewritten
+SYNTHESIZE = """
+async (points) => {
+    const bench = window.__bench;
+    if (!bench.seed) {
+        const station = document.getElementById('station-select').value;
+        const end = new Date();
+        const start = new Date(end.getTime() - 86400000);
+        const query = `start=${start.toISOString()}&end=${end.toISOString()}&resolution=1m&limit=1440`;
+        const res = await fetch(`/api/v1/stations/${station}/observations?${query}`);
+        bench.seed = (await res.json()).observations;
+        // Keep zoom-driven detail fetches from replacing the synthetic window
+        (await import('/js/charts.js')).onViewportChange(() => {});
+    }
+    const step = 60000;
+    const first = Date.now() - points * step;
+    const observations = new Array(points);
+    for (let i = 0; i < points; i++) {
+        const obs = bench.seed[i % bench.seed.length];
+        observations[i] = { ...obs, timestamp: new Date(first + i * step).toISOString() };
+    }
+    bench.window = observations;
+}
+"""
+
+UPDATE = """
+async () => {
+    const bench = window.__bench;
+    const { updateCharts } = await import('/js/charts.js');
+    const tasksBefore = bench.longTasks.length;
+    const start = performance.now();
+    updateCharts(bench.window);
+    const updated = performance.now();
+    await new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    const painted = performance.now();
+    await new Promise((resolve) => setTimeout(resolve, 50));   // long-task entries arrive late
+    const tasks = bench.longTasks.slice(tasksBefore);
+    return {
+        update_ms: updated - start,
+        painted_ms: painted - start,
+        long_task_ms: tasks.reduce((sum, ms) => sum + ms, 0),
+    };
+}
+"""
+
+START_FRAMES = """
+() => {
+    const bench = window.__bench;
+    bench.frames = [];
+    bench.recording = true;
+    (function frame(t) {
+        if (!bench.recording) return;
+        bench.frames.push(t);
+        requestAnimationFrame(frame);
+    })(performance.now());
+}
+"""
+
+STOP_FRAMES = """
+async () => {
+    await new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    window.__bench.recording = false;
+    return window.__bench.frames;
+}
+"""
+
+
+def heap_mb(cdp):
+    """JS heap in use after a full garbage collection, in MiB."""
+    cdp.send("HeapProfiler.collectGarbage")
+    metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+    return round(metrics.get("JSHeapUsedSize", 0) / (1024 * 1024), 1)
+
+
+def frame_stats(trace, seconds, raf_frames=()):
+    """Frames drawn, dropped frames, fps and the longest gap between frames.
+
+    Uses the trace's DrawFrame events; falls back to requestAnimationFrame
+    timestamps when the trace has none (some headless builds).
+    """
+    data = json.loads(trace) if isinstance(trace, (bytes, str)) else trace
+    events = data.get("traceEvents", []) if isinstance(data, dict) else data
+    draws = sorted(e["ts"] / 1000.0 for e in events if e.get("name") == "DrawFrame" and "ts" in e)
+    dropped = sum(1 for e in events if e.get("name") == "DroppedFrame")
+    source = "trace"
+    if not draws:
+        draws, source = sorted(raf_frames), "raf"
+    gaps = [b - a for a, b in zip(draws, draws[1:])]
+    return {
+        "seconds": round(seconds, 2),
+        "frames": len(draws),
+        "dropped_frames": dropped,
+        "fps": round(len(draws) / seconds, 1) if seconds else 0.0,
+        "worst_frame_ms": round(max(gaps), 1) if gaps else None,
+        "source": source,
+    }
+
+
+def regression_metrics(report):
+    metrics = dict(REGRESSION_METRICS)
+    for points in report.get("updates", {}):
+        metrics[f"updates.{points}.update_ms"] = "higher"
+    return metrics
+
+
+def zoom_and_pan(page, steps):
+    """Ctrl+wheel into the temperature chart, ctrl+drag across it, zoom back out."""
+    box = page.locator("#chart-temperature").bounding_box()
+    x, y = box["x"] + box["width"] / 2, box["y"] + box["height"] / 2
+    page.mouse.move(x, y)
+    page.keyboard.down("Control")
+    try:
+        for _ in range(steps):
+            page.mouse.wheel(0, -120)
+        page.mouse.down()
+        for i in range(1, steps + 1):
+            page.mouse.move(x - box["width"] / 3 * i / steps, y)
+        page.mouse.up()
+        for _ in range(steps):
+            page.mouse.wheel(0, 120)
+    finally:
+        page.keyboard.up("Control")
+
+
+def measure(browser, url, points=DEFAULT_POINTS, repeat=3, zoom_steps=10):
+    """Run the measurements in a fresh context of an already launched Chromium."""
+    context = browser.new_context(service_workers="block", viewport=VIEWPORT)
+    context.add_init_script(INIT_SCRIPT)
+    page = context.new_page()
+    cdp = context.new_cdp_session(page)
+    cdp.send("Performance.enable")
+    try:
+        page.goto(url)
+        page.wait_for_function("window.__bench.firstChart !== null", timeout=30000)
+        first_chart_ms = page.evaluate("window.__bench.firstChart")
+        page.locator("#chart-temperature").scroll_into_view_if_needed()
+
+        updates = {}
+        for n in sorted(points):
+            page.evaluate(SYNTHESIZE, n)
+            runs = [page.evaluate(UPDATE) for _ in range(repeat)]
+            updates[str(n)] = {
+                key: round(statistics.median(run[key] for run in runs), 1)
+                for key in ("update_ms", "painted_ms", "long_task_ms")
+            }
+            updates[str(n)]["heap_mb"] = heap_mb(cdp)
+
+        # Zoom and pan the largest window, which is still loaded
+        browser.start_tracing(page=page, categories=TRACE_CATEGORIES)
+        page.evaluate(START_FRAMES)
+        started = time.perf_counter()
+        zoom_and_pan(page, zoom_steps)
+        raf_frames = page.evaluate(STOP_FRAMES)
+        seconds = time.perf_counter() - started
+        trace = browser.stop_tracing()
+        zoom = frame_stats(trace, seconds, raf_frames)
+        zoom["points"] = max(points)
+
+        long_tasks = page.evaluate("window.__bench.longTasks")
+    finally:
+        context.close()
+
+    return {
+        "first_chart_ms": round(first_chart_ms, 1),
+        "updates": updates,
+        "long_tasks": {
+            "count": len(long_tasks),
+            "total_ms": round(sum(long_tasks), 1),
+            "max_ms": round(max(long_tasks), 1) if long_tasks else 0.0,
+        },
+        "heap_mb": {"peak": max(u["heap_mb"] for u in updates.values())},
+        "zoom": zoom,
+    }
+
+
+def run_benchmark(points=DEFAULT_POINTS, repeat=3, zoom_steps=10, browser=None, headless=True):
+    """Run one benchmark and return the report dict.
+
+    browser is a launched Playwright Chromium to reuse (e.g. pytest-playwright's
+    fixture); without one, a headless Chromium is started for the run.
+    """
+    mock, mock_port = start_mock_server()
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, SERVE_SCRIPT, "--port", str(port), "--backend", f"http://127.0.0.1:{mock_port}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://localhost:{port}"
+        if not wait_for_server(f"{url}/index.html"):
+            raise RuntimeError(f"Dev server failed to start on port {port}")
+        if browser is not None:
+            report = measure(browser, url, points, repeat, zoom_steps)
+            version = browser.version
+        else:
+            with sync_playwright() as pw:
+                launched = pw.chromium.launch(headless=headless)
+                try:
+                    report = measure(launched, url, points, repeat, zoom_steps)
+                    version = launched.version
+                finally:
+                    launched.close()
+    finally:
+        proc.terminate()
+        proc.wait()
+        mock.shutdown()
+
+    report["config"] = {
+        "points": sorted(points),
+        "repeat": repeat,
+        "zoom_steps": zoom_steps,
+        "viewport": VIEWPORT,
+    }
+    report["environment"] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "browser": version,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    return report
+
+
+def print_report(report):
+    tasks = report["long_tasks"]
+    zoom = report["zoom"]
+    print(f"First chart:  {report['first_chart_ms']} ms after navigation")
+    print(f"Long tasks:   {tasks['count']} ({tasks['total_ms']} ms total, longest {tasks['max_ms']} ms)")
+    print(f"Heap:         peak {report['heap_mb']['peak']} MiB")
+    print(f"Zoom/pan:     {zoom['fps']} fps, worst frame {zoom['worst_frame_ms']} ms, "
+          f"{zoom['dropped_frames']} dropped ({zoom['points']} points, from {zoom['source']})")
+    print()
+    for points, entry in sorted(report["updates"].items(), key=lambda item: int(item[0])):
+        print(f"  {int(points):>8} points  updateCharts {entry['update_ms']:9} ms  "
+              f"painted {entry['painted_ms']:9} ms  long tasks {entry['long_task_ms']:9} ms  "
+              f"heap {entry['heap_mb']} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard render benchmark against mock tempestd")
+    parser.add_argument("--points", type=int, nargs="+", default=list(DEFAULT_POINTS),
+                        help="Synthetic window sizes to draw (default: 10000 100000 500000)")
+    parser.add_argument("--repeat", type=int, default=3, help="updateCharts() runs per size; the median is kept")
+    parser.add_argument("--zoom-steps", type=int, default=10, help="Wheel steps each way while zooming")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a saved JSON report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Allowed relative regression vs baseline (default: 0.3)")
+    args = parser.parse_args()
+
+    report = run_benchmark(points=args.points, repeat=args.repeat, zoom_steps=args.zoom_steps,
+                           headless=not args.headed)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved: {os.path.abspath(args.output)}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, regression_metrics(report))
+        for r in regressions:
+            print(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} ({r['change_pct']:+}%)")
+        if regressions:
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Shared fixtures for tempest-dashboard tests."""
 
 import os
+import socket
 import subprocess
 import time
 import urllib.request
@@ -29,6 +30,43 @@ def wait_for_server(url, timeout=10):
     return False
 
 
+def free_port():
+    """Pick an unused localhost port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture()
+def dev_server_factory():
+    """Start extra dev servers with custom backends/flags; stopped after the test.
+
+    start.processes maps each returned base URL to its Popen.
+    """
+    procs = []
+
+    def start(backend, *extra_args):
+        port = free_port()
+        base_url = f"http://localhost:{port}"
+        proc = subprocess.Popen(
+            ["python3", SERVE_SCRIPT, "--port", str(port), "--backend", backend, *extra_args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        procs.append(proc)
+        start.processes[base_url] = proc
+        if not wait_for_server(f"{base_url}/index.html"):
+            pytest.fail(f"Dev server failed to start on port {port}")
+        return base_url
+
+    start.processes = {}
+    yield start
+
+    for proc in procs:
+        proc.terminate()
+        proc.wait()
+
+
 @pytest.fixture(scope="session")
 def backend_url():
     """The tempestd backend URL — real or mock."""
@@ -0,0 +1,161 @@
+"""Fault and latency injection for the mock tempestd server.
+
+Rules are keyed by route name ("observations", "current", ...) with "*" as
+the fallback, and merge key by key so a route only overrides what it sets:
+
+    {
+        "*":            {"latency": "lognormal:0.02:0.5"},
+        "observations": {"error_rate": 0.05, "error_burst": 3, "drip_bps": 20000},
+        "current":      {"reset_rate": 0.01, "stall_rate": 0.01, "stall_seconds": 40}
+    }
+
+Latency specs are "fixed:S", "uniform:LO:HI", "lognormal:MEDIAN:SIGMA" or
+"pareto:SCALE:ALPHA", all in seconds. The same seed replays the same faults
+for the same request sequence.
+"""
+
+import math
+import random
+import re
+import threading
+from http import HTTPStatus
+
+# Rule keys and their "off" values
+FAULT_DEFAULTS = {
+    "latency": None,        # delay before responding (spec string)
+    "drip_bps": 0,          # throttle the body to this many bytes per second
+    "reset_rate": 0.0,      # chance of a TCP reset instead of a response
+    "error_rate": 0.0,      # chance of starting a burst of 5xx responses
+    "error_burst": 1,       # consecutive 5xx responses per burst
+    "error_status": 503,
+    "stall_rate": 0.0,      # chance of accepting the request and never answering
+    "stall_seconds": 60.0,  # how long a stall holds the socket before closing it
+}
+
+_LATENCY_ARGS = {"fixed": 1, "uniform": 2, "lognormal": 2, "pareto": 2}
+_HTTP_STATUSES = frozenset(status.value for status in HTTPStatus)   # codes with a reason phrase
+
+
+def route_of(path):
+    """Route name for a tempestd API path, as used in fault rules."""
+    m = re.match(r"^/api/v1/stations/\d+/(\w+)$", path)
+    if m:
+        return m.group(1)
+    if re.match(r"^/api/v1/stations/\d+$", path):
+        return "station"
+    return path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def parse_latency(spec):
+    """Validate a latency spec; returns (kind, args). Raises ValueError."""
+    kind, _, rest = spec.partition(":")
+    if kind not in _LATENCY_ARGS:
+        raise ValueError(f"unknown latency distribution: {kind!r}")
+    try:
+        args = tuple(float(a) for a in rest.split(":")) if rest else ()
+    except ValueError:
+        raise ValueError(f"invalid latency spec: {spec!r}") from None
+    if len(args) != _LATENCY_ARGS[kind] or any(a < 0 for a in args):
+        raise ValueError(f"invalid latency spec: {spec!r}")
+    return kind, args
+
+
+def _validate(rules):
+    if not isinstance(rules, dict):
+        raise ValueError("fault rules must be an object keyed by route")
+    clean = {}
+    for route, rule in rules.items():
+        if not isinstance(rule, dict):
+            raise ValueError(f"rule for {route!r} must be an object")
+        unknown = set(rule) - set(FAULT_DEFAULTS)
+        if unknown:
+            raise ValueError(f"unknown fault keys for {route!r}: {', '.join(sorted(unknown))}")
+        for key, value in rule.items():
+            if key == "latency":
+                if value is not None:
+                    parse_latency(value)
+            elif not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{route}.{key} must be a non-negative number")
+            elif key.endswith("_rate") and value > 1:
+                raise ValueError(f"{route}.{key} must be between 0 and 1")
+            elif key == "error_status" and (value != int(value) or int(value) not in _HTTP_STATUSES):
+                raise ValueError(f"{route}.error_status must be an HTTP status code, not {value!r}")
+        clean[route] = dict(rule)
+    return clean
+
+
+class FaultInjector:
+    """Thread-safe fault rules plus counters of what was injected."""
+
+    def __init__(self, rules=None, seed=None):
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._bursts = {}
+        self._rules = {}
+        self.injected = {}
+        self.configure(rules or {})
+
+    def configure(self, rules):
+        """Replace all rules. Raises ValueError on a bad config."""
+        clean = _validate(rules)
+        with self._lock:
+            self._rules = clean
+            self._bursts = {}
+            self.injected = {"latency": 0, "drip": 0, "reset": 0, "error": 0, "stall": 0}
+
+    def snapshot(self):
+        with self._lock:
+            return {"rules": dict(self._rules), "injected": dict(self.injected)}
+
+    def rule_for(self, route):
+        """Effective rule for a route: defaults, then "*", then the route's own keys."""
+        with self._lock:
+            rule = dict(FAULT_DEFAULTS)
+            rule.update(self._rules.get("*", {}))
+            rule.update(self._rules.get(route, {}))
+            return rule
+
+    def _sample_latency(self, spec):
+        kind, args = parse_latency(spec)
+        rnd = self._random
+        if kind == "fixed":
+            return args[0]
+        if kind == "uniform":
+            return rnd.uniform(args[0], args[1])
+        if kind == "lognormal":
+            return args[0] * math.exp(rnd.gauss(0, args[1]))
+        return args[0] * rnd.paretovariate(args[1]) if args[1] > 0 else args[0]
+
+    def plan(self, route):
+        """Decide what happens to one request.
+
+        Returns a dict with "delay" (seconds), "drip_bps" and "action", one of
+        None, "reset", "stall" or "error" (with "status").
+        """
+        rule = self.rule_for(route)
+        with self._lock:
+            rnd = self._random
+            plan = {"delay": 0.0, "drip_bps": rule["drip_bps"], "action": None}
+            if rule["latency"]:
+                plan["delay"] = self._sample_latency(rule["latency"])
+                self.injected["latency"] += 1
+
+            remaining = self._bursts.get(route, 0)
+            if remaining:
+                self._bursts[route] = remaining - 1
+                plan["action"] = "error"
+            elif rule["reset_rate"] and rnd.random() < rule["reset_rate"]:
+                plan["action"] = "reset"
+            elif rule["stall_rate"] and rnd.random() < rule["stall_rate"]:
+                plan["action"] = "stall"
+            elif rule["error_rate"] and rnd.random() < rule["error_rate"]:
+                self._bursts[route] = max(0, int(rule["error_burst"]) - 1)
+                plan["action"] = "error"
+
+            if plan["action"]:
+                self.injected[plan["action"]] += 1
+                plan["status"] = int(rule["error_status"])
+                plan["stall_seconds"] = rule["stall_seconds"]
+            elif plan["drip_bps"]:
+                self.injected["drip"] += 1
+            return plan
@@ -1,19 +1,52 @@
 """Lightweight mock tempestd server for CI testing.
 
-Returns canned JSON responses for all endpoints the dashboard tests exercise.
-No database, no WebSocket — just static data shaped like real tempestd responses.
+Returns JSON shaped like real tempestd responses for all endpoints the
+dashboard tests exercise. /observations and /summary come from the seeded
+synthetic engine in tests/synthetic_weather.py, so any window, resolution
+and page is realistic and reproducible. /current stays a fixed reference
+reading so UI assertions are stable. No database, no WebSocket.
+
+Two server variants share one MockApp: a ThreadingHTTPServer (the default)
+and an asyncio server for load benchmarks. Both serve pre-serialized
+response bytes cached per (route, params) for cache_ttl seconds, so the
+mock can sustain thousands of requests per second as a stand-in upstream.
+
+Faults (latency distributions, slow-drip bodies, resets, 5xx bursts and
+stalls) are injected per route from tests/mock_faults.py. Change them at
+runtime with GET/PUT/DELETE /_mock/faults, or start the mock standalone:
+
+    python -m tests.mock_tempestd --port 8080 --latency lognormal:0.05:0.8 --error-rate 0.02
+    python -m tests.mock_tempestd --faults faults.json --server asyncio
 """
 
+import argparse
+import asyncio
 import json
 import re
+import select
+import socket
+import struct
 import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, parse_qsl
+
+from tests.mock_faults import FAULT_DEFAULTS, FaultInjector, route_of
+from tests.synthetic_weather import RESOLUTION_SECONDS, SyntheticWeather
 
 STATION_ID = 99999
 DEVICE_ID = 88888
 STATION_NAME = "Mock Station"
+DATA_OLDEST = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+CACHE_TTL = 1.0        # seconds a serialized response is reused
+CACHE_ENTRIES = 4096   # LRU cap on cached responses
+SERVER_KINDS = ("threaded", "asyncio")
+
+_LINGER_RESET = struct.pack("ii", 1, 0)   # SO_LINGER on, 0 s: close() sends RST
 
 
 def _now():
@@ -24,7 +57,21 @@ def _iso(dt):
     return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def _make_observation(timestamp, station_id=STATION_ID):
+def _parse_time(value, default):
+    """Parse an ISO 8601 query parameter (with Z or offset) to aware UTC."""
+    if not value:
+        return default
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _reference_observation(timestamp, station_id=STATION_ID):
+    """The fixed reading served by /current."""
     return {
         "timestamp": _iso(timestamp),
         "station_id": station_id,
@@ -47,170 +94,518 @@ def _make_observation(timestamp, station_id=STATION_ID):
     }
 
 
-class MockHandler(BaseHTTPRequestHandler):
+def _error(status, message):
+    return status, {"error": message, "code": status}
 
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
-        params = parse_qs(parsed.query)
 
+class MockApp:
+    """Routing, response cache and fault rules, shared by both server variants."""
+
+    def __init__(self, weather=None, station_ids=(STATION_ID,), rows=None, latency=0.0,
+                 pad_bytes=0, faults=None, cache_ttl=CACHE_TTL):
+        self.weather = weather or SyntheticWeather()
+        self.station_ids = tuple(station_ids)
+        self.rows = rows            # fixed /observations row count ending at `end`; None honours the window
+        self.latency = latency      # seconds of delay before every response
+        self.pad_bytes = pad_bytes  # extra bytes added to each observation
+        self.faults = faults or FaultInjector()
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # --- Cached GET -------------------------------------------------------
+
+    def get(self, target):
+        """(status, body bytes) for a GET request target, from cache when fresh."""
+        parsed = urlparse(target)
+        key = (parsed.path, tuple(sorted(parse_qsl(parsed.query, keep_blank_values=True))))
+        now = time.monotonic()
+        if self.cache_ttl > 0:
+            with self._cache_lock:
+                hit = self._cache.get(key)
+                if hit and hit[0] > now:
+                    self._cache.move_to_end(key)
+                    self.cache_hits += 1
+                    return hit[1], hit[2]
+                self.cache_misses += 1
+
+        status, data = self.route(parsed.path, parse_qs(parsed.query))
+        body = json.dumps(data).encode()
+        if self.cache_ttl > 0:
+            with self._cache_lock:
+                self._cache[key] = (now + self.cache_ttl, status, body)
+                self._cache.move_to_end(key)
+                while len(self._cache) > CACHE_ENTRIES:
+                    self._cache.popitem(last=False)
+        return status, body
+
+    def stats(self):
+        with self._cache_lock:
+            cache = {"hits": self.cache_hits, "misses": self.cache_misses, "entries": len(self._cache)}
+        return {"cache": cache, "faults": self.faults.snapshot()["injected"]}
+
+    # --- Admin ------------------------------------------------------------
+
+    def admin(self, method, path, body=b""):
+        """/_mock/faults (GET, PUT/POST to replace, DELETE to clear) and /_mock/stats."""
+        if path == "/_mock/stats" and method == "GET":
+            return 200, self.stats()
+        if path != "/_mock/faults":
+            return _error(404, "not found")
+        if method in ("PUT", "POST"):
+            try:
+                self.faults.configure(json.loads(body or b"{}"))
+            except ValueError as e:
+                return _error(400, str(e))
+        elif method == "DELETE":
+            self.faults.configure({})
+        elif method != "GET":
+            return _error(405, "method not allowed")
+        return 200, self.faults.snapshot()
+
+    # --- Routes -----------------------------------------------------------
+
+    def _station_name(self, sid):
+        index = self.station_ids.index(sid)
+        return STATION_NAME if index == 0 else f"{STATION_NAME} {index + 1}"
+
+    def route(self, path, params):
+        """(status, data) for a tempestd API path."""
         # GET /api/v1/health
         if path == "/api/v1/health":
-            self._json(200, {
+            return 200, {
                 "status": "healthy",
                 "version": "mock-1.0.0",
                 "uptime": "0m",
                 "stations": [{
-                    "station_id": STATION_ID,
-                    "name": STATION_NAME,
+                    "station_id": sid,
+                    "name": self._station_name(sid),
                     "websocket": "connected",
                     "last_observation": _iso(_now()),
                     "observation_age_seconds": 10.0,
-                    "data_range_oldest": "2025-01-01",
+                    "data_range_oldest": DATA_OLDEST.strftime("%Y-%m-%d"),
                     "data_range_newest": _now().strftime("%Y-%m-%d"),
-                }],
+                } for sid in self.station_ids],
                 "database": {
                     "driver": "sqlite",
                     "status": "ok",
                     "total_observations": 1000,
                 },
-            })
-            return
+            }
 
         # GET /api/v1/stations
         if path == "/api/v1/stations":
-            self._json(200, [{
-                "station_id": STATION_ID,
-                "device_id": DEVICE_ID,
-                "name": STATION_NAME,
+            return 200, [{
+                "station_id": sid,
+                "device_id": DEVICE_ID + i,
+                "name": self._station_name(sid),
                 "latitude": 37.7749,
                 "longitude": -122.4194,
                 "elevation": 10.0,
                 "status": "online",
                 "last_observation": _iso(_now()),
-            }])
-            return
+            } for i, sid in enumerate(self.station_ids)]
 
-        # GET /api/v1/stations/{id}
-        m = re.match(r"^/api/v1/stations/(\d+)$", path)
-        if m:
-            sid = int(m.group(1))
-            if sid != STATION_ID:
-                self._json(404, {"error": "station not found", "code": 404})
-                return
-            self._json(200, {
-                "station_id": STATION_ID,
-                "device_id": DEVICE_ID,
-                "name": STATION_NAME,
-                "latitude": 37.7749,
-                "longitude": -122.4194,
-                "elevation": 10.0,
-                "created_at": "2025-01-01T00:00:00Z",
-                "updated_at": _iso(_now()),
-            })
-            return
+        m = re.match(r"^/api/v1/stations/(\d+)(?:/(\w+))?$", path)
+        if not m:
+            return _error(404, "not found")
+        sid = int(m.group(1))
+        if sid not in self.station_ids:
+            return _error(404, "station not found")
+        handler = getattr(self, f"_route_{m.group(2) or 'station'}", None)
+        if handler is None:
+            return _error(404, "not found")
+        return handler(sid, params)
 
-        # GET /api/v1/stations/{id}/current
-        m = re.match(r"^/api/v1/stations/(\d+)/current$", path)
-        if m:
-            units = params.get("units", ["metric"])[0]
-            obs = _make_observation(_now())
-            obs["wind_direction_cardinal"] = "SW"
-            obs["units"] = units
-            if units == "imperial":
-                obs["air_temperature"] = 72.5
-                obs["feels_like"] = 71.8
-                obs["dew_point"] = 59.5
-                obs["wind_avg"] = 5.6
-                obs["wind_gust"] = 9.2
-                obs["wind_lull"] = 2.7
-                obs["station_pressure"] = 29.92
-                obs["rain_accumulation"] = 0.0
-            self._json(200, obs)
-            return
+    # GET /api/v1/stations/{id}
+    def _route_station(self, sid, params):
+        return 200, {
+            "station_id": sid,
+            "device_id": DEVICE_ID + self.station_ids.index(sid),
+            "name": self._station_name(sid),
+            "latitude": 37.7749,
+            "longitude": -122.4194,
+            "elevation": 10.0,
+            "created_at": _iso(DATA_OLDEST),
+            "updated_at": _iso(_now()),
+        }
 
-        # GET /api/v1/stations/{id}/observations
-        m = re.match(r"^/api/v1/stations/(\d+)/observations$", path)
-        if m:
-            units = params.get("units", ["metric"])[0]
-            resolution = params.get("resolution", ["1m"])[0]
+    # GET /api/v1/stations/{id}/current
+    def _route_current(self, sid, params):
+        units = params.get("units", ["metric"])[0]
+        obs = _reference_observation(_now(), sid)
+        obs["wind_direction_cardinal"] = "SW"
+        obs["units"] = units
+        if units == "imperial":
+            obs["air_temperature"] = 72.5
+            obs["feels_like"] = 71.8
+            obs["dew_point"] = 59.5
+            obs["wind_avg"] = 5.6
+            obs["wind_gust"] = 9.2
+            obs["wind_lull"] = 2.7
+            obs["station_pressure"] = 29.92
+            obs["rain_accumulation"] = 0.0
+        return 200, obs
+
+    # GET /api/v1/stations/{id}/observations
+    def _route_observations(self, sid, params):
+        units = params.get("units", ["metric"])[0]
+        resolution = params.get("resolution", ["1m"])[0]
+        try:
             limit = int(params.get("limit", ["1000"])[0])
             offset = int(params.get("offset", ["0"])[0])
+        except ValueError:
+            return _error(400, "invalid limit or offset")
+        now = _now()
+        end = _parse_time(params.get("end", [None])[0], now)
+        start = _parse_time(params.get("start", [None])[0], end and end - timedelta(hours=1))
+        if start is None or end is None or resolution not in RESOLUTION_SECONDS:
+            return _error(400, "invalid start, end or resolution")
 
-            # Generate 10 observations
-            now = _now()
-            all_obs = []
-            for i in range(10):
-                t = now - timedelta(minutes=i * 5)
-                all_obs.append(_make_observation(t))
-            all_obs.reverse()
-
-            total = len(all_obs)
-            page = all_obs[offset:offset + limit]
-
-            self._json(200, {
-                "station_id": STATION_ID,
-                "start": params.get("start", [_iso(now - timedelta(hours=1))])[0],
-                "end": params.get("end", [_iso(now)])[0],
-                "resolution": resolution,
-                "units": units,
-                "total": total,
-                "limit": limit,
-                "offset": offset,
-                "observations": page,
-            })
-            return
+        # No data from the future
+        end = min(end, now)
+        if self.rows is not None:
+            start = end - timedelta(seconds=RESOLUTION_SECONDS[resolution] * (self.rows - 1))
 
-        # GET /api/v1/stations/{id}/summary
-        m = re.match(r"^/api/v1/stations/(\d+)/summary$", path)
-        if m:
-            units = params.get("units", ["metric"])[0]
-            date = params.get("date", [_now().strftime("%Y-%m-%d")])[0]
-            self._json(200, {
-                "station_id": STATION_ID,
-                "date": date,
-                "units": units,
-                "temperature": {"high": 28.5, "low": 12.3, "avg": 20.4},
-                "humidity": {"high": 85.0, "low": 40.0, "avg": 62.5},
-                "wind": {"max": 12.5, "avg": 3.2},
-                "pressure": {"high": 1020.0, "low": 1010.0},
-                "rain_total": 2.5,
-                "uv_max": 8.0,
-                "solar_radiation_max": 1100.0,
-                "lightning_total": 0,
-                "observation_count": 1440,
-            })
-            return
+        total, rows = self.weather.series(
+            sid, start.timestamp(), end.timestamp(), resolution,
+            offset=offset, limit=limit, units=units,
+        )
+        page = list(rows)
+        if self.pad_bytes:
+            for obs in page:
+                obs["padding"] = "x" * self.pad_bytes
+
+        return 200, {
+            "station_id": sid,
+            "start": params.get("start", [_iso(start)])[0],
+            "end": params.get("end", [_iso(end)])[0],
+            "resolution": resolution,
+            "units": units,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "observations": page,
+        }
+
+    # GET /api/v1/stations/{id}/summary
+    def _route_summary(self, sid, params):
+        units = params.get("units", ["metric"])[0]
+        date = params.get("date", [_now().strftime("%Y-%m-%d")])[0]
+        try:
+            day = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return _error(400, "invalid date")
+        summary = {"station_id": sid, "date": date, "units": units}
+        summary.update(self.weather.daily_summary(sid, day.timestamp(), units))
+        return 200, summary
+
+    # GET /api/v1/stations/{id}/range
+    def _route_range(self, sid, params):
+        now = _now()
+        return 200, {
+            "station_id": sid,
+            "oldest": _iso(DATA_OLDEST),
+            "newest": _iso(now),
+            "total_observations": int((now - DATA_OLDEST).total_seconds() // 60),
+        }
 
-        # GET /api/v1/stations/{id}/range
-        m = re.match(r"^/api/v1/stations/(\d+)/range$", path)
-        if m:
-            self._json(200, {
-                "station_id": STATION_ID,
-                "oldest": "2025-01-01T00:00:00Z",
-                "newest": _iso(_now()),
-                "total_observations": 1000,
-            })
+
+# --- Threaded server ------------------------------------------------------
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes on keep-alive
+    app = MockApp()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/_mock/"):
+            self._send(*self._admin_json("GET", path))
             return
 
-        self._json(404, {"error": "not found", "code": 404})
+        plan = self.app.faults.plan(route_of(path))
+        delay = self.app.latency + plan["delay"]
+        if delay:
+            time.sleep(delay)
+        if plan["action"] == "reset":
+            self._reset()
+        elif plan["action"] == "stall":
+            self._stall(plan["stall_seconds"])
+        elif plan["action"] == "error":
+            status, data = _error(plan["status"], "injected fault")
+            self._send(status, json.dumps(data).encode())
+        else:
+            self._send(*self.app.get(self.path), drip_bps=plan["drip_bps"])
 
-    def _json(self, status, data):
-        body = json.dumps(data).encode()
+    def _admin(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self._send(*self._admin_json(self.command, urlparse(self.path).path, body))
+
+    do_PUT = do_POST = do_DELETE = _admin
+
+    def _admin_json(self, method, path, body=b""):
+        status, data = self.app.admin(method, path, body)
+        return status, json.dumps(data).encode()
+
+    def _send(self, status, body, drip_bps=0):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(body)
+        if drip_bps:
+            self._drip(body, drip_bps)
+        else:
+            self.wfile.write(body)
+
+    def _drip(self, body, drip_bps):
+        """Write the body at drip_bps bytes per second, in ~100 ms slices."""
+        step = max(1, int(drip_bps / 10))
+        try:
+            for i in range(0, len(body), step):
+                chunk = body[i:i + step]
+                time.sleep(len(chunk) / drip_bps)
+                self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _reset(self):
+        """Abort the connection with a TCP RST instead of responding."""
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+        self.connection.close()
+        self.close_connection = True
+
+    def _stall(self, seconds):
+        """Hold the socket without answering until the client gives up or time runs out."""
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.connection], [], [], min(remaining, 0.2))
+            if readable:
+                try:
+                    if self.connection.recv(1, socket.MSG_PEEK) == b"":
+                        break
+                except OSError:
+                    break
+                time.sleep(min(remaining, 0.2))
+        self.close_connection = True
 
     def log_message(self, format, *args):
         pass  # silence logs in CI
 
 
-def start_mock_server(port=0):
-    """Start the mock server on a random port. Returns (server, port)."""
-    server = HTTPServer(("127.0.0.1", port), MockHandler)
+# --- asyncio server -------------------------------------------------------
+
+class AsyncMockServer:
+    """asyncio HTTP/1.1 mock with the same serve_forever/shutdown surface as HTTPServer."""
+
+    def __init__(self, app, host="127.0.0.1", port=0):
+        self.app = app
+        self.socket = socket.create_server((host, port), backlog=1024)
+        self.server_address = self.socket.getsockname()[:2]
+        self._loop = asyncio.new_event_loop()
+        self._stopped = threading.Event()
+
+    def serve_forever(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._client, sock=self.socket)
+        )
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()
+            self._stopped.set()
+
+    def shutdown(self):
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._stopped.wait(5)
+
+    def server_close(self):
+        self.socket.close()
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                parts = line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = header.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                if not await self._respond(method, target, body, reader, writer, keep_alive):
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # server shutting down
+        finally:
+            writer.close()
+
+    async def _respond(self, method, target, body, reader, writer, keep_alive):
+        """Send one response; False when the connection must not be reused."""
+        path = urlparse(target).path
+        if path.startswith("/_mock/"):
+            status, data = self.app.admin(method, path, body)
+            await self._send(writer, status, json.dumps(data).encode(), keep_alive)
+            return True
+        if method != "GET":
+            status, data = _error(501, "unsupported method")
+            await self._send(writer, status, json.dumps(data).encode(), keep_alive)
+            return True
+
+        plan = self.app.faults.plan(route_of(path))
+        delay = self.app.latency + plan["delay"]
+        if delay:
+            await asyncio.sleep(delay)
+        if plan["action"] == "reset":
+            writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            writer.transport.abort()
+            return False
+        if plan["action"] == "stall":
+            try:
+                await asyncio.wait_for(reader.read(), plan["stall_seconds"])
+            except asyncio.TimeoutError:
+                pass
+            return False
+        if plan["action"] == "error":
+            status, data = _error(plan["status"], "injected fault")
+            await self._send(writer, status, json.dumps(data).encode(), keep_alive)
+            return True
+        status, payload = self.app.get(target)
+        await self._send(writer, status, payload, keep_alive, plan["drip_bps"])
+        return True
+
+    async def _send(self, writer, status, body, keep_alive, drip_bps=0):
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode()
+        if not drip_bps:
+            writer.write(head + body)
+            await writer.drain()
+            return
+        writer.write(head)
+        step = max(1, int(drip_bps / 10))
+        for i in range(0, len(body), step):
+            chunk = body[i:i + step]
+            await asyncio.sleep(len(chunk) / drip_bps)
+            writer.write(chunk)
+            await writer.drain()
+
+
+def make_mock_server(host="127.0.0.1", port=0, rows=None, latency=0.0, pad_bytes=0,
+                     stations=1, seed=42, faults=None, fault_seed=None,
+                     server="threaded", cache_ttl=CACHE_TTL):
+    """Build a mock server without starting it.
+
+    rows fixes the /observations row count (ending at `end`) regardless of
+    the window; latency delays every response and pad_bytes grows each
+    observation, for load benchmarks. stations and seed control the
+    synthetic data. faults is a rules dict for tests/mock_faults.py.
+    server is "threaded" or "asyncio"; cache_ttl=0 disables the response cache.
+    """
+    if server not in SERVER_KINDS:
+        raise ValueError(f"server must be one of {', '.join(SERVER_KINDS)}")
+    app = MockApp(
+        weather=SyntheticWeather(seed=seed),
+        station_ids=tuple(STATION_ID + i for i in range(stations)),
+        rows=rows,
+        latency=latency,
+        pad_bytes=pad_bytes,
+        faults=FaultInjector(faults, seed=fault_seed),
+        cache_ttl=cache_ttl,
+    )
+    if server == "asyncio":
+        return AsyncMockServer(app, host, port)
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"app": app})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    httpd.app = app
+    return httpd
+
+
+def start_mock_server(port=0, **kwargs):
+    """Start the mock server on a random port. Returns (server, port).
+
+    Keyword arguments are passed to make_mock_server().
+    """
+    server = make_mock_server(port=port, **kwargs)
     actual_port = server.server_address[1]
     thread = threading.Thread(target=server.serve_forever, daemon=True)
     thread.start()
     return server, actual_port
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock tempestd with synthetic data and fault injection")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to serve on (default: 8080)")
+    parser.add_argument("--server", choices=SERVER_KINDS, default="threaded",
+                        help="Server variant (default: threaded)")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL,
+                        help=f"Seconds to reuse a serialized response; 0 disables (default: {CACHE_TTL})")
+    parser.add_argument("--stations", type=int, default=1, help="Number of mock stations")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic weather seed")
+    parser.add_argument("--rows", type=int, default=None, help="Fixed observations per /observations response")
+    parser.add_argument("--pad-bytes", type=int, default=0, help="Extra bytes per observation")
+    parser.add_argument("--faults", help="JSON file of per-route fault rules")
+    parser.add_argument("--fault-seed", type=int, default=None, help="Seed for fault sampling")
+    group = parser.add_argument_group("faults for every route (override the \"*\" rule)")
+    group.add_argument("--latency", help="Latency spec, e.g. fixed:0.1, uniform:0.05:0.5, lognormal:0.05:0.8")
+    for key in ("drip_bps", "reset_rate", "error_rate", "error_burst", "error_status",
+                "stall_rate", "stall_seconds"):
+        kind = float if isinstance(FAULT_DEFAULTS[key], float) else int
+        group.add_argument("--" + key.replace("_", "-"), type=kind, dest=key)
+    args = parser.parse_args()
+
+    rules = {}
+    if args.faults:
+        with open(args.faults) as f:
+            rules = json.load(f)
+    overrides = {key: getattr(args, key) for key in FAULT_DEFAULTS if getattr(args, key) is not None}
+    if overrides:
+        rules.setdefault("*", {}).update(overrides)
+
+    try:
+        server = make_mock_server(
+            host=args.host, port=args.port, rows=args.rows, pad_bytes=args.pad_bytes,
+            stations=args.stations, seed=args.seed, faults=rules, fault_seed=args.fault_seed,
+            server=args.server, cache_ttl=args.cache_ttl,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Mock tempestd: http://{args.host}:{args.port} ({args.server})")
+    print(f"Faults:        {json.dumps(rules) if rules else 'none'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
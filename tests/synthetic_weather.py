@@ -0,0 +1,207 @@
+"""Deterministic synthetic weather for the mock tempestd server.
+
+Every value is a closed-form function of (seed, station, timestamp), so any
+bucket of any window can be computed on its own: pages honour limit/offset
+without generating the rows before them, and a multi-year 1m window is just
+a lazy generator. Series follow a plausible day: solar radiation and UV track
+the sun's elevation, temperature peaks mid-afternoon, humidity moves against
+temperature, and rain arrives in occasional cloudy spells.
+"""
+
+import math
+from datetime import datetime, timezone
+
+RESOLUTION_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "30m": 1800,
+    "1h": 3600,
+    "3h": 10800,
+    "1d": 86400,
+}
+
+_MASK64 = (1 << 64) - 1
+
+# Noise channels, one independent stream per quantity
+_TEMP, _TEMP_FAST, _HUMIDITY, _PRESSURE, _PRESSURE_FAST = 1, 2, 3, 4, 5
+_WIND, _GUST, _DIRECTION, _CLOUD, _RAIN = 6, 7, 8, 9, 10
+
+
+def _mix(*parts):
+    """splitmix64 over the parts; uniform float in [0, 1)."""
+    x = 0x9E3779B97F4A7C15
+    for part in parts:
+        x = (x ^ (part & _MASK64)) & _MASK64
+        x = (x + 0x9E3779B97F4A7C15) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        x ^= x >> 31
+    return x / float(1 << 64)
+
+
+def _noise(seed, channel, ts, period):
+    """Smooth value noise in [-1, 1] with features about `period` seconds wide."""
+    pos = ts / period
+    i = math.floor(pos)
+    frac = pos - i
+    a = _mix(seed, channel, i) * 2 - 1
+    b = _mix(seed, channel, i + 1) * 2 - 1
+    w = (1 - math.cos(frac * math.pi)) / 2
+    return a + (b - a) * w
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _feels_like(temp_c, humidity, wind_ms):
+    if temp_c >= 27 and humidity >= 40:
+        # Rothfusz heat index (computed in F)
+        t = temp_c * 9 / 5 + 32
+        hi = (-42.379 + 2.04901523 * t + 10.14333127 * humidity
+              - 0.22475541 * t * humidity - 6.83783e-3 * t * t
+              - 5.481717e-2 * humidity * humidity + 1.22874e-3 * t * t * humidity
+              + 8.5282e-4 * t * humidity * humidity - 1.99e-6 * t * t * humidity * humidity)
+        return (hi - 32) * 5 / 9
+    if temp_c <= 10 and wind_ms > 1.34:
+        v = (wind_ms * 3.6) ** 0.16
+        return 13.12 + 0.6215 * temp_c - 11.37 * v + 0.3965 * temp_c * v
+    return temp_c
+
+
+def _dew_point(temp_c, humidity):
+    gamma = math.log(max(humidity, 1.0) / 100) + 17.62 * temp_c / (243.12 + temp_c)
+    return 243.12 * gamma / (17.62 - gamma)
+
+
+def to_imperial(obs):
+    """Convert a metric observation in place, as tempestd does for units=imperial."""
+    for field in ("air_temperature", "feels_like", "dew_point"):
+        obs[field] = round(obs[field] * 9 / 5 + 32, 2)
+    for field in ("wind_avg", "wind_gust", "wind_lull"):
+        obs[field] = round(obs[field] * 2.236936, 2)
+    obs["station_pressure"] = round(obs["station_pressure"] * 0.02953, 2)
+    obs["rain_accumulation"] = round(obs["rain_accumulation"] / 25.4, 3)
+    obs["lightning_avg_distance"] = round(obs["lightning_avg_distance"] * 0.621371, 1)
+    return obs
+
+
+class SyntheticWeather:
+    """Seeded weather generator for one or more stations."""
+
+    def __init__(self, seed=42, latitude=37.7749, longitude=-122.4194):
+        self.seed = seed
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def _station_seed(self, station_id):
+        return int(_mix(self.seed, station_id) * (1 << 62))
+
+    def _sun(self, ts, station_id):
+        """Sine of solar elevation at the station."""
+        lat = math.radians(self.latitude + (station_id % 7) * 0.5)
+        day = (ts / 86400.0) % 365.25
+        decl = math.radians(23.44) * math.sin(2 * math.pi * (day - 80) / 365.25)
+        solar_hours = (ts / 3600.0 + self.longitude / 15.0) % 24
+        hour_angle = math.radians(15 * (solar_hours - 12))
+        return (math.sin(lat) * math.sin(decl)
+                + math.cos(lat) * math.cos(decl) * math.cos(hour_angle))
+
+    def observation(self, station_id, ts, bucket_seconds=60):
+        """Metric observation for the bucket starting at `ts` (epoch seconds)."""
+        seed = self._station_seed(station_id)
+        day = (ts / 86400.0) % 365.25
+        solar_hours = (ts / 3600.0 + self.longitude / 15.0) % 24
+
+        cloud = 0.5 + 0.5 * _noise(seed, _CLOUD, ts, 8 * 3600)          # 0 clear .. 1 overcast
+        sun = max(0.0, self._sun(ts, station_id))
+        solar = 1100 * sun ** 1.2 * (1 - 0.75 * cloud)
+        uv = min(13.0, solar / 90)
+
+        seasonal = 14 + 7 * math.sin(2 * math.pi * (day - 110) / 365.25)
+        diurnal = (7 - 4 * cloud) * math.sin(2 * math.pi * (solar_hours - 9) / 24)
+        temp = (seasonal + diurnal + 3 * _noise(seed, _TEMP, ts, 2 * 86400)
+                + 0.6 * _noise(seed, _TEMP_FAST, ts, 3600))
+
+        humidity = 65 - 2.5 * diurnal + 20 * cloud - 10 + 8 * _noise(seed, _HUMIDITY, ts, 6 * 3600)
+        humidity = min(100.0, max(8.0, humidity))
+
+        pressure = (1013 + 9 * _noise(seed, _PRESSURE, ts, 3 * 86400)
+                    + 1.5 * _noise(seed, _PRESSURE_FAST, ts, 6 * 3600) - 4 * cloud)
+
+        afternoon = max(0.0, math.sin(2 * math.pi * (solar_hours - 10) / 24))
+        wind = max(0.0, 2.5 + 2 * _noise(seed, _WIND, ts, 3 * 3600) + 2 * afternoon + 2 * cloud)
+        gust = wind * (1.4 + 0.3 * (_noise(seed, _GUST, ts, 600) + 1) / 2)
+        lull = wind * 0.5
+        direction = (240 + 100 * _noise(seed, _DIRECTION, ts, 12 * 3600)) % 360
+
+        rain_signal = _noise(seed, _RAIN, ts, 2 * 3600)
+        rate = (rain_signal - 0.45) * 25 if cloud > 0.65 and rain_signal > 0.45 else 0.0   # mm/h
+        rain = rate * bucket_seconds / 3600
+        strikes = int((rate - 8) * bucket_seconds / 600) if rate > 8 else 0
+
+        return {
+            "timestamp": _iso(ts),
+            "station_id": station_id,
+            "wind_lull": round(lull, 2),
+            "wind_avg": round(wind, 2),
+            "wind_gust": round(gust, 2),
+            "wind_direction": round(direction, 1),
+            "station_pressure": round(pressure, 2),
+            "air_temperature": round(temp, 2),
+            "relative_humidity": round(humidity, 1),
+            "uv_index": round(uv, 1),
+            "solar_radiation": round(solar, 1),
+            "rain_accumulation": round(rain, 3),
+            "precipitation_type": 1 if rain > 0 else 0,
+            "lightning_avg_distance": round(8 + 20 * _mix(seed, _RAIN, int(ts)), 1) if strikes else 0.0,
+            "lightning_strike_count": strikes,
+            "battery": 2.6,
+            "feels_like": round(_feels_like(temp, humidity, wind), 2),
+            "dew_point": round(_dew_point(temp, humidity), 2),
+        }
+
+    def bucket_range(self, start_ts, end_ts, resolution):
+        """(first bucket start, bucket seconds, bucket count) for [start, end]."""
+        step = RESOLUTION_SECONDS.get(resolution, 60)
+        first = math.ceil(start_ts / step) * step
+        if end_ts < first:
+            return first, step, 0
+        return first, step, int((end_ts - first) // step) + 1
+
+    def series(self, station_id, start_ts, end_ts, resolution="1m",
+               offset=0, limit=None, units="metric"):
+        """(total, rows) for the window; rows is a lazy generator over the page."""
+        first, step, total = self.bucket_range(start_ts, end_ts, resolution)
+        stop = total if limit is None else min(total, offset + limit)
+
+        def rows():
+            for i in range(offset, stop):
+                obs = self.observation(station_id, first + i * step, step)
+                yield to_imperial(obs) if units == "imperial" else obs
+
+        return total, rows()
+
+    def daily_summary(self, station_id, day_start_ts, units="metric"):
+        """Summary for the UTC day starting at day_start_ts, from 30m buckets."""
+        _, rows = self.series(station_id, day_start_ts, day_start_ts + 86400 - 1, "30m", units=units)
+        rows = list(rows)
+        temps = [r["air_temperature"] for r in rows]
+        hums = [r["relative_humidity"] for r in rows]
+        winds = [r["wind_avg"] for r in rows]
+        press = [r["station_pressure"] for r in rows]
+        return {
+            "temperature": {
+                "high": max(temps), "low": min(temps), "avg": round(sum(temps) / len(temps), 2),
+            },
+            "humidity": {
+                "high": max(hums), "low": min(hums), "avg": round(sum(hums) / len(hums), 1),
+            },
+            "wind": {"max": max(r["wind_gust"] for r in rows), "avg": round(sum(winds) / len(winds), 2)},
+            "pressure": {"high": max(press), "low": min(press)},
+            "rain_total": round(sum(r["rain_accumulation"] for r in rows), 3),
+            "uv_max": max(r["uv_index"] for r in rows),
+            "solar_radiation_max": max(r["solar_radiation"] for r in rows),
+            "lightning_total": sum(r["lightning_strike_count"] for r in rows),
+            "observation_count": 1440,
+        }
@@ -1,12 +1,23 @@
 """Integration tests: verify the proxy returns correct data from tempestd."""
 
 import json
+import os
+import re
+import signal
+import socket
+import threading
+import time
+import urllib.error
 import urllib.request
 import urllib.parse
 from datetime import datetime, timedelta, timezone
+from http.server import HTTPServer, BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
+from tests.conftest import free_port
+from tests.mock_tempestd import start_mock_server
+
 
 def fetch_json(url):
     resp = urllib.request.urlopen(url, timeout=15)
@@ -167,3 +178,500 @@ class TestObservationRange:
     def test_total_is_positive(self, dashboard_server, station_id):
         data = fetch_json(f"{dashboard_server}/api/v1/stations/{station_id}/range")
         assert data["total_observations"] > 0
+
+
+class TestClientDisconnect:
+    """An aborted browser request must release the upstream connection."""
+
+    @pytest.fixture()
+    def stalled_backend(self):
+        """A backend that never answers and records when the proxy hangs up."""
+        closed = threading.Event()
+
+        class StalledHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.connection.settimeout(10)
+                try:
+                    if self.connection.recv(1) == b"":
+                        closed.set()
+                except OSError:
+                    closed.set()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), StalledHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}", closed
+        server.shutdown()
+
+    def test_upstream_closed_on_client_abort(self, stalled_backend, dev_server_factory):
+        backend, closed = stalled_backend
+        base = dev_server_factory(backend)
+        port = urllib.parse.urlsplit(base).port
+        client = socket.create_connection(("localhost", port))
+        client.sendall(b"GET /api/v1/health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        client.close()
+        assert closed.wait(5), "Proxy kept the upstream request open after the client left"
+
+    def test_other_requests_served_while_one_stalls(self, stalled_backend, dev_server_factory):
+        backend, _ = stalled_backend
+        base = dev_server_factory(backend)
+        port = urllib.parse.urlsplit(base).port
+        client = socket.create_connection(("localhost", port))
+        try:
+            client.sendall(b"GET /api/v1/health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            resp = urllib.request.urlopen(f"{base}/index.html", timeout=5)
+            assert resp.status == 200
+        finally:
+            client.close()
+
+
+class TestMetrics:
+    """/metrics and /_stats expose proxy counters and upstream latency."""
+
+    @pytest.fixture()
+    def proxy(self, backend_url, dev_server_factory):
+        return dev_server_factory(backend_url)
+
+    def test_prometheus_counts_requests(self, proxy):
+        station_id = fetch_json(f"{proxy}/api/v1/stations")[0]["station_id"]
+        fetch_json(f"{proxy}/api/v1/stations/{station_id}/current")
+        text = urllib.request.urlopen(f"{proxy}/metrics", timeout=5).read().decode()
+        worker = f'worker="{fetch_json(f"{proxy}/_stats")["worker"]}"'
+        assert f'tempest_proxy_requests_total{{{worker},route="current",method="GET",status="200"}} 1' in text
+        assert f'tempest_proxy_upstream_latency_seconds_bucket{{{worker},route="current",le="+Inf"}} 1' in text
+        assert f'tempest_proxy_upstream_latency_seconds_count{{{worker},route="current"}} 1' in text
+        assert "# TYPE tempest_proxy_in_flight_requests gauge" in text
+
+    def test_stats_json(self, proxy):
+        fetch_json(f"{proxy}/api/v1/health")
+        stats = fetch_json(f"{proxy}/_stats")
+        assert stats["requests"]["health"]["by_status"] == {"200": 1}
+        assert stats["upstream_latency"]["health"]["count"] == 1
+        assert stats["bytes"]["upstream"] > 0
+        assert stats["in_flight"] == 1  # the /_stats request itself
+
+    def test_revalidation_counts_as_cache_hit(self, proxy):
+        urllib.request.urlopen(f"{proxy}/index.html", timeout=5).read()
+        req = urllib.request.Request(
+            f"{proxy}/index.html", headers={"If-Modified-Since": "Wed, 01 Jan 2031 00:00:00 GMT"}
+        )
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(req, timeout=5)
+        assert err.value.code == 304
+        cache = fetch_json(f"{proxy}/_stats")["cache"]["browser"]
+        assert cache["hits"] == 1
+        assert cache["misses"] >= 1  # includes the startup readiness probe
+        assert cache["hit_ratio"] == round(1 / (1 + cache["misses"]), 4)
+
+    def test_upstream_errors_counted(self, dev_server_factory):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            dead = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        proxy = dev_server_factory(dead)
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{proxy}/api/v1/health", timeout=5)
+        assert fetch_json(f"{proxy}/_stats")["errors"] == {"health": {"upstream_refused": 1}}
+
+
+class TestPerfBeacon:
+    """/_perf collects js/perf.js beacons from the dashboards a worker serves."""
+
+    BEACON = {
+        "client": "kiosk1",
+        "ts": "2025-06-01T00:00:00Z",
+        "spans": {"updateCharts": {"count": 10, "last": 12.0, "mean": 11.0, "p50": 10.5, "p95": 30.0, "max": 41.0}},
+        "longTasks": {"count": 3, "totalMs": 210.0},
+    }
+
+    def _post(self, base, body):
+        req = urllib.request.Request(
+            f"{base}/_perf", data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        return urllib.request.urlopen(req, timeout=5)
+
+    def test_beacon_aggregated(self, backend_url, dev_server_factory):
+        proxy = dev_server_factory(backend_url)
+        assert self._post(proxy, json.dumps(self.BEACON).encode()).status == 204
+        other = dict(self.BEACON, client="kiosk2")
+        other["spans"] = {"updateCharts": dict(self.BEACON["spans"]["updateCharts"], p95=80.0)}
+        self._post(proxy, json.dumps(other).encode())
+        perf = fetch_json(f"{proxy}/_perf")
+        assert perf["worker"] == dev_server_factory.processes[proxy].pid
+        summary = perf["summary"]
+        assert summary["clients"] == 2
+        assert summary["long_tasks"] == 6
+        assert summary["spans"]["updateCharts"]["worst_p95_ms"] == 80.0
+        assert fetch_json(f"{proxy}/_stats")["client_perf"]["clients"] == 2
+
+    def test_invalid_beacon_rejected(self, backend_url, dev_server_factory):
+        proxy = dev_server_factory(backend_url)
+        with pytest.raises(urllib.error.HTTPError) as err:
+            self._post(proxy, b'{"spans": 1}')
+        assert err.value.code == 400
+
+    def test_oversized_beacon_rejected(self, backend_url, dev_server_factory):
+        proxy = dev_server_factory(backend_url)
+        with pytest.raises(urllib.error.HTTPError) as err:
+            self._post(proxy, b"x" * (65 * 1024))
+        assert err.value.code == 413
+
+
+class TestAccessLog:
+    """The proxy writes a structured, sampled JSON-lines access log."""
+
+    def _read_log(self, path, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if path.exists():
+                lines = path.read_text().splitlines()
+                if len(lines) >= count:
+                    return [json.loads(line) for line in lines]
+            time.sleep(0.05)
+        pytest.fail(f"Access log did not reach {count} lines")
+
+    def test_proxied_request_has_timing_breakdown(self, backend_url, dev_server_factory, tmp_path):
+        log = tmp_path / "access.jsonl"
+        proxy = dev_server_factory(backend_url, "--access-log", str(log))
+        fetch_json(f"{proxy}/api/v1/health")
+        entry = [e for e in self._read_log(log, 2) if e["route"] == "health"][0]
+        assert entry["method"] == "GET"
+        assert entry["status"] == 200
+        assert entry["bytes"] > 0
+        assert set(entry["upstream"]) == {"connect_ms", "ttfb_ms", "transfer_ms"}
+
+    def test_sampling_keeps_errors(self, dev_server_factory, tmp_path):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            dead = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        log = tmp_path / "access.jsonl"
+        proxy = dev_server_factory(dead, "--access-log", str(log), "--log-sample", "0")
+        for _ in range(3):
+            urllib.request.urlopen(f"{proxy}/index.html", timeout=5).read()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{proxy}/api/v1/health", timeout=5)
+        time.sleep(0.2)  # let the writer thread drain
+        entries = self._read_log(log, 1)
+        assert [(e["status"], e["error"]) for e in entries] == [(502, "upstream_refused")]
+
+    def test_rotation(self, backend_url, dev_server_factory, tmp_path):
+        log = tmp_path / "access.jsonl"
+        proxy = dev_server_factory(
+            backend_url, "--access-log", str(log), "--log-max-bytes", "1000", "--log-backups", "2"
+        )
+        for _ in range(30):
+            urllib.request.urlopen(f"{proxy}/index.html", timeout=5).read()
+        deadline = time.monotonic() + 5
+        while not (tmp_path / "access.jsonl.1").exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert (tmp_path / "access.jsonl.1").exists()
+        assert not (tmp_path / "access.jsonl.3").exists()
+
+
+class TestMultipleBackends:
+    """Several --backend replicas: balancing, failover, stale skipping and hedging."""
+
+    @pytest.fixture()
+    def replicas(self):
+        """Start mock tempestd replicas; returns a factory of backend URLs."""
+        servers = []
+
+        def start(**kwargs):
+            server, port = start_mock_server(**kwargs)
+            servers.append(server)
+            return f"http://127.0.0.1:{port}"
+
+        yield start
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    @pytest.fixture()
+    def stale_replica(self):
+        """A replica that answers but whose newest observation is a day old."""
+
+        class StaleHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/api/v1/health":
+                    data = {"status": "healthy", "stations": [{"observation_age_seconds": 86400.0}]}
+                else:
+                    data = {"replica": "stale"}
+                body = json.dumps(data).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StaleHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def _backends(self, proxy):
+        return {b["url"]: b for b in fetch_json(f"{proxy}/_stats")["backends"]}
+
+    def _wait_for_state(self, proxy, url, state, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._backends(proxy)[url]["state"] == state:
+                return
+            time.sleep(0.05)
+        pytest.fail(f"{url} never became {state}")
+
+    def test_round_robin_spreads_requests(self, replicas, dev_server_factory):
+        a, b = replicas(), replicas()
+        proxy = dev_server_factory(a, "--backend", b)
+        for _ in range(10):
+            fetch_json(f"{proxy}/api/v1/stations")
+        backends = self._backends(proxy)
+        assert backends[a]["requests"] == 5
+        assert backends[b]["requests"] == 5
+        metrics = urllib.request.urlopen(f"{proxy}/metrics", timeout=5).read().decode()
+        worker = dev_server_factory.processes[proxy].pid
+        assert f'tempest_proxy_backend_up{{worker="{worker}",backend="{a}"}} 1' in metrics
+
+    def test_fails_over_and_ejects_dead_replica(self, replicas, dev_server_factory):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            dead = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        live = replicas()
+        proxy = dev_server_factory(dead, "--backend", live)
+        for _ in range(6):
+            assert fetch_json(f"{proxy}/api/v1/health")["status"] == "healthy"
+        backends = self._backends(proxy)
+        assert backends[dead]["state"] in ("ejected", "unhealthy")
+        # At most the first request tries it (unless the first health check got there first)
+        assert backends[dead]["requests"] <= 1
+        assert backends[live]["requests"] == 6
+
+    def test_skips_stale_replica(self, replicas, stale_replica, dev_server_factory):
+        live = replicas()
+        proxy = dev_server_factory(stale_replica, "--backend", live, "--health-interval", "0.1")
+        self._wait_for_state(proxy, stale_replica, "stale")
+        for _ in range(6):
+            assert "replica" not in fetch_json(f"{proxy}/api/v1/stations")[0]
+        assert self._backends(proxy)[stale_replica]["requests"] == 0
+
+    def test_hedging_cuts_slow_replica(self, replicas, dev_server_factory):
+        slow, fast = replicas(latency=2.0), replicas()
+        proxy = dev_server_factory(slow, "--backend", fast, "--hedge-after", "50")
+        for _ in range(4):
+            started = time.monotonic()
+            fetch_json(f"{proxy}/api/v1/stations")
+            assert time.monotonic() - started < 1.0
+        backends = self._backends(proxy)
+        assert backends[fast]["hedges_won"] >= 1
+
+
+DRAIN_WAIT = 12  # serve.py DRAIN_SECONDS plus slack
+
+
+class TestWorkers:
+    """--processes pre-forks workers on one port; --cache-ttl shares responses between them."""
+
+    def _worker(self, proxy):
+        return fetch_json(f"{proxy}/_stats")["worker"]
+
+    def test_connections_spread_across_workers(self, backend_url, dev_server_factory):
+        proxy = dev_server_factory(backend_url, "--processes", "2")
+        assert len({self._worker(proxy) for _ in range(30)}) == 2
+
+    def test_metrics_labelled_by_worker(self, backend_url, dev_server_factory):
+        proxy = dev_server_factory(backend_url, "--processes", "2")
+        text = urllib.request.urlopen(f"{proxy}/metrics", timeout=5).read().decode()
+        samples = [line for line in text.splitlines() if line and not line.startswith("#")]
+        workers = {re.match(r'\w+\{worker="(\d+)"[,}]', line).group(1) for line in samples}
+        assert len(workers) == 1
+
+    def test_shared_cache_serves_repeat_requests(self, backend_url, dev_server_factory):
+        proxy = dev_server_factory(backend_url, "--processes", "2", "--cache-ttl", "30")
+        first = urllib.request.urlopen(f"{proxy}/api/v1/stations", timeout=5)
+        body = first.read()
+        assert first.headers.get("X-Cache") is None
+        time.sleep(0.1)  # the miss is stored just after its body is sent
+        for _ in range(10):
+            resp = urllib.request.urlopen(f"{proxy}/api/v1/stations", timeout=5)
+            assert resp.headers.get("X-Cache") == "HIT"
+            assert resp.read() == body
+
+    def test_sighup_replaces_workers_without_errors(self, backend_url, dev_server_factory):
+        proxy = dev_server_factory(backend_url, "--processes", "2")
+        before = {self._worker(proxy) for _ in range(20)}
+        os.kill(dev_server_factory.processes[proxy].pid, signal.SIGHUP)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            seen = {self._worker(proxy) for _ in range(10)}  # fetch_json asserts every 200
+            if not seen & before:
+                break
+        else:
+            pytest.fail("old workers still serving after SIGHUP")
+        deadline = time.monotonic() + DRAIN_WAIT
+        while before and time.monotonic() < deadline:
+            for pid in list(before):
+                try:
+                    os.kill(pid, 0)
+                except OSError:
+                    before.discard(pid)  # exited and reaped by the supervisor
+            time.sleep(0.1)
+        assert not before, "old workers did not exit"
+
+
+class TestDailySummaries:
+    """Finished days' /summary responses are fetched once; /_summaries batches a run of days."""
+
+    @pytest.fixture()
+    def proxy(self, backend_url, dev_server_factory):
+        return dev_server_factory(backend_url)
+
+    @pytest.fixture()
+    def station_id(self, proxy):
+        return fetch_json(f"{proxy}/api/v1/stations")[0]["station_id"]
+
+    def _day(self, days_ago):
+        return (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+    def _fetched(self, proxy):
+        return fetch_json(f"{proxy}/_stats")["summaries"]["fetched"]
+
+    def test_past_day_is_immutable(self, proxy, station_id):
+        url = f"{proxy}/api/v1/stations/{station_id}/summary?date={self._day(10)}"
+        first = urllib.request.urlopen(url, timeout=5)
+        assert first.headers["X-Cache"] == "MISS"
+        assert "immutable" in first.headers["Cache-Control"]
+        second = urllib.request.urlopen(url, timeout=5)
+        assert second.headers["X-Cache"] == "HIT"
+        assert json.loads(second.read()) == json.loads(first.read())
+        assert self._fetched(proxy) == 1
+
+    def test_today_is_proxied(self, proxy, station_id):
+        url = f"{proxy}/api/v1/stations/{station_id}/summary?date={self._day(0)}"
+        for _ in range(2):
+            resp = urllib.request.urlopen(url, timeout=5)
+            assert resp.headers.get("X-Cache") is None
+            assert "immutable" not in (resp.headers.get("Cache-Control") or "")
+        assert self._fetched(proxy) == 0
+
+    def test_summary_outside_a_station_is_proxied(self, proxy):
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{proxy}/api/v1/summary?date={self._day(10)}", timeout=5)
+        assert err.value.code == 404   # tempestd's answer, not a dropped connection
+        assert err.value.headers.get("X-Cache") is None
+        assert self._fetched(proxy) == 0
+
+    def test_batch_fetches_each_finished_day_once(self, proxy, station_id):
+        query = f"station={station_id}&start={self._day(39)}&end={self._day(10)}"
+        data = fetch_json(f"{proxy}/_summaries?{query}")
+        assert [s["date"] for s in data["summaries"]] == [self._day(d) for d in range(39, 9, -1)]
+        assert data["failed"] == []
+        assert self._fetched(proxy) == 30
+
+        fetch_json(f"{proxy}/_summaries?{query}")
+        assert self._fetched(proxy) == 30
+
+        # Yesterday and today may still change, so they are fetched every time
+        recent = f"station={station_id}&start={self._day(10)}&end={self._day(0)}"
+        for _ in range(2):
+            assert len(fetch_json(f"{proxy}/_summaries?{recent}")["summaries"]) == 11
+        assert self._fetched(proxy) == 30 + 8 + 2 * 2
+
+    @pytest.mark.parametrize("query", ["station=1&start=2025-01-01", "station=x&start=2025-01-01&end=2025-01-02",
+                                       "station=1&start=2025-01-01&end=2030-01-01"])
+    def test_batch_rejects_bad_queries(self, proxy, query):
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{proxy}/_summaries?{query}", timeout=5)
+        assert err.value.code == 400
+
+
+class TestExport:
+    """/_export streams a range as CSV or NDJSON, walking tempestd's pages."""
+
+    @pytest.fixture()
+    def proxy(self, backend_url, dev_server_factory):
+        return dev_server_factory(backend_url)
+
+    @pytest.fixture()
+    def station_id(self, proxy):
+        return fetch_json(f"{proxy}/api/v1/stations")[0]["station_id"]
+
+    def _range(self, hours):
+        end = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(days=2)
+        start = end - timedelta(hours=hours)
+        return start.strftime("%Y-%m-%dT%H:%M:%SZ"), end.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _total(self, proxy, station_id, start, end):
+        query = urllib.parse.urlencode({"start": start, "end": end, "resolution": "1m", "limit": 1})
+        return fetch_json(f"{proxy}/api/v1/stations/{station_id}/observations?{query}")["total"]
+
+    def test_csv_spans_several_pages(self, proxy, station_id):
+        start, end = self._range(30)   # more minutes than one upstream page holds
+        query = urllib.parse.urlencode({"station": station_id, "start": start, "end": end})
+        resp = urllib.request.urlopen(f"{proxy}/_export?{query}", timeout=30)
+        assert resp.headers["Transfer-Encoding"] == "chunked"
+        assert resp.headers["Content-Type"].startswith("text/csv")
+        assert "attachment" in resp.headers["Content-Disposition"]
+        header, *rows = resp.read().decode().splitlines()
+        columns = header.split(",")
+        assert columns[0] == "timestamp" and "air_temperature" in columns
+        total = self._total(proxy, station_id, start, end)
+        assert total > 1440 and len(rows) == total
+        stamps = [row.split(",", 1)[0] for row in rows]
+        assert stamps == sorted(set(stamps))
+
+    def test_ndjson(self, proxy, station_id):
+        start, end = self._range(2)
+        query = urllib.parse.urlencode({"station": station_id, "start": start, "end": end,
+                                        "format": "ndjson", "units": "imperial"})
+        resp = urllib.request.urlopen(f"{proxy}/_export?{query}", timeout=15)
+        assert resp.headers["Content-Type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in resp.read().decode().splitlines()]
+        query = urllib.parse.urlencode({"start": start, "end": end, "units": "imperial"})
+        page = fetch_json(f"{proxy}/api/v1/stations/{station_id}/observations?{query}")
+        assert lines == page["observations"]
+
+    @pytest.mark.parametrize("query", ["", "station=1&start=2025-01-02T00:00:00Z&end=2025-01-01T00:00:00Z",
+                                       "station=1&start=2025-01-01T00:00:00Z&end=2025-01-02T00:00:00Z&format=xml",
+                                       "station=1&start=2025-01-01T00:00:00Z&end=2025-01-02T00:00:00Z&resolution=2m"])
+    def test_rejects_bad_queries(self, proxy, query):
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{proxy}/_export?{query}", timeout=5)
+        assert err.value.code == 400
+
+    def test_malformed_page_is_bad_gateway(self, dev_server_factory):
+        class ListHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = b"[]"   # an array where an observations page belongs
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ListHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            proxy = dev_server_factory(f"http://127.0.0.1:{server.server_address[1]}")
+            start, end = self._range(1)
+            with pytest.raises(urllib.error.HTTPError) as err:
+                urllib.request.urlopen(f"{proxy}/_export?station=1&start={start}&end={end}", timeout=15)
+            assert err.value.code == 502
+            errors = fetch_json(f"{proxy}/_stats")["errors"]
+            assert any("export" in key for key in errors)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_unreachable_backend(self, dev_server_factory):
+        proxy = dev_server_factory(f"http://127.0.0.1:{free_port()}")
+        start, end = self._range(1)
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{proxy}/_export?station=1&start={start}&end={end}", timeout=15)
+        assert err.value.code == 502
@@ -0,0 +1,163 @@
+"""Local observation archive: scripts/archive.py and serve.py --archive."""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from tests.conftest import REPO_ROOT
+from tests.mock_tempestd import STATION_ID, start_mock_server
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+import archive  # noqa: E402
+
+STATION = 1001
+BASE = 1_700_006_400   # a UTC midnight, well in the past
+
+
+def minute(i, **fields):
+    obs = {"timestamp": archive.iso(BASE + 60 * i), "station_id": STATION,
+           "air_temperature": 10.0 + i, "wind_direction": 350 if i % 2 else 10,
+           "wind_gust": float(i), "wind_lull": float(i), "rain_accumulation": 0.1,
+           "lightning_strike_count": 1}
+    obs.update(fields)
+    return obs
+
+
+def observations_path(start, end, resolution="1m", station=STATION, **params):
+    query = urllib.parse.urlencode({"start": archive.iso(start), "end": archive.iso(end),
+                                    "resolution": resolution, **params})
+    return f"/api/v1/stations/{station}/observations?{query}"
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return archive.Archive(str(tmp_path / "archive.db"))
+
+
+class TestArchive:
+    def test_ingest_dedupes(self, store):
+        assert store.ingest(STATION, [minute(i) for i in range(10)]) == 10
+        assert store.ingest(STATION, [minute(i) for i in range(5, 15)]) == 5
+        total, rows = store.query(STATION, BASE, BASE + 3600, "1m")
+        assert total == 15
+        assert [r["air_temperature"] for r in rows[:3]] == [10.0, 11.0, 12.0]
+
+    def test_rollups_aggregate_per_field(self, store):
+        store.ingest(STATION, [minute(i) for i in range(5)])
+        store.ingest(STATION, [minute(i) for i in range(5, 10)])   # second batch, same 30m bucket
+        total, (obs,) = store.query(STATION, BASE, BASE + 1800, "30m")
+        assert total == 1
+        assert obs["timestamp"] == archive.iso(BASE)
+        assert obs["air_temperature"] == 14.5           # mean
+        assert obs["rain_accumulation"] == 1.0          # sum
+        assert obs["lightning_strike_count"] == 10
+        assert obs["wind_gust"] == 9.0 and obs["wind_lull"] == 0.0
+        assert obs["wind_direction"] in (0.0, 360.0)    # vector mean of 350 and 10
+
+    def test_rollups_skip_missing_readings(self, store):
+        rows = [minute(i) for i in range(4)]
+        rows += [minute(i, air_temperature=None, wind_lull=None, wind_direction=None) for i in range(4, 8)]
+        store.ingest(STATION, rows[:6])
+        store.ingest(STATION, rows[6:])
+        _, (obs,) = store.query(STATION, BASE, BASE + 1800, "30m")
+        assert obs["air_temperature"] == 11.5           # minutes 0-3 only
+        assert obs["wind_lull"] == 0.0 and obs["wind_gust"] == 7.0
+        assert obs["station_pressure"] is None          # never reported
+        store.ingest(STATION, [minute(i, air_temperature=None, wind_lull=None, wind_direction=None,
+                                      rain_accumulation=None) for i in range(30, 35)])
+        _, (_, empty) = store.query(STATION, BASE, BASE + 3600, "30m")
+        assert empty["air_temperature"] is None and empty["wind_lull"] is None
+        assert empty["wind_direction"] is None and empty["rain_accumulation"] is None
+        assert empty["wind_gust"] == 34.0
+
+    def test_old_rollups_rebuilt_from_raw_rows(self, tmp_path):
+        path = str(tmp_path / "archive.db")
+        archive.Archive(path).ingest(STATION, [minute(i, air_temperature=None) for i in range(5)]
+                                     + [minute(i) for i in range(5, 10)])
+        db = sqlite3.connect(path)
+        db.execute("PRAGMA user_version = 1")
+        for name in archive.ROLLUPS:   # the schema before per-field counts
+            db.execute(f"DROP TABLE rollup_{name}")
+            db.execute(f"CREATE TABLE rollup_{name} (station_id INTEGER, bucket INTEGER, n INTEGER)")
+        db.commit()
+        db.close()
+        _, (obs,) = archive.Archive(path).query(STATION, BASE, BASE + 1800, "30m")
+        assert obs["air_temperature"] == 17.0           # mean of minutes 5-9
+
+    def test_coverage_merges_and_skips_recent_minutes(self, store):
+        store.ingest(STATION, [], (BASE, BASE + 3600))
+        store.ingest(STATION, [], (BASE + 3600, BASE + 7200))
+        assert store.coverage(STATION) == [(BASE, BASE + 7200)]
+        now = int(time.time())
+        store.ingest(STATION, [], (now - 3600, now))
+        assert store.coverage(STATION)[-1][1] <= now - archive.SETTLE_SECONDS
+
+    def test_answer_only_when_covered(self, store):
+        store.ingest(STATION, [minute(i) for i in range(30, 120)])
+        path = observations_path(BASE, BASE + 7140, "1h")
+        assert store.answer(path) is None, "the first half hour was never fetched"
+        store.ingest(STATION, [], (BASE, BASE + 7200))
+        envelope = store.answer(path)
+        assert envelope["resolution"] == "1h" and envelope["units"] == "metric"
+        assert envelope["total"] == 2
+        assert [o["timestamp"] for o in envelope["observations"]] == [
+            archive.iso(BASE), archive.iso(BASE + 3600)]
+        assert store.answer(observations_path(BASE, BASE + 7140, "1h", units="imperial")) is None
+        assert store.answer(observations_path(BASE - 3600, BASE + 7140, "1h")) is None
+
+    def test_answer_pages(self, store):
+        store.ingest(STATION, [minute(i) for i in range(120)], (BASE, BASE + 7200))
+        envelope = store.answer(observations_path(BASE, BASE + 7140, limit=50, offset=100))
+        assert envelope["total"] == 120
+        assert len(envelope["observations"]) == 20
+
+    def test_ingest_response_needs_whole_answer_for_coverage(self, store):
+        path = observations_path(BASE, BASE + 600)
+        page = {"total": 11, "offset": 0, "observations": [minute(i) for i in range(5)]}
+        store.ingest_response(path, json.dumps(page))
+        assert store.coverage(STATION) == [(BASE, BASE + 240)]
+        page = {"total": 11, "offset": 0, "observations": [minute(i) for i in range(11)]}
+        store.ingest_response(path, json.dumps(page))
+        assert store.coverage(STATION) == [(BASE, BASE + 600)]
+        assert store.ingest_response(observations_path(BASE, BASE + 600, "5m"), json.dumps(page)) == 0
+
+
+class TestArchiveProxy:
+    def test_long_range_answered_from_archive(self, dev_server_factory, tmp_path):
+        server, port = start_mock_server()
+        try:
+            url = dev_server_factory(f"http://127.0.0.1:{port}",
+                                     "--archive", str(tmp_path / "archive.db"), "--archive-days", "1")
+            deadline = time.time() + 60
+            coverage = []
+            while time.time() < deadline:
+                with urllib.request.urlopen(f"{url}/_stats", timeout=5) as resp:
+                    coverage = json.load(resp).get("archive", {}).get("coverage", {}).get(str(STATION_ID))
+                if coverage and archive.parse_time(coverage[0][0]) <= time.time() - 86400 + 120:
+                    break
+                time.sleep(0.5)
+            assert coverage, "backfill never completed"
+
+            now = int(time.time()) // 3600 * 3600
+            path = observations_path(now - 18 * 3600, now - 2 * 3600, "1h", STATION_ID)
+            with urllib.request.urlopen(url + path, timeout=5) as resp:
+                assert resp.headers["X-Archive"] == "HIT"
+                local = json.load(resp)
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as resp:
+                upstream = json.load(resp)
+            assert local["total"] == upstream["total"] == 17
+            assert ([o["timestamp"] for o in local["observations"]]
+                    == [o["timestamp"] for o in upstream["observations"]])
+
+            # The newest minutes are still tempestd's to answer
+            recent = observations_path(time.time() - 600, time.time(), station=STATION_ID)
+            with urllib.request.urlopen(url + recent, timeout=5) as resp:
+                assert resp.headers["X-Archive"] is None
+        finally:
+            server.shutdown()
@@ -0,0 +1,59 @@
+"""Smoke tests for the proxy load benchmark harness."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from tests.bench_proxy import compare, percentile, run_benchmark, tile_paths
+
+
+@pytest.fixture(scope="module")
+def report():
+    return run_benchmark(clients=3, duration=2.0, poll_interval=0.5, rows=50, pad_bytes=64)
+
+
+class TestBenchmarkRun:
+    """A short run against the mock produces a complete report."""
+
+    def test_no_errors(self, report):
+        assert report["requests"] > 0
+        assert report["errors"] == 0
+
+    def test_latency_percentiles(self, report):
+        lat = report["latency_ms"]
+        assert 0 < lat["p50"] <= lat["p95"] <= lat["p99"] <= lat["max"]
+
+    def test_follows_dashboard_poll_pattern(self, report):
+        routes = report["by_route"]
+        assert "stations/{id}/current" in routes
+        assert "stations/{id}/observations" in routes
+        # Every dashboard bootstraps once, then polls current at least once more
+        assert routes["stations/{id}/current"]["requests"] > 3
+
+    def test_reports_proxy_rss(self, report):
+        assert "peak" in report["proxy_rss_kb"]
+
+    def test_records_config(self, report):
+        assert report["config"]["clients"] == 3
+        assert report["config"]["rows"] == 50
+
+
+class TestBenchmarkHelpers:
+    """Percentiles, tile paths and baseline comparison."""
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+
+    def test_live_tile_only_when_polling(self):
+        now = datetime.now(timezone.utc)
+        assert len(tile_paths(99999, now, live_only=True)) == 1
+        assert len(tile_paths(99999, now)) >= 3
+
+    def test_compare_flags_regression(self):
+        baseline = {"throughput_rps": 100.0, "latency_ms": {"p95": 10.0}}
+        current = {"throughput_rps": 70.0, "latency_ms": {"p95": 10.5}}
+        regressions = compare(current, baseline, tolerance=0.2)
+        assert [r["metric"] for r in regressions] == ["throughput_rps"]
@@ -0,0 +1,67 @@
+"""Smoke tests for the render benchmark harness."""
+
+import json
+
+import pytest
+
+from tests.bench_proxy import compare
+from tests.bench_render import frame_stats, regression_metrics, run_benchmark
+
+
+@pytest.fixture(scope="module")
+def report(browser):
+    return run_benchmark(points=(2000, 5000), repeat=1, zoom_steps=3, browser=browser)
+
+
+class TestRenderBenchmarkRun:
+    """A short run against the mock produces a complete report."""
+
+    def test_first_chart_measured(self, report):
+        assert 0 < report["first_chart_ms"] < 30000
+
+    def test_one_entry_per_window_size(self, report):
+        assert set(report["updates"]) == {"2000", "5000"}
+        for entry in report["updates"].values():
+            assert entry["update_ms"] > 0
+            assert entry["painted_ms"] >= entry["update_ms"]
+            assert entry["heap_mb"] > 0
+
+    def test_zoom_frames_recorded(self, report):
+        zoom = report["zoom"]
+        assert zoom["points"] == 5000
+        assert zoom["frames"] > 0 and zoom["fps"] > 0
+
+    def test_records_config(self, report):
+        assert report["config"]["points"] == [2000, 5000]
+        assert report["environment"]["browser"]
+
+
+class TestRenderBenchmarkHelpers:
+    """Frame statistics and baseline comparison."""
+
+    def test_frame_stats_from_trace(self):
+        trace = {"traceEvents": [
+            {"name": "DrawFrame", "ts": 0},
+            {"name": "DrawFrame", "ts": 16000},
+            {"name": "DrawFrame", "ts": 66000},
+            {"name": "DroppedFrame", "ts": 40000},
+            {"name": "Paint", "ts": 1000},
+        ]}
+        stats = frame_stats(json.dumps(trace).encode(), 0.5)
+        assert stats["frames"] == 3 and stats["dropped_frames"] == 1
+        assert stats["fps"] == 6.0
+        assert stats["worst_frame_ms"] == 50.0
+        assert stats["source"] == "trace"
+
+    def test_frame_stats_falls_back_to_raf(self):
+        stats = frame_stats(b'{"traceEvents": []}', 1.0, [0.0, 16.7, 33.4, 100.0])
+        assert stats["source"] == "raf"
+        assert stats["frames"] == 4 and stats["worst_frame_ms"] == 66.6
+
+    def test_compare_covers_each_window_size(self):
+        baseline = {"first_chart_ms": 800.0, "zoom": {"fps": 50.0},
+                    "updates": {"10000": {"update_ms": 20.0}, "100000": {"update_ms": 200.0}}}
+        current = {"first_chart_ms": 820.0, "zoom": {"fps": 30.0},
+                   "updates": {"10000": {"update_ms": 21.0}, "100000": {"update_ms": 320.0}}}
+        regressions = compare(current, baseline, 0.3, regression_metrics(current))
+        assert sorted(r["metric"] for r in regressions) == ["updates.100000.update_ms", "zoom.fps"]
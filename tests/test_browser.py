@@ -105,11 +105,64 @@ class TestCurrentConditions:
         expect(box.locator(".stat-value")).to_contain_text("800")
 
 
+# --- Stat Box Patching ---
+
+
+class TestStatBoxPatching:
+    """Refreshes patch existing stat box nodes instead of rebuilding them."""
+
+    SNAPSHOT = """() => {
+        window.__statNodes = [...document.querySelectorAll('#stats-grid .stat-box')]
+            .map(box => [box, box.querySelector('.stat-value').firstChild]);
+    }"""
+
+    UNCHANGED = """() => {
+        const nodes = [...document.querySelectorAll('#stats-grid .stat-box')];
+        return nodes.length === window.__statNodes.length && nodes.every((box, i) =>
+            box === window.__statNodes[i][0]
+            && box.querySelector('.stat-value').firstChild === window.__statNodes[i][1]);
+    }"""
+
+    NEXT_FRAME = "() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))"
+
+    # Hide the tab (it withdraws from polling), then show it again: becoming
+    # visible refreshes at once. Deleting the overrides restores the real getters.
+    SET_HIDDEN = """(hidden) => {
+        Object.defineProperty(document, 'hidden', { configurable: true, get: () => hidden });
+        Object.defineProperty(document, 'visibilityState', {
+            configurable: true, get: () => (hidden ? 'hidden' : 'visible'),
+        });
+        document.dispatchEvent(new Event('visibilitychange'));
+    }"""
+    RESTORE_VISIBILITY = "() => { delete document.hidden; delete document.visibilityState; }"
+
+    def test_nodes_survive_refresh(self, bootstrapped_page):
+        page = bootstrapped_page
+        page.evaluate(self.SNAPSHOT)
+        page.evaluate(self.SET_HIDDEN, True)
+        try:
+            with page.expect_response(lambda r: "/current" in r.url, timeout=5000):
+                page.evaluate(self.SET_HIDDEN, False)
+        finally:
+            page.evaluate(self.RESTORE_VISIBILITY)
+        page.evaluate(self.NEXT_FRAME)
+        assert page.evaluate(self.UNCHANGED), "Stat boxes were rebuilt on refresh"
+
+    def test_nodes_survive_unit_toggle(self, bootstrapped_page):
+        page = bootstrapped_page
+        page.evaluate(self.SNAPSHOT)
+        page.click("#unit-imperial")
+        expect(_stat_box(page, "Temperature").locator(".stat-value")).to_contain_text("72.5")
+        page.click("#unit-metric")
+        expect(_stat_box(page, "Temperature").locator(".stat-value")).to_contain_text("22.5")
+        assert page.evaluate(self.UNCHANGED), "Stat boxes were rebuilt on unit toggle"
+
+
 # --- Unit Toggle ---
 
 
 class TestUnitToggle:
-    """Switching units re-fetches data and updates display."""
+    """Switching units converts cached metric data and updates display."""
 
     def test_metric_active_by_default(self, bootstrapped_page):
         expect(bootstrapped_page.locator("#unit-metric")).to_have_class(
@@ -121,12 +174,34 @@ class TestUnitToggle:
 
     def test_click_imperial_shows_fahrenheit(self, bootstrapped_page):
         page = bootstrapped_page
-        with page.expect_request(
-            lambda r: "/current" in r.url and "units=imperial" in r.url
-        ):
-            page.click("#unit-imperial")
+        requests = []
+
+        def record(request):
+            if "/current" in request.url:
+                requests.append(request.url)
+
+        page.on("request", record)
+        page.click("#unit-imperial")
         box = _stat_box(page, "Temperature")
         expect(box.locator(".stat-value")).to_contain_text("72.5")
+        page.remove_listener("request", record)
+        assert requests == [], "Unit toggle should convert client-side, not refetch"
+
+    def test_imperial_pressure_and_wind(self, bootstrapped_page):
+        expect(_stat_box(bootstrapped_page, "Pressure").locator(".stat-value")).to_contain_text("29.92")
+        expect(_stat_box(bootstrapped_page, "Wind").locator(".stat-value")).to_contain_text("5.6")
+
+    def test_imperial_converts_chart_data(self, bootstrapped_page):
+        page = bootstrapped_page
+        last_temp = """() => {
+            const data = Chart.getChart(document.getElementById('chart-temperature')).data.datasets[0].data;
+            return data[data.length - 1].y;
+        }"""
+        page.click("#unit-metric")
+        metric = page.evaluate(last_temp)
+        page.click("#unit-imperial")
+        imperial = page.evaluate(last_temp)
+        assert abs(imperial - (metric * 9 / 5 + 32)) < 0.01
 
     def test_imperial_button_active(self, bootstrapped_page):
         expect(bootstrapped_page.locator("#unit-imperial")).to_have_class(
@@ -174,6 +249,19 @@ class TestTimeRangePresets:
             re.compile(r"\bactive\b")
         )
 
+    def test_same_preset_refreshes(self, bootstrapped_page):
+        """Clicking the active preset again slides its window and refetches, once."""
+        page = bootstrapped_page
+        page.evaluate("""async () => {
+            const { state } = await import('/js/state.js');
+            window.__selections = 0;
+            state.on('timeSelection', () => { window.__selections++; });
+        }""")
+        page.click(".time-presets button[data-range='24h']")
+        page.wait_for_function("window.__selections === 1", timeout=5000)
+        page.wait_for_timeout(300)
+        assert page.evaluate("window.__selections") == 1
+
 
 # --- Custom Date Range ---
 
@@ -232,6 +320,59 @@ class TestChartRendering:
         )
         assert has_data
 
+    def test_offscreen_chart_waits_for_scroll(self, bootstrapped_page):
+        page = bootstrapped_page
+        title = "Chart.getChart(document.getElementById('chart-rain')).options.scales.y.title.text"
+        page.set_viewport_size({"width": 400, "height": 600})
+        try:
+            page.evaluate("window.scrollTo(0, 0)")
+            page.wait_for_timeout(200)  # let the observer report
+            page.click("#unit-imperial")
+            assert page.evaluate(title) == "mm", "off-screen chart should not redraw yet"
+            page.locator("#chart-rain").scroll_into_view_if_needed()
+            page.wait_for_function(f"() => {title} === 'in'", timeout=5000)
+        finally:
+            page.click("#unit-metric")
+            page.set_viewport_size({"width": 1280, "height": 720})
+
+
+# --- Zoom Sync ---
+
+
+CHART_IDS = [
+    "chart-temperature",
+    "chart-humidity",
+    "chart-wind",
+    "chart-pressure",
+    "chart-rain",
+    "chart-solar",
+]
+
+
+class TestZoomSync:
+    """Zooming one chart keeps every chart's x-axis in step."""
+
+    def test_wheel_zoom_syncs_all_charts(self, bootstrapped_page):
+        page = bootstrapped_page
+        box = page.locator("#chart-temperature").bounding_box()
+        page.mouse.move(box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
+        page.keyboard.down("Control")
+        page.mouse.wheel(0, -300)
+        page.keyboard.up("Control")
+        page.wait_for_function(
+            """(ids) => {
+            const scales = ids.map(id => Chart.getChart(document.getElementById(id)).scales.x);
+            return Chart.getChart(document.getElementById(ids[0])).isZoomedOrPanned()
+                && scales.every(s => s.min === scales[0].min && s.max === scales[0].max);
+        }""",
+            arg=CHART_IDS,
+            timeout=5000,
+        )
+        page.evaluate(
+            "(ids) => ids.forEach(id => Chart.getChart(document.getElementById(id)).resetZoom())",
+            CHART_IDS,
+        )
+
 
 # --- Footer ---
 
@@ -248,6 +389,91 @@ class TestFooter:
         text = bootstrapped_page.locator("#refresh-countdown").text_content()
         assert re.search(r"\d+", text)
 
+    def test_countdown_targets_next_report(self, bootstrapped_page):
+        # The mock's current observation is stamped "now": the next report is
+        # due in a minute, plus ingest grace and at most 10% jitter
+        seconds = int(re.search(r"\d+", bootstrapped_page.locator("#refresh-countdown").text_content()).group())
+        assert 0 < seconds <= 72
+
+
+# --- Export ---
+
+
+class TestExport:
+    """Export links appear with the dev proxy and download the selected range."""
+
+    def test_links_visible(self, bootstrapped_page):
+        expect(bootstrapped_page.locator("#time-export")).to_be_visible()
+
+    def test_csv_download(self, bootstrapped_page):
+        page = bootstrapped_page
+        with page.expect_download() as info:
+            page.click("#time-export a[data-format='csv']")
+        download = info.value
+        assert "/_export?" in download.url and "format=csv" in download.url
+        assert download.suggested_filename.endswith(".csv")
+
+
+# --- Summary Calendar ---
+
+
+class TestSummaryCalendar:
+    """A year of daily summaries as a heatmap."""
+
+    def test_one_cell_per_day(self, bootstrapped_page):
+        expect(bootstrapped_page.locator("#calendar-grid .calendar-day")).to_have_count(365)
+
+    def test_days_are_colored(self, bootstrapped_page):
+        expect(bootstrapped_page.locator("#calendar-grid .calendar-day[data-level]")).to_have_count(
+            365, timeout=15000
+        )
+        title = bootstrapped_page.locator("#calendar-grid .calendar-day").first.get_attribute("title")
+        assert re.search(r"high -?\d+\.\d\u00B0C", title)
+
+    def test_rain_toggle(self, bootstrapped_page):
+        bootstrapped_page.click('#calendar-metric button[data-metric="rain"]')
+        expect(bootstrapped_page.locator("#calendar-grid")).to_have_attribute("data-metric", "rain")
+        bootstrapped_page.click('#calendar-metric button[data-metric="temperature"]')
+        expect(bootstrapped_page.locator("#calendar-grid")).to_have_attribute("data-metric", "temperature")
+
+
+# --- Leader Election ---
+
+
+class TestLeaderElection:
+    """One tab per browser holds the polling lock; another takes over when it closes."""
+
+    LOCKS = """async () => {
+        const { held, pending } = await navigator.locks.query();
+        const mine = (list) => list.filter((l) => l.name === 'tempest-dashboard-poller').length;
+        return { held: mine(held), pending: mine(pending) };
+    }"""
+
+    @pytest.fixture()
+    def two_tabs(self, browser, dashboard_server):
+        context = browser.new_context(service_workers="block", bypass_csp=True)
+        pages = []
+        for _ in range(2):
+            page = context.new_page()
+            page.goto(dashboard_server)
+            page.wait_for_function(
+                "document.querySelector('#status-text')?.textContent === 'Connected'",
+                timeout=10000,
+            )
+            pages.append(page)
+        yield pages
+        context.close()
+
+    def test_one_leader_one_follower(self, two_tabs):
+        first, second = two_tabs
+        second.wait_for_function(f"({self.LOCKS})().then((l) => l.held === 1 && l.pending === 1)")
+
+    def test_follower_takes_over(self, two_tabs):
+        first, second = two_tabs
+        second.wait_for_function(f"({self.LOCKS})().then((l) => l.pending === 1)")
+        first.close()
+        second.wait_for_function(f"({self.LOCKS})().then((l) => l.held === 1 && l.pending === 0)")
+
 
 # --- Plugin Sections ---
 
@@ -296,3 +522,36 @@ class TestConfigBannerFlow:
         expect(page.locator("#config-banner")).not_to_have_class(
             re.compile(r"\bvisible\b")
         )
+
+
+# --- Perf Overlay ---
+
+
+class TestPerfOverlay:
+    """?perf=1 records spans and shows the overlay."""
+
+    @pytest.fixture()
+    def perf_page(self, browser, dashboard_server):
+        context = browser.new_context(service_workers="block", bypass_csp=True)
+        page = context.new_page()
+        page.goto(f"{dashboard_server}/?perf=1")
+        page.wait_for_selector(".stat-box", timeout=10000)
+        yield page
+        context.close()
+
+    def test_overlay_lists_spans(self, perf_page):
+        overlay = perf_page.locator("#perf-overlay")
+        expect(overlay).to_be_visible()
+        expect(overlay).to_contain_text("fetchJSON", timeout=5000)
+        expect(overlay).to_contain_text("updateCharts", timeout=5000)
+
+    def test_measures_recorded(self, perf_page):
+        perf_page.wait_for_function(
+            "performance.getEntriesByName('tempest:renderCurrentConditions', 'measure').length > 0",
+            timeout=5000,
+        )
+        assert perf_page.evaluate("performance.getEntriesByName('tempest:fetchJSON', 'measure').length") > 0
+
+    def test_off_by_default(self, bootstrapped_page):
+        expect(bootstrapped_page.locator("#perf-overlay")).to_have_count(0)
+
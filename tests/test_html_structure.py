@@ -139,6 +139,29 @@ class TestCDNScripts:
         assert any("chartjs-plugin-zoom" in s for s in srcs)
 
 
+class TestModulePreload:
+    """modulepreload hints must list exactly the static import graph of js/app.js."""
+
+    IMPORT = re.compile(r"""^\s*(?:import|export)\b[^'"]*?from\s+['"]\./([\w.-]+\.js)['"]""", re.M)
+
+    def _graph(self, entry):
+        seen, todo = set(), [entry]
+        while todo:
+            name = todo.pop()
+            with open(os.path.join(REPO_ROOT, "js", name)) as f:
+                for dep in self.IMPORT.findall(f.read()):
+                    if dep not in seen:
+                        seen.add(dep)
+                        todo.append(dep)
+        return seen
+
+    def test_hints_match_import_graph(self, parsed):
+        hinted = {
+            link["href"].split("/")[-1] for link in parsed.links if link.get("rel") == "modulepreload"
+        }
+        assert hinted == self._graph("app.js") - {"app.js"}
+
+
 class TestCSP:
     """Content Security Policy meta tag must be present."""
 
@@ -6,8 +6,11 @@ rather than running a browser. This catches regressions in configuration
 values and ensures consistency with the tempestd API contract.
 """
 
+import json
 import os
 import re
+import shutil
+import subprocess
 
 import pytest
 
@@ -20,6 +23,21 @@ def read_js(filename):
         return f.read()
 
 
+def run_js(filename, body):
+    """Run body under node with the module imported as `m`; returns its JSON-decoded result.
+
+    The module is loaded from a data: URL, so it must not import other modules.
+    """
+    program = (
+        "const m = await import('data:text/javascript,' + encodeURIComponent("
+        + json.dumps(read_js(filename)) + "));\n"
+        + f"console.log(JSON.stringify((() => {{ {body} }})()));"
+    )
+    out = subprocess.run(["node", "--input-type=module", "-e", program],
+                         capture_output=True, text=True, check=True, timeout=30)
+    return json.loads(out.stdout)
+
+
 class TestConfigResolution:
     """Resolution auto-selection must match the documented mapping."""
 
@@ -63,6 +81,27 @@ class TestConfigResolution:
         assert final.group(1) == "3h"
 
 
+class TestCoarseResolution:
+    """Long ranges must have a coarser first-paint tier than getResolution()."""
+
+    def _coarse_tiers(self):
+        source = read_js("config.js")
+        body = re.search(r"function getCoarseResolution\(hours\) \{(.*?)\n\}", source, re.S)
+        assert body is not None, "getCoarseResolution() not found"
+        return {int(h): r for h, r in re.findall(r"if \(hours > (\d+)\) return '(\w+)'", body.group(1))}
+
+    def test_beyond_7d_uses_3h(self):
+        assert self._coarse_tiers()[168] == "3h"
+
+    def test_beyond_30d_uses_1d(self):
+        assert self._coarse_tiers()[720] == "1d"
+
+    def test_resolution_minutes_cover_tiers(self):
+        source = read_js("config.js")
+        for res in ["1m", "5m", "30m", "1h", "3h", "1d"]:
+            assert re.search(rf"'{res}':\s*\d+", source), f"Missing RESOLUTION_MINUTES entry: {res}"
+
+
 class TestTimeRangePresets:
     """TIME_RANGES must define all expected presets with correct hours."""
 
@@ -115,6 +154,237 @@ class TestAPIEndpoints:
         assert re.search(pattern, source), f"Missing endpoint pattern: {pattern}"
 
 
+class TestTilesModule:
+    """tiles.js must cache aligned tiles and reuse them across ranges."""
+
+    def test_uses_get_observations(self):
+        source = read_js("tiles.js")
+        assert "getObservations(" in source
+
+    def test_tiles_are_epoch_aligned(self):
+        source = read_js("tiles.js")
+        assert "Math.floor(startMs / span) * span" in source
+
+    def test_cache_is_bounded(self):
+        source = read_js("tiles.js")
+        assert re.search(r"MAX_TILES = \d+", source)
+
+    def test_app_draws_coarse_tier_first(self):
+        source = read_js("app.js")
+        assert "getCoarseResolution(" in source
+        assert "hasTiles(" in source
+
+    def test_zoom_triggers_detail_fetch(self):
+        assert "onZoomComplete" in read_js("charts.js")
+        assert "onViewportChange(refineViewport)" in read_js("app.js")
+
+
+class TestZoomDetail:
+    """Zoom/pan must fetch detail debounced, cancellably, with synced axes."""
+
+    def test_pan_triggers_detail_fetch(self):
+        assert "onPanComplete" in read_js("charts.js")
+
+    def test_viewport_is_debounced(self):
+        source = read_js("charts.js")
+        assert re.search(r"VIEWPORT_DEBOUNCE = \d+", source)
+        assert "clearTimeout(viewportTimer)" in source
+
+    def test_axes_synchronized(self):
+        assert "zoomScale('x'" in read_js("charts.js")
+
+    def test_detail_fetch_is_abortable(self):
+        assert "new AbortController()" in read_js("app.js")
+        assert "signal: controller.signal" in read_js("app.js")
+
+    def test_fetch_json_accepts_signal(self):
+        source = read_js("api.js")
+        assert "{ signal }" in source
+        assert "fetch(url.toString(), { signal })" in source
+
+
+class TestSupersededRequests:
+    """Newer station/range/unit selections cancel requests still in flight."""
+
+    def test_app_supersedes_by_kind(self):
+        source = read_js("app.js")
+        assert "function supersede(kind)" in source
+        for kind in ["current", "chart", "detail"]:
+            assert f"supersede('{kind}')" in source, f"No cancellation for {kind} requests"
+
+    def test_aborts_are_not_reported_as_errors(self):
+        assert "isAbort(err)" in read_js("app.js")
+
+    def test_plugins_receive_signal(self):
+        source = read_js("plugins.js")
+        assert "buildContext(controller.signal)" in source
+
+
+class TestPrefetchModule:
+    """prefetch.js must warm the cache only in idle time and within budget."""
+
+    def test_uses_request_idle_callback(self):
+        assert "requestIdleCallback" in read_js("prefetch.js")
+
+    def test_respects_save_data(self):
+        assert "saveData" in read_js("prefetch.js")
+
+    def test_has_byte_budget(self):
+        source = read_js("prefetch.js")
+        assert re.search(r"PREFETCH_BUDGET = [\d *]+", source)
+        assert "cost > budget" in source
+
+    def test_prefetches_neighbouring_presets_and_stations(self):
+        source = read_js("prefetch.js")
+        assert "PRESET_ORDER[i + 1]" in source and "PRESET_ORDER[i - 1]" in source
+        assert "state.get('stations')" in source
+
+    def test_app_paints_cached_tiles(self):
+        source = read_js("app.js")
+        assert "peekTiles(" in source
+        assert "schedulePrefetch()" in source
+
+
+class TestUnitConversion:
+    """units.js factors must reproduce tempestd's server-side conversion."""
+
+    # (metric, imperial) pairs as returned by tempestd for the same reading
+    def _factor(self, name):
+        match = re.search(rf"const {name} = ([\d.]+);", read_js("units.js"))
+        assert match is not None, f"Missing conversion constant {name}"
+        return float(match.group(1))
+
+    def test_wind_ms_to_mph(self):
+        assert round(2.5 * self._factor("MS_TO_MPH"), 1) == 5.6
+        assert round(4.1 * self._factor("MS_TO_MPH"), 1) == 9.2
+
+    def test_pressure_hpa_to_inhg(self):
+        assert round(1013.25 * self._factor("HPA_TO_INHG"), 2) == 29.92
+
+    def test_rain_mm_per_inch(self):
+        assert self._factor("MM_PER_INCH") == 25.4
+
+    def test_temperature_formula(self):
+        assert "c * 9 / 5 + 32" in read_js("units.js")
+
+    def test_data_fetched_in_metric(self):
+        source = read_js("app.js")
+        assert "getCurrentObservation(stationId, 'metric'" in source
+        assert "units" not in read_js("tiles.js").replace("js/units.js", "")
+
+    def test_unit_toggle_does_not_refetch(self):
+        source = read_js("app.js")
+        listener = re.search(r"state\.on\('units', \(\) => \{(.*?)\n    \}\);", source, re.S)
+        assert listener is not None
+        assert "redrawCharts()" in listener.group(1)
+        assert "refresh()" not in listener.group(1)
+
+
+class TestPerfModule:
+    """?perf=1 instruments the hot paths without cost when off."""
+
+    def test_perf_mode_param(self):
+        source = read_js("config.js")
+        assert "params.get('perf')" in source
+        assert "getPerfMode" in source
+
+    def test_disabled_returns_original(self):
+        source = read_js("perf.js")
+        assert "if (!isPerfEnabled()) return fn;" in source
+
+    def test_spans_use_performance_measure(self):
+        source = read_js("perf.js")
+        assert "performance.measure(" in source
+        assert "'longtask'" in source
+        assert "sendBeacon" in source
+        assert "'/_perf'" in source
+
+    @pytest.mark.parametrize("filename,span", [
+        ("api.js", "fetchJSON"),
+        ("api.js", "parseJSON"),
+        ("charts.js", "updateCharts"),
+        ("current.js", "renderCurrentConditions"),
+        ("plugins.js", "refreshPlugins"),
+        ("app.js", "poll"),
+    ])
+    def test_hot_paths_instrumented(self, filename, span):
+        assert re.search(rf"(timed|measure)\('{span}'", read_js(filename))
+
+    def test_service_worker_ignores_beacons(self):
+        with open(os.path.join(REPO_ROOT, "sw.js")) as f:
+            assert "event.request.method !== 'GET'" in f.read()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+class TestPollScheduler:
+    """scheduler.js backoff, run under node: only recorded polls move it."""
+
+    NOW = 1_700_000_000_000
+
+    def _delays(self, script):
+        """Run script with the module as `m` and `obs(ageSeconds)`; it returns a list of delays."""
+        delays = run_js("scheduler.js", f"const now = {self.NOW};\n"
+                        "const obs = (age) => ({ station_id: 1, timestamp: new Date(now - age * 1000).toISOString() });\n"
+                        + script)
+        return [d / 1000 for d in delays]
+
+    def _assert_near(self, delays, expected):
+        """Each delay is its expected value plus up to 10% jitter."""
+        assert len(delays) == len(expected)
+        for delay, want in zip(delays, expected):
+            assert want <= delay <= want * 1.1 + 0.01, (delays, expected)
+
+    def test_waits_for_next_report(self):
+        self._assert_near(self._delays("return [m.nextPollDelay(obs(10), now)];"), [55])
+
+    def test_late_report_backs_off_per_recorded_poll(self):
+        delays = self._delays("""
+            const o = obs(120), out = [];
+            for (let i = 0; i < 5; i++) { m.recordPoll(o, now); out.push(m.nextPollDelay(o, now)); }
+            return out;""")
+        self._assert_near(delays, [10, 10, 20, 40, 80])
+
+    @pytest.mark.parametrize("skew", [-600, -120, 120, 600])
+    def test_client_clock_skew_corrected_from_date_header(self, skew):
+        delays = self._delays(f"""
+            const client = now + {skew * 1000};
+            m.noteServerDate(new Date(now).toUTCString(), client);
+            m.recordPoll(obs(10), client);
+            return [m.nextPollDelay(obs(10), client)];""")
+        self._assert_near(delays, [55])
+
+    def test_oldest_date_header_does_not_win(self):
+        delays = self._delays("""
+            m.noteServerDate(new Date(now - 90000).toUTCString(), now);   // replayed from cache
+            m.noteServerDate(new Date(now).toUTCString(), now);
+            return [m.nextPollDelay(obs(10), now)];""")
+        self._assert_near(delays, [55])
+
+    def test_asking_again_does_not_back_off(self):
+        delays = self._delays("""
+            const o = obs(120);
+            m.recordPoll(o, now);
+            m.recordPoll(o, now);
+            return [1, 2, 3].map(() => m.nextPollDelay(o, now));""")
+        self._assert_near(delays, [10, 10, 10])
+
+    def test_new_report_resets_backoff(self):
+        delays = self._delays("""
+            for (let i = 0; i < 4; i++) m.recordPoll(obs(120), now);
+            m.recordPoll(obs(0), now);
+            return [m.nextPollDelay(obs(0), now), m.nextPollDelay(obs(0), now + 70000)];""")
+        self._assert_near(delays, [65, 10])
+
+    def test_failures_back_off_then_reset(self):
+        delays = self._delays("""
+            const out = [m.nextPollDelay(null, now)];
+            for (let i = 0; i < 6; i++) { m.recordPoll(null, now); out.push(m.nextPollDelay(null, now)); }
+            m.recordPoll(obs(0), now);
+            out.push(m.nextPollDelay(null, now));
+            return out;""")
+        self._assert_near(delays, [30, 30, 60, 120, 240, 300, 300, 30])
+
+
 class TestStateModule:
     """state.js must export a usable event emitter."""
 
@@ -135,6 +405,74 @@ class TestStateModule:
         assert "on(key, callback)" in source or "on(key," in source
 
 
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+class TestStateNotifications:
+    """state.js computed keys, run under node: listeners fire once per change."""
+
+    def _fired(self, script):
+        """Run script with `s` the store and `seen` the values its sum listener received."""
+        return run_js("state.js", """
+            const s = m.state, seen = [];
+            s.set('a', 1); s.set('b', 1);
+            s.computed('sum', ['a', 'b'], (a, b) => a + b);
+            s.on('sum', (v) => seen.push(v));
+            """ + script + "\nreturn seen;")
+
+    def test_batch_notifies_once_with_final_value(self):
+        assert self._fired("s.batch(() => { s.set('a', 2); s.set('b', 5); });") == [7]
+
+    def test_unchanged_result_stays_quiet(self):
+        assert self._fired("s.batch(() => { s.set('a', 2); s.set('b', 0); });") == []
+
+    def test_read_before_flush_still_notifies(self):
+        assert self._fired("s.batch(() => { s.set('a', 2); s.get('sum'); });") == [3]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+class TestSummaryLoading:
+    """summaries.js under node with stubbed DOM and fetch, no /_summaries route."""
+
+    PROGRAM = """
+        globalThis.window = { location: new URL('http://dash.test/') };
+        globalThis.localStorage = { getItem: () => null, setItem() {} };
+        globalThis.document = { getElementById: (id) => (id === 'summary-calendar' ? {} : null) };
+        const calls = { days: 0, aborted: 0 };
+        globalThis.fetch = (url, { signal }) => {
+            const headers = new Headers();
+            if (url.includes('/_summaries')) return Promise.resolve({ ok: false, status: 404, headers, json: async () => ({}) });
+            calls.days++;
+            const date = new URL(url).searchParams.get('date');
+            return new Promise((resolve, reject) => {
+                const timer = setTimeout(() => resolve({ ok: true, headers, json: async () => ({ date }) }), 1);
+                signal.addEventListener('abort', () => {
+                    clearTimeout(timer);
+                    calls.aborted++;
+                    reject(Object.assign(new Error('aborted'), { name: 'AbortError' }));
+                }, { once: true });
+            });
+        };
+        const { state } = await import(%(state)s);
+        const { refreshSummaries } = await import(%(summaries)s);
+        state.set('stationId', 1);
+        const first = refreshSummaries();
+        await new Promise((resolve) => setTimeout(resolve, 20));
+        await refreshSummaries();   // a poll while the year is still loading
+        await first;
+        await refreshSummaries();   // every finished day is cached by now
+        console.log(JSON.stringify(calls));
+    """
+
+    def test_poll_does_not_restart_a_load_in_flight(self):
+        program = self.PROGRAM % {
+            name: json.dumps("file://" + os.path.join(JS_DIR, f"{name}.js")) for name in ("state", "summaries")
+        }
+        out = subprocess.run(["node", "--input-type=module", "-e", program],
+                             capture_output=True, text=True, check=True, timeout=30)
+        calls = json.loads(out.stdout)
+        assert calls["aborted"] == 0
+        assert calls["days"] == 365   # each day once; unfinished ones wait RECENT_REFRESH_MS
+
+
 class TestChartsModule:
     """charts.js must define all 6 chart panels."""
 
@@ -179,6 +517,11 @@ class TestCurrentModule:
         source = read_js("current.js")
         assert stat in source, f"Missing stat box: {stat}"
 
+    def test_boxes_patched_not_rebuilt(self):
+        source = read_js("current.js")
+        assert "grid.textContent = ''" not in source, "Stat grid must not be cleared on render"
+        assert "requestAnimationFrame(flush)" in source
+
     def test_uv_severity_levels(self):
         source = read_js("current.js")
         for level in ["Low", "Moderate", "High", "Very High", "Extreme"]:
@@ -0,0 +1,131 @@
+"""Tests for fault and latency injection in mock tempestd."""
+
+import json
+import socket
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from tests.mock_faults import FaultInjector, parse_latency, route_of
+from tests.mock_tempestd import SERVER_KINDS, STATION_ID, start_mock_server
+
+
+@pytest.fixture(params=SERVER_KINDS)
+def mock(request):
+    server, port = start_mock_server(fault_seed=1, server=request.param)
+    yield f"http://127.0.0.1:{port}"
+    server.shutdown()
+
+
+def _status(url, timeout=5):
+    try:
+        return urllib.request.urlopen(url, timeout=timeout).status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def _configure(base, rules):
+    req = urllib.request.Request(
+        f"{base}/_mock/faults", data=json.dumps(rules).encode(), method="PUT",
+        headers={"Content-Type": "application/json"},
+    )
+    return json.loads(urllib.request.urlopen(req, timeout=5).read())
+
+
+class TestRules:
+    """Specs, routes and sampling."""
+
+    def test_parse_latency(self):
+        assert parse_latency("lognormal:0.05:0.8") == ("lognormal", (0.05, 0.8))
+        for bad in ("gamma:1", "fixed", "uniform:1", "fixed:-1", "fixed:x"):
+            with pytest.raises(ValueError):
+                parse_latency(bad)
+
+    def test_route_of(self):
+        assert route_of("/api/v1/stations/1/observations") == "observations"
+        assert route_of("/api/v1/stations/1") == "station"
+        assert route_of("/api/v1/stations") == "stations"
+        assert route_of("/api/v1/health") == "health"
+
+    def test_route_rule_overrides_wildcard(self):
+        faults = FaultInjector({"*": {"drip_bps": 10, "error_rate": 0.5}, "current": {"error_rate": 0}})
+        rule = faults.rule_for("current")
+        assert rule["drip_bps"] == 10
+        assert rule["error_rate"] == 0
+
+    def test_seed_replays_plans(self):
+        rules = {"*": {"latency": "lognormal:0.01:1", "error_rate": 0.3, "reset_rate": 0.1}}
+        a = FaultInjector(rules, seed=3)
+        b = FaultInjector(rules, seed=3)
+        assert [a.plan("current") for _ in range(50)] == [b.plan("current") for _ in range(50)]
+
+    def test_invalid_rules_rejected(self):
+        for rules in ({"*": {"bogus": 1}}, {"*": {"error_rate": 2}}, {"*": {"latency": "fast"}}, "nope",
+                      {"*": {"error_status": 599}}, {"*": {"error_status": 0}}, {"*": {"error_status": 503.5}}):
+            with pytest.raises(ValueError):
+                FaultInjector(rules)
+
+    def test_error_status_accepts_known_codes(self):
+        assert FaultInjector({"*": {"error_rate": 1, "error_status": 500}}).plan("current")["status"] == 500
+
+
+class TestAdminEndpoint:
+    """/_mock/faults reads, replaces and clears rules at runtime."""
+
+    def test_put_get_delete(self, mock):
+        body = _configure(mock, {"current": {"error_rate": 0.5}})
+        assert body["rules"] == {"current": {"error_rate": 0.5}}
+        snapshot = json.loads(urllib.request.urlopen(f"{mock}/_mock/faults", timeout=5).read())
+        assert snapshot["rules"]["current"]["error_rate"] == 0.5
+        req = urllib.request.Request(f"{mock}/_mock/faults", method="DELETE")
+        assert json.loads(urllib.request.urlopen(req, timeout=5).read())["rules"] == {}
+
+    def test_bad_rules_are_400(self, mock):
+        req = urllib.request.Request(
+            f"{mock}/_mock/faults", data=b'{"*": {"nope": 1}}', method="PUT"
+        )
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(req, timeout=5)
+        assert err.value.code == 400
+
+
+class TestInjectedFaults:
+    """Each fault kind misbehaves as configured."""
+
+    def test_error_burst(self, mock):
+        _configure(mock, {"current": {"error_rate": 1, "error_burst": 3, "error_status": 500}})
+        url = f"{mock}/api/v1/stations/{STATION_ID}/current"
+        assert [_status(url) for _ in range(3)] == [500, 500, 500]
+        assert _status(f"{mock}/api/v1/health") == 200
+
+    def test_fixed_latency(self, mock):
+        _configure(mock, {"health": {"latency": "fixed:0.3"}})
+        started = time.monotonic()
+        assert _status(f"{mock}/api/v1/health") == 200
+        assert time.monotonic() - started >= 0.3
+
+    def test_slow_drip(self, mock):
+        _configure(mock, {"stations": {"drip_bps": 1000}})
+        started = time.monotonic()
+        body = urllib.request.urlopen(f"{mock}/api/v1/stations", timeout=10).read()
+        assert json.loads(body)[0]["station_id"] == STATION_ID
+        assert time.monotonic() - started >= len(body) / 1000 * 0.8
+
+    def test_reset(self, mock):
+        _configure(mock, {"health": {"reset_rate": 1}})
+        with pytest.raises((ConnectionResetError, urllib.error.URLError, ConnectionError)):
+            urllib.request.urlopen(f"{mock}/api/v1/health", timeout=5).read()
+
+    def test_stall(self, mock):
+        _configure(mock, {"health": {"stall_rate": 1, "stall_seconds": 30}})
+        with pytest.raises((socket.timeout, urllib.error.URLError)):
+            urllib.request.urlopen(f"{mock}/api/v1/health", timeout=0.5)
+        # A stalled request does not block the others
+        assert _status(f"{mock}/api/v1/stations") == 200
+
+    def test_proxy_returns_502_on_reset(self, mock, dev_server_factory):
+        _configure(mock, {"current": {"reset_rate": 1}})
+        base = dev_server_factory(mock)
+        assert _status(f"{base}/api/v1/stations/{STATION_ID}/current") == 502
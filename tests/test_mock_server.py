@@ -0,0 +1,91 @@
+"""Tests for the mock tempestd server variants and response cache."""
+
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+from tests.mock_tempestd import SERVER_KINDS, STATION_ID, MockApp, start_mock_server
+
+OBSERVATIONS = (
+    f"/api/v1/stations/{STATION_ID}/observations"
+    "?start=2025-06-01T00:00:00Z&end=2025-06-02T00:00:00Z&resolution=5m"
+)
+
+
+class TestResponseCache:
+    """Serialized responses are reused per (route, params) until the TTL expires."""
+
+    def test_same_params_hit(self):
+        app = MockApp(cache_ttl=60)
+        first = app.get(OBSERVATIONS)
+        assert app.get(OBSERVATIONS)[1] is first[1]
+        assert app.stats()["cache"] == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_param_order_ignored(self):
+        app = MockApp(cache_ttl=60)
+        app.get("/api/v1/health?a=1&b=2")
+        app.get("/api/v1/health?b=2&a=1")
+        assert app.cache_hits == 1
+
+    def test_expires(self):
+        app = MockApp(cache_ttl=0.05)
+        app.get("/api/v1/health")
+        time.sleep(0.1)
+        app.get("/api/v1/health")
+        assert app.cache_misses == 2
+
+    def test_disabled(self):
+        app = MockApp(cache_ttl=0)
+        app.get("/api/v1/health")
+        app.get("/api/v1/health")
+        assert app.stats()["cache"]["entries"] == 0
+
+
+@pytest.fixture(params=SERVER_KINDS)
+def mock(request):
+    server, port = start_mock_server(server=request.param)
+    yield port
+    server.shutdown()
+
+
+class TestServerVariants:
+    """Both variants serve the same API under concurrent load."""
+
+    def test_keep_alive(self, mock):
+        conn = http.client.HTTPConnection("127.0.0.1", mock, timeout=5)
+        for _ in range(3):
+            conn.request("GET", OBSERVATIONS)
+            resp = conn.getresponse()
+            assert resp.status == 200
+            assert json.loads(resp.read())["total"] == 289
+        conn.close()
+
+    def test_unknown_route_is_404(self, mock):
+        conn = http.client.HTTPConnection("127.0.0.1", mock, timeout=5)
+        conn.request("GET", "/api/v1/nope")
+        assert conn.getresponse().status == 404
+        conn.close()
+
+    def test_concurrent_clients(self, mock):
+        statuses = []
+        lock = threading.Lock()
+
+        def client():
+            conn = http.client.HTTPConnection("127.0.0.1", mock, timeout=10)
+            for _ in range(20):
+                conn.request("GET", OBSERVATIONS)
+                resp = conn.getresponse()
+                resp.read()
+                with lock:
+                    statuses.append(resp.status)
+            conn.close()
+
+        threads = [threading.Thread(target=client) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert statuses == [200] * 400
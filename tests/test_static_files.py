@@ -1,10 +1,14 @@
 """Verify all static files are served correctly by the dev server."""
 
+import os
+import urllib.error
 import urllib.request
 import json
 
 import pytest
 
+from tests.conftest import REPO_ROOT
+
 
 class TestStaticFiles:
     """All dashboard files must be served with correct content types."""
@@ -16,10 +20,18 @@ class TestStaticFiles:
         "/js/config.js",
         "/js/state.js",
         "/js/api.js",
+        "/js/units.js",
+        "/js/perf.js",
+        "/js/tiles.js",
+        "/js/prefetch.js",
         "/js/current.js",
         "/js/controls.js",
         "/js/charts.js",
         "/js/plugins.js",
+        "/js/summaries.js",
+        "/js/leader.js",
+        "/js/scheduler.js",
+        "/js/visibility.js",
         "/plugins.json",
         "/manifest.json",
         "/sw.js",
@@ -63,3 +75,57 @@ class TestServiceWorker:
         resp = urllib.request.urlopen(url)
         content = resp.read().decode()
         assert "addEventListener('install'" in content or 'addEventListener("install"' in content
+
+
+class TestStaticEngine:
+    """Static files are cached in memory, revalidated by mtime and sent with validators."""
+
+    @pytest.fixture()
+    def asset(self):
+        """Write throwaway files into the served root; removed after the test."""
+        paths = []
+
+        def write(name, data):
+            path = os.path.join(REPO_ROOT, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            paths.append(path)
+            return path
+
+        yield write
+        for path in paths:
+            os.remove(path)
+
+    def test_etag_revalidation(self, dashboard_server):
+        resp = urllib.request.urlopen(dashboard_server + "/js/app.js")
+        etag = resp.headers["ETag"]
+        assert etag and resp.headers["Cache-Control"] == "no-cache"
+        req = urllib.request.Request(dashboard_server + "/js/app.js", headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(req)
+        assert err.value.code == 304
+        assert err.value.headers["ETag"] == etag
+
+    def test_hashed_names_are_immutable(self, dashboard_server, asset):
+        asset("_engine_test.3f9a1c2e.js", b"export const x = 1;\n")
+        resp = urllib.request.urlopen(dashboard_server + "/_engine_test.3f9a1c2e.js")
+        assert "immutable" in resp.headers["Cache-Control"]
+        assert "max-age=31536000" in resp.headers["Cache-Control"]
+
+    def test_edits_are_picked_up(self, dashboard_server, asset):
+        path = asset("_engine_test.txt", b"first")
+        assert urllib.request.urlopen(dashboard_server + "/_engine_test.txt").read() == b"first"
+        with open(path, "wb") as f:
+            f.write(b"second!")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert urllib.request.urlopen(dashboard_server + "/_engine_test.txt").read() == b"second!"
+
+    def test_large_file_sent_whole(self, dashboard_server, asset):
+        data = bytes(range(256)) * 4096  # 1 MiB, above the in-memory limit
+        asset("_engine_test.bin", data)
+        assert urllib.request.urlopen(dashboard_server + "/_engine_test.bin").read() == data
+        req = urllib.request.Request(dashboard_server + "/_engine_test.bin", method="HEAD")
+        resp = urllib.request.urlopen(req)
+        assert resp.headers["Content-Length"] == str(len(data))
+        assert resp.read() == b""
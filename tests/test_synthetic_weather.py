@@ -0,0 +1,131 @@
+"""Tests for the synthetic weather engine behind mock tempestd."""
+
+import itertools
+import json
+import urllib.request
+from datetime import datetime, timezone
+
+import pytest
+
+from tests.mock_tempestd import SERVER_KINDS, STATION_ID, start_mock_server
+from tests.synthetic_weather import SyntheticWeather
+
+DAY = datetime(2025, 7, 1, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture(scope="module")
+def weather():
+    return SyntheticWeather(seed=7)
+
+
+class TestDeterminism:
+    """Same seed and timestamp always give the same reading."""
+
+    def test_repeatable(self, weather):
+        a = weather.observation(STATION_ID, DAY + 3600)
+        b = SyntheticWeather(seed=7).observation(STATION_ID, DAY + 3600)
+        assert a == b
+
+    def test_seed_changes_data(self, weather):
+        a = weather.observation(STATION_ID, DAY + 3600)
+        b = SyntheticWeather(seed=8).observation(STATION_ID, DAY + 3600)
+        assert a["air_temperature"] != b["air_temperature"]
+
+    def test_stations_differ(self, weather):
+        a = weather.observation(STATION_ID, DAY + 3600)
+        b = weather.observation(STATION_ID + 1, DAY + 3600)
+        assert a["air_temperature"] != b["air_temperature"]
+
+
+class TestPhysicalPlausibility:
+    """Series follow the sun and stay within physical bounds."""
+
+    def test_no_sun_at_local_midnight(self, weather):
+        # 08:00 UTC is around midnight in San Francisco
+        obs = weather.observation(STATION_ID, DAY + 8 * 3600)
+        assert obs["solar_radiation"] == 0
+        assert obs["uv_index"] == 0
+
+    def test_afternoon_warmer_than_dawn(self, weather):
+        days = [DAY + d * 86400 for d in range(14)]
+        dawn = sum(weather.observation(STATION_ID, d + 13 * 3600)["air_temperature"] for d in days)
+        afternoon = sum(weather.observation(STATION_ID, d + 23 * 3600)["air_temperature"] for d in days)
+        assert afternoon > dawn
+
+    def test_bounds(self, weather):
+        _, rows = weather.series(STATION_ID, DAY, DAY + 30 * 86400, "30m")
+        for obs in rows:
+            assert 0 <= obs["relative_humidity"] <= 100
+            assert obs["dew_point"] <= obs["air_temperature"] + 0.01
+            assert obs["wind_lull"] <= obs["wind_avg"] <= obs["wind_gust"]
+            assert 950 < obs["station_pressure"] < 1050
+            assert obs["rain_accumulation"] >= 0
+
+
+class TestSeries:
+    """Windows, resolutions and pages are computed lazily and consistently."""
+
+    def test_bucket_count(self, weather):
+        total, _ = weather.series(STATION_ID, DAY, DAY + 86400, "5m")
+        assert total == 289
+
+    def test_buckets_aligned(self, weather):
+        _, rows = weather.series(STATION_ID, DAY + 17, DAY + 3600, "5m")
+        assert next(rows)["timestamp"].endswith(":05:00Z")
+
+    def test_offset_matches_slice(self, weather):
+        _, all_rows = weather.series(STATION_ID, DAY, DAY + 86400, "1h")
+        _, page = weather.series(STATION_ID, DAY, DAY + 86400, "1h", offset=5, limit=3)
+        assert list(page) == list(all_rows)[5:8]
+
+    def test_millions_of_rows_are_lazy(self, weather):
+        total, rows = weather.series(STATION_ID, DAY - 5 * 365 * 86400, DAY, "1m")
+        assert total > 2_000_000
+        assert len(list(itertools.islice(rows, 10))) == 10
+
+    def test_imperial_units(self, weather):
+        _, metric = weather.series(STATION_ID, DAY, DAY, "1m")
+        _, imperial = weather.series(STATION_ID, DAY, DAY, "1m", units="imperial")
+        m, i = next(metric), next(imperial)
+        assert i["air_temperature"] == pytest.approx(m["air_temperature"] * 9 / 5 + 32, abs=0.01)
+        assert i["station_pressure"] == pytest.approx(m["station_pressure"] * 0.02953, abs=0.01)
+
+
+class TestMockEndpoints:
+    """The mock serves synthetic data for any window and several stations."""
+
+    @pytest.fixture(scope="class", params=SERVER_KINDS)
+    def mock_url(self, request):
+        server, port = start_mock_server(stations=3, server=request.param)
+        yield f"http://127.0.0.1:{port}"
+        server.shutdown()
+
+    def _get(self, url):
+        return json.loads(urllib.request.urlopen(url, timeout=5).read())
+
+    def test_window_sets_row_count(self, mock_url):
+        data = self._get(
+            f"{mock_url}/api/v1/stations/{STATION_ID}/observations"
+            "?start=2025-06-01T00:00:00Z&end=2025-06-02T00:00:00Z&resolution=1h"
+        )
+        assert data["total"] == 25
+        assert len(data["observations"]) == 25
+
+    def test_limit_and_offset(self, mock_url):
+        data = self._get(
+            f"{mock_url}/api/v1/stations/{STATION_ID}/observations"
+            "?start=2025-06-01T00:00:00Z&end=2025-06-02T00:00:00Z&resolution=5m&limit=50&offset=100"
+        )
+        assert data["total"] == 289
+        assert len(data["observations"]) == 50
+        assert data["observations"][0]["timestamp"] == "2025-06-01T08:20:00Z"
+
+    def test_multiple_stations(self, mock_url):
+        stations = self._get(f"{mock_url}/api/v1/stations")
+        assert [s["station_id"] for s in stations] == [STATION_ID, STATION_ID + 1, STATION_ID + 2]
+
+    def test_summary_varies_by_day(self, mock_url):
+        a = self._get(f"{mock_url}/api/v1/stations/{STATION_ID}/summary?date=2025-06-01")
+        b = self._get(f"{mock_url}/api/v1/stations/{STATION_ID}/summary?date=2025-06-02")
+        assert a["temperature"]["high"] >= a["temperature"]["low"]
+        assert a["temperature"] != b["temperature"]
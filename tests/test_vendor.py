@@ -0,0 +1,115 @@
+"""Vendored CDN scripts: scripts/vendor.py and serve.py --vendor."""
+
+import base64
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from tests.conftest import REPO_ROOT, SERVE_SCRIPT
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+import serve  # noqa: E402
+import vendor  # noqa: E402
+
+LIBRARY = b"window.Fake = function () { return 42; };\n"
+
+
+def sri(data):
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+
+@pytest.fixture()
+def cdn():
+    """A stand-in CDN serving one script.
+
+    Yields (fetch url, https url as written in the page, page html).
+    """
+
+    class CDNHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(LIBRARY)))
+            self.end_headers()
+            self.wfile.write(LIBRARY)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), CDNHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/npm/fake@1.0.0/dist/fake.min.js"
+    # cdn_scripts() only picks up https:// sources; swap the scheme for fetching
+    page_url = url.replace("http://", "https://")
+    html = (f'<script src="{page_url}"\n            integrity="{sri(LIBRARY)}"\n'
+            f'            crossorigin="anonymous"></script>\n'
+            '<script type="module" src="js/app.js"></script>\n')
+    yield url, page_url, html
+    server.shutdown()
+
+
+class TestVendorScript:
+    def test_finds_the_four_cdn_scripts(self):
+        with open(os.path.join(REPO_ROOT, "index.html")) as f:
+            scripts = vendor.cdn_scripts(f.read())
+        assert len(scripts) == 4
+        assert all(integrity.startswith("sha384-") for _, integrity in scripts)
+
+    def test_sri_matches(self):
+        assert vendor.sri_matches(LIBRARY, sri(LIBRARY))
+        assert not vendor.sri_matches(LIBRARY + b" ", sri(LIBRARY))
+
+    def test_local_name_is_content_hashed(self):
+        name = vendor.local_name("https://cdn.example/npm/x@1/dist/chart.umd.min.js", LIBRARY)
+        assert name.startswith("chart.umd.min.") and name.endswith(".js")
+        assert serve.HASHED_NAME.search(name), "vendored files should get immutable caching"
+
+    def test_vendor_writes_verified_copies(self, cdn, tmp_path, monkeypatch):
+        url, page_url, html = cdn
+        real_urlopen = vendor.urllib.request.urlopen
+        monkeypatch.setattr(vendor.urllib.request, "urlopen",
+                            lambda u, timeout: real_urlopen(u.replace(page_url, url), timeout=timeout))
+        manifest = vendor.vendor(str(tmp_path), html)
+        entry = manifest[page_url]
+        assert (tmp_path / entry["file"]).read_bytes() == LIBRARY
+        assert (tmp_path / vendor.MANIFEST).exists()
+
+
+class TestVendorBundle:
+    @pytest.fixture()
+    def vendored(self, tmp_path):
+        page_url = "https://cdn.example/npm/fake@1.0.0/dist/fake.min.js"
+        html = f'<script src="{page_url}"\n        integrity="{sri(LIBRARY)}"\n        crossorigin="anonymous"></script>'
+        name = vendor.local_name(page_url, LIBRARY)
+        (tmp_path / name).write_bytes(LIBRARY)
+        (tmp_path / vendor.MANIFEST).write_text(
+            '{"%s": {"file": "%s", "integrity": "%s"}}' % (page_url, name, sri(LIBRARY))
+        )
+        return tmp_path, html, name
+
+    def test_rewrite_keeps_integrity(self, vendored):
+        directory, html, name = vendored
+        bundle = serve.VendorBundle(str(directory), html)
+        rewritten = bundle.rewrite(html.encode()).decode()
+        assert f'<script defer src="/vendor/{name}"' in rewritten
+        assert f'integrity="{sri(LIBRARY)}"' in rewritten
+        assert bundle.path_for(f"/vendor/{name}") == str(directory / name)
+        assert bundle.path_for("/vendor/other.js") is None
+
+    def test_tampered_copy_rejected(self, vendored):
+        directory, html, name = vendored
+        (directory / name).write_bytes(LIBRARY + b"alert(1);\n")
+        with pytest.raises(ValueError, match="integrity"):
+            serve.VendorBundle(str(directory), html)
+
+    def test_serve_refuses_without_vendor_copies(self, tmp_path):
+        result = subprocess.run(
+            [sys.executable, SERVE_SCRIPT, "--port", "0", "--vendor", str(tmp_path)],
+            capture_output=True, text=True, timeout=30,
+        )
+        assert result.returncode == 2
+        assert "scripts/vendor.py" in result.stderr